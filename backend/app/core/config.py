@@ -13,6 +13,93 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # ── Availability index ────────────────────────────────────
+    AVAILABILITY_CHECK_INTERVAL_SECONDS: int = 300
+
+    # ── Rule engine ───────────────────────────────────────────
+    RULE_TIMING_ENABLED: bool = False
+
+    # ── Driver compliance ─────────────────────────────────────
+    LICENSE_EXPIRY_WARNING_DAYS: int = 30
+    COMPLIANCE_SWEEP_INTERVAL_SECONDS: int = 60 * 60 * 24  # daily
+
+    # ── Trip event projections ────────────────────────────────
+    TRIP_SNAPSHOT_EVERY: int = 1000  # events between projection snapshots
+    TRIP_SNAPSHOT_INTERVAL_SECONDS: int = 60  # how often the snapshot job checks that count
+
+    # ── Bulk import ───────────────────────────────────────────
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000  # row errors echoed back per import
+
+    # ── Telematics ingest ─────────────────────────────────────
+    TELEMETRY_FLUSH_INTERVAL_SECONDS: float = 1.0
+    TELEMETRY_MAX_PENDING: int = 50_000     # vehicles buffered before 503
+    TELEMETRY_MAX_LAG_SECONDS: float = 30.0  # oldest unflushed age before 503
+
+    # ── Bulk upsert ───────────────────────────────────────────
+    BULK_UPSERT_MAX_ROWS: int = 5000
+
+    # ── Relation expansion ────────────────────────────────────
+    EXPAND_DEFAULT_LIMIT: int = 50
+    EXPAND_MAX_LIMIT: int = 500
+
+    # ── Event stream ──────────────────────────────────────────
+    EVENT_QUEUE_SIZE: int = 256  # per client; a full queue evicts the client
+    EVENT_MAX_SUBSCRIBERS: int = 5000
+    EVENT_REPLAY_SIZE: int = 1000  # recent events kept for Last-Event-ID resume
+    EVENT_KEEPALIVE_SECONDS: float = 15.0
+
+    # ── Outbox ────────────────────────────────────────────────
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETRY_BASE_SECONDS: float = 1.0  # doubles per attempt
+    OUTBOX_RETRY_MAX_SECONDS: float = 300.0
+    OUTBOX_RETENTION_HOURS: int = 24  # dispatched rows are pruned after this
+
+    # ── SQL accounting ────────────────────────────────────────
+    SQL_STATEMENT_BUDGET: int = 25  # per request, before a warning is logged
+    SQL_TIME_BUDGET_MS: float = 250.0
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10  # same statement shape this often in one request
+
+    # ── Profiling ─────────────────────────────────────────────
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of requests profiled without the X-Profile header
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILE_BUFFER_SIZE: int = 50
+
+    # ── Search ────────────────────────────────────────────────
+    SEARCH_BACKEND: str = "auto"  # auto | fts | memory; auto uses FTS5 / FULLTEXT when the database has it
+    SEARCH_CANDIDATE_WINDOW: int = 1000  # matches ranked per query; bounds the cost of very short prefixes
+
+    # ── Idempotency keys ──────────────────────────────────────
+    IDEMPOTENT_PATHS: list[str] = ["/trips/", "/fuel", "/expenses", "/maintenance/"]  # POST only
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 3600
+    IDEMPOTENCY_MAX_KEYS: int = 10_000
+
+    # ── Rate limiting ─────────────────────────────────────────
+    # group -> role ("*" = any other role) -> (tokens per second, burst)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, dict[str, tuple[float, int]]] = {
+        "analytics": {"*": (0.5, 10), "Manager": (1.0, 20)},
+        "export": {"*": (0.05, 3)},
+        "search": {"*": (10.0, 30)},
+        "batch": {"*": (2.0, 10)},
+    }
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_REDIS_URL: str = ""  # e.g. redis://host:6379/0 to share buckets across workers (needs redis)
+
+    # ── Batch ─────────────────────────────────────────────────
+    BATCH_MAX_REQUESTS: int = 20
+
+    # ── Export ────────────────────────────────────────────────
+    EXPORT_BATCH_SIZE: int = 50_000  # rows per Arrow record batch / Parquet row group
+
+    # ── Logging ───────────────────────────────────────────────
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000  # records waiting for the writer thread; overflow is dropped and counted
+    LOG_SAMPLE_RATES: dict[str, float] = {"DEBUG": 0.1}  # per level; unlisted levels are always kept
+    LOG_ACCESS: bool = True  # one line per request
+
     # ── CORS ──────────────────────────────────────────────────
     CORS_ORIGINS: list[str] = [
         "http://localhost:5173",
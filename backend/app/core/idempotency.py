@@ -0,0 +1,236 @@
+"""
+FleetFlow Idempotency – Safe retries for create endpoints.
+
+A client that sends `Idempotency-Key: <token>` on one of the
+IDEMPOTENT_PATHS gets the same response for every retry of that request:
+the first attempt runs and its response is stored, later ones are
+answered from the store without reaching the route (so no second trip,
+fuel log, expense or In Shop transition). Keys are scoped to the
+authenticated user, so two users cannot collide on the same token.
+
+- Retries that arrive while the first attempt is still running wait on
+  a per-key lock and then replay its response.
+- Reusing a key with a different body is rejected with 422.
+- Only 2xx responses are stored. A failed attempt created nothing, so
+  running it again is the correct retry.
+- Entries expire after IDEMPOTENCY_TTL_SECONDS. The store holds at most
+  IDEMPOTENCY_MAX_KEYS entries and drops the oldest when full.
+
+The store is per process: with several workers a retry is only caught
+when it lands on the worker that served the first attempt.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.metrics import Counter, registry
+from app.core.security import decode_access_token
+
+settings = get_settings()
+
+idempotency_requests = Counter(
+    registry, "fleetflow_idempotency_requests_total",
+    "Requests carrying an Idempotency-Key, by outcome (stored, replayed, mismatch, not_stored).",
+    ("outcome",),
+)
+
+MAX_KEY_LENGTH = 255
+
+StoreKey = Tuple[str, str, str, str]  # (user id, method, path, idempotency key)
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+
+
+# ── Store ────────────────────────────────────────────────────
+class IdempotencyStore:
+    """Bounded TTL map of recent keys, plus one asyncio lock per key in use."""
+
+    def __init__(self, max_keys: int, ttl_seconds: float):
+        self.max_keys = max_keys
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[StoreKey, StoredResponse]" = OrderedDict()
+        self._locks: Dict[StoreKey, Tuple[asyncio.Lock, int]] = {}  # key -> (lock, waiters)
+        self._mutex = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: StoreKey) -> Optional[StoredResponse]:
+        with self._mutex:
+            self._evict_expired(time.monotonic())
+            return self._entries.get(key)
+
+    def put(self, key: StoreKey, fingerprint: str, status: int,
+            headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        now = time.monotonic()
+        with self._mutex:
+            self._evict_expired(now)
+            self._entries[key] = StoredResponse(fingerprint, status, headers, body, now + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+    def _evict_expired(self, now: float) -> None:
+        # Every entry gets the same TTL, so insertion order is expiry order.
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now:
+                break
+            del self._entries[key]
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._entries.clear()
+
+    async def acquire(self, key: StoreKey) -> asyncio.Lock:
+        lock, waiters = self._locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[key] = (lock, waiters + 1)
+        await lock.acquire()
+        return lock
+
+    def release(self, key: StoreKey, lock: asyncio.Lock) -> None:
+        lock.release()
+        _, waiters = self._locks[key]
+        if waiters == 1:
+            del self._locks[key]
+        else:
+            self._locks[key] = (lock, waiters - 1)
+
+
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_MAX_KEYS, settings.IDEMPOTENCY_TTL_SECONDS)
+
+
+# ── Middleware ───────────────────────────────────────────────
+def _user_id(headers: Dict[bytes, bytes]) -> Optional[str]:
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return str(decode_access_token(auth[7:]).get("sub") or "") or None
+    except Exception:
+        return None
+
+
+def _per_request(name: bytes) -> bool:
+    # content-length is set again on replay; CORS headers belong to the
+    # origin of each request and are added by the CORS layer outside this one.
+    name = name.lower()
+    return name == b"content-length" or name == b"vary" or name.startswith(b"access-control-")
+
+
+async def _send_json(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI. Requests without the header, on other paths, or without a
+    valid bearer token (the route will answer 401) pass straight through.
+    """
+
+    def __init__(self, app, store: IdempotencyStore = idempotency_store):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(settings.IDEMPOTENT_PATHS)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        raw_key = headers.get(b"idempotency-key")
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not 0 < len(raw_key) <= MAX_KEY_LENGTH:
+            await _send_json(send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters.")
+            return
+        user_id = _user_id(headers)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Read the whole body: it is fingerprinted, then handed to the route again.
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key: StoreKey = (user_id, scope["method"], scope["path"], raw_key.decode("latin-1"))
+
+        lock = await self.store.acquire(key)
+        try:
+            stored = self.store.get(key)
+            if stored is not None:
+                if stored.fingerprint != fingerprint:
+                    idempotency_requests.inc("mismatch")
+                    await _send_json(send, 422, "Idempotency-Key was already used with a different request body.")
+                    return
+                idempotency_requests.inc("replayed")
+                await send({
+                    "type": "http.response.start",
+                    "status": stored.status,
+                    "headers": stored.headers + [
+                        (b"content-length", str(len(stored.body)).encode()),
+                        (b"idempotent-replayed", b"true"),
+                    ],
+                })
+                await send({"type": "http.response.body", "body": stored.body})
+                return
+
+            replayed_body = False
+
+            async def receive_buffered():
+                nonlocal replayed_body
+                if not replayed_body:
+                    replayed_body = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+                return await receive()
+
+            response = {"status": 500, "headers": [], "body": []}
+
+            async def send_and_keep(message):
+                if message["type"] == "http.response.start":
+                    response["status"] = message["status"]
+                    response["headers"] = [
+                        (name, value) for name, value in message.get("headers", [])
+                        if not _per_request(name)
+                    ]
+                elif message["type"] == "http.response.body":
+                    response["body"].append(message.get("body", b""))
+                await send(message)
+
+            await self.app(scope, receive_buffered, send_and_keep)
+            if 200 <= response["status"] < 300:
+                self.store.put(key, fingerprint, response["status"], response["headers"], b"".join(response["body"]))
+                idempotency_requests.inc("stored")
+            else:
+                idempotency_requests.inc("not_stored")
+        finally:
+            self.store.release(key, lock)
@@ -0,0 +1,270 @@
+"""
+FleetFlow Metrics – In-process counters and histograms in Prometheus text format.
+
+Every thread records into its own shard (a thread-local dict), so the hot
+path takes no lock: the event loop thread owns the HTTP metrics and each
+threadpool worker owns its bcrypt / JWT timings. A scrape sums the shards.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+Labels = Tuple[str, ...]
+
+# Seconds. Tuned for API latencies; bcrypt lands in the upper buckets.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}  # bucket counts…, sum, count
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()  # guards the shard list and metric definitions only
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._metrics: List["_Metric"] = []
+
+    def shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def _merged(self) -> Tuple[Dict, Dict]:
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # list(dict.items()) is atomic under the GIL; values may be a hair stale.
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0.0) + value
+            for key, values in list(shard.histograms.items()):
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = list(values)
+                else:
+                    for i, v in enumerate(values):
+                        merged[i] += v
+        return counters, histograms
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        counters, histograms = self._merged()
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            metric.render(lines, counters, histograms)
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, registry: Registry, name: str, help: str, labelnames: Labels = ()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def render(self, lines, counters, histograms) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        counters = self.registry.shard().counters
+        key = (self.name, labels)
+        counters[key] = counters.get(key, 0.0) + amount
+
+    def render(self, lines, counters, histograms) -> None:
+        for (name, labels), value in sorted(counters.items()):
+            if name == self.name:
+                lines.append(f"{name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        histograms = self.registry.shard().histograms
+        key = (self.name, labels)
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0.0] * (len(self.buckets) + 3)
+        values[bisect_left(self.buckets, value)] += 1  # last bucket slot is +Inf
+        values[-2] += value
+        values[-1] += 1
+
+    @contextmanager
+    def time(self, *labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def timed(self, *labels: str):
+        """Decorator form of `time`."""
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(*labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def render(self, lines, counters, histograms) -> None:
+        for (name, labels), values in sorted(histograms.items()):
+            if name != self.name:
+                continue
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f"{name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{name}_sum{label_str} {_format_value(values[-2])}")
+            lines.append(f"{name}_count{label_str} {_format_value(values[-1])}")
+
+
+class Gauge(_Metric):
+    """Read at scrape time from `collect`, which returns (label values, value) pairs."""
+    kind = "gauge"
+
+    def __init__(self, registry, name, help, labelnames=(), collect: Optional[Callable] = None):
+        super().__init__(registry, name, help, labelnames)
+        self.collect = collect or (lambda: [])
+
+    def render(self, lines, counters, histograms) -> None:
+        for labels, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+
+
+registry = Registry()
+
+# ── HTTP ─────────────────────────────────────────────────────
+http_requests_total = Counter(
+    registry, "fleetflow_http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    registry, "fleetflow_http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ("method", "route"),
+)
+
+# ── Auth ─────────────────────────────────────────────────────
+auth_duration = Histogram(
+    registry, "fleetflow_auth_operation_duration_seconds",
+    "Time spent in bcrypt and JWT operations.",
+    ("operation",),
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: no per-request task or body wrapping, just a
+    send() hook to catch the status code. `in_flight` is only touched on
+    the event loop thread, so a plain int is exact.
+    """
+    in_flight = 0
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        MetricsMiddleware.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            MetricsMiddleware.in_flight -= 1
+            route = scope.get("route")
+            template = route.path if route is not None else "<unmatched>"
+            method = scope["method"]
+            http_request_duration.observe(time.perf_counter() - start, method, template)
+            http_requests_total.inc(method, template, str(status_code))
+
+
+http_in_flight = Gauge(
+    registry, "fleetflow_http_requests_in_flight",
+    "Requests currently being served.",
+    collect=lambda: [((), MetricsMiddleware.in_flight)],
+)
+
+
+def register_pool_metrics(engine) -> None:
+    """Expose SQLAlchemy connection pool occupancy (QueuePool-style pools)."""
+    pool = engine.pool
+
+    def collect():
+        stats = []
+        for state, attr in (("size", "size"), ("checked_in", "checkedin"),
+                            ("checked_out", "checkedout"), ("overflow", "overflow")):
+            reader = getattr(pool, attr, None)
+            if reader is not None:
+                stats.append(((state,), reader()))
+        return stats
+
+    Gauge(
+        registry, "fleetflow_db_pool_connections",
+        "Database connection pool occupancy.",
+        ("state",), collect=collect,
+    )
@@ -0,0 +1,249 @@
+"""
+FleetFlow Profiling – On-demand statistical profiles of live requests.
+
+A request is profiled when a Manager sends `X-Profile: 1`, or at random
+with probability PROFILE_SAMPLE_RATE. A sampler thread snapshots every
+thread's stack with sys._current_frames() while the request runs and
+keeps the stacks that pass through application code.
+
+Sampling rather than cProfile because sync endpoints run on threadpool
+workers: a deterministic profiler only hooks the thread that enables it,
+and Python 3.11 has no all-threads hook. Stacks from other requests
+running at the same moment will show up in the profile.
+"""
+import io
+import itertools
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.security import decode_access_token
+
+settings = get_settings()
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ROOT = os.path.dirname(APP_DIR)
+_THIS_FILE = os.path.abspath(__file__)
+
+# Scheduler jobs, the outbox dispatcher and samplers run app code too; never attribute them.
+BACKGROUND_THREADS = ("task:", "outbox-dispatcher", "profiler:")
+
+FuncKey = Tuple[str, int, str]  # pstats key: (filename, first line, function name)
+
+
+def _short(filename: str) -> str:
+    if filename.startswith(_ROOT):
+        return os.path.relpath(filename, _ROOT)
+    parts = filename.replace("\\", "/").split("/site-packages/")
+    return parts[-1]
+
+
+@dataclass
+class Profile:
+    id: int
+    method: str
+    path: str
+    trigger: str  # header | sample
+    started_at: datetime
+    interval: float
+    route: Optional[str] = None
+    status: Optional[int] = None
+    duration_ms: float = 0.0
+    stacks: Counter = field(default_factory=Counter)  # tuple of FuncKey, root first → samples
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": self.samples,
+            "interval_ms": self.interval * 1e3,
+        }
+
+    # ── Output formats ───────────────────────────────────────
+    def collapsed(self) -> str:
+        """One `frame;frame;frame count` line per stack (flamegraph.pl, speedscope)."""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            frames = ";".join(f"{_short(f)}:{name}" for f, _, name in stack)
+            lines.append(f"{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def pstats_text(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """pstats report built from the samples: times are samples × interval."""
+        out = io.StringIO()
+        stats = pstats.Stats(_SampledStats(self), stream=out)
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+class _SampledStats:
+    """Adapts sampled stacks to the object shape pstats.Stats loads from."""
+
+    def __init__(self, profile: Profile):
+        self.profile = profile
+        self.stats = {}
+
+    def create_stats(self) -> None:
+        interval = self.profile.interval
+        own: Counter = Counter()
+        total: Counter = Counter()
+        edges: Dict[FuncKey, Counter] = {}
+        for stack, count in self.profile.stacks.items():
+            own[stack[-1]] += count
+            for func in set(stack):
+                total[func] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                edges.setdefault(callee, Counter())[caller] += count
+        self.stats = {
+            func: (
+                n, n, own[func] * interval, n * interval,
+                {caller: (c, c, 0.0, c * interval) for caller, c in edges.get(func, {}).items()},
+            )
+            for func, n in total.items()
+        }
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, profile: Profile):
+        super().__init__(name=f"profiler:{profile.id}", daemon=True)
+        self.profile = profile
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        interval = self.profile.interval
+        while not self._done.wait(interval):
+            background = {
+                t.ident for t in threading.enumerate()
+                if t.name.startswith(BACKGROUND_THREADS)
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in background:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None:
+                    code = frame.f_code
+                    if code.co_filename == _THIS_FILE:
+                        break  # the middleware awaiting the app; nothing above is the request
+                    if code.co_filename.startswith(APP_DIR):
+                        in_app = True
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                if in_app:
+                    stack.reverse()
+                    self.profile.stacks[tuple(stack)] += 1
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+class ProfileStore:
+    """Bounded ring buffer of finished profiles."""
+
+    def __init__(self, size: int):
+        self._lock = threading.Lock()
+        self._profiles: deque = deque(maxlen=size)
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> List[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+
+profile_store = ProfileStore(settings.PROFILE_BUFFER_SIZE)
+
+
+def _requested_by_manager(scope) -> bool:
+    headers = dict(scope["headers"])
+    if headers.get(b"x-profile", b"").lower() not in (b"1", b"true", b"yes"):
+        return False
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    if not auth.lower().startswith("bearer "):
+        return False
+    try:
+        return decode_access_token(auth[7:]).get("role") == "Manager"
+    except Exception:
+        return False
+
+
+class ProfilingMiddleware:
+    """Pure ASGI; costs one header lookup (and one random()) on unprofiled requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if _requested_by_manager(scope):
+            trigger = "header"
+        elif settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+            trigger = "sample"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(
+            id=profile_store.next_id(),
+            method=scope["method"],
+            path=scope["path"],
+            trigger=trigger,
+            started_at=datetime.now(),
+            interval=settings.PROFILE_SAMPLE_INTERVAL_MS / 1e3,
+        )
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(profile.id).encode())
+                ]
+            await send(message)
+
+        sampler = _Sampler(profile)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            profile.duration_ms = (time.perf_counter() - start) * 1e3
+            route = scope.get("route")
+            profile.route = route.path if route is not None else None
+            profile_store.add(profile)
@@ -0,0 +1,83 @@
+"""
+FleetFlow Scheduler – Minimal in-process runner for periodic jobs.
+
+Each job runs on its own daemon thread and sleeps on an Event, so
+shutdown is immediate. Jobs must open their own database sessions.
+"""
+import logging
+import threading
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Calls `func` every `interval_seconds` until stopped."""
+
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], None],
+        run_immediately: bool = False,
+    ):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.run_immediately = run_immediately
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run(self) -> None:
+        if self.run_immediately:
+            self._tick()
+        while not self._stop.wait(self.interval_seconds):
+            self._tick()
+
+    def _tick(self) -> None:
+        try:
+            self.func()
+        except Exception:
+            logger.exception("scheduled task '%s' failed", self.name, extra={"task": self.name})
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"task:{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+class Scheduler:
+    """Registry of periodic tasks started and stopped with the app."""
+
+    def __init__(self):
+        self._tasks: Dict[str, PeriodicTask] = {}
+
+    def add(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], None],
+        run_immediately: bool = False,
+    ) -> PeriodicTask:
+        task = PeriodicTask(name, interval_seconds, func, run_immediately)
+        self._tasks[name] = task
+        return task
+
+    def start(self) -> None:
+        for task in self._tasks.values():
+            task.start()
+
+    def shutdown(self) -> None:
+        for task in self._tasks.values():
+            task.stop()
+        self._tasks.clear()
+
+
+scheduler = Scheduler()
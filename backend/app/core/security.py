@@ -7,6 +7,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import get_settings
+from app.core.logging import bind_user
+from app.core.metrics import auth_duration
 
 settings = get_settings()
 
@@ -15,12 +17,14 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 # ── Password hashing (using bcrypt directly) ────────────────
+@auth_duration.timed("bcrypt_hash")
 def hash_password(password: str) -> str:
     pwd_bytes = password.encode("utf-8")
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(pwd_bytes, salt).decode("utf-8")
 
 
+@auth_duration.timed("bcrypt_verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         plain_password.encode("utf-8"),
@@ -28,6 +32,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+@auth_duration.timed("jwt_encode")
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -37,6 +42,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+@auth_duration.timed("jwt_decode")
 def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(
@@ -61,4 +67,5 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    bind_user(int(user_id))
     return {"user_id": int(user_id), "role": role, "email": payload.get("email")}
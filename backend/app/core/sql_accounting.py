@@ -0,0 +1,192 @@
+"""
+FleetFlow SQL Accounting – Per-request statement counts, DB time and N+1 hints.
+
+Engine cursor events add to a `QueryStats` held in a ContextVar. The ASGI
+middleware installs a fresh one per request; sync endpoints run in the
+threadpool with a copy of the context, so they add to the same object.
+Work outside a request (scheduler, outbox) is not counted.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import get_settings
+from app.core.metrics import Histogram, registry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists and multi-row VALUES vary in length; fold them so
+# "the same query with different ids" shares one fingerprint.
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+db_statements_per_request = Histogram(
+    registry, "fleetflow_db_statements_per_request",
+    "SQL statements issued per request, by route template.",
+    ("route",), buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+
+
+def fingerprint(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _PARAM_LIST.sub("(?)", statement)).strip()
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0      # rows affected / returned, where the driver reports it
+    loaded: int = 0    # ORM instances loaded
+    shapes: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "QueryStats") -> None:
+        self.statements += other.statements
+        self.db_seconds += other.db_seconds
+        self.rows += other.rows
+        self.loaded += other.loaded
+        self.shapes.update(other.shapes)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes issued at least `threshold` times – likely N+1 loops."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+_collectors: List[QueryStats] = []  # open assert_query_budget blocks; fed by finished requests
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+# ── Engine hooks ─────────────────────────────────────────────
+def instrument_engine(engine, base) -> None:
+    """Attach the cursor and ORM-load listeners. Call once at import time."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is None:
+            return
+        started = conn.info["query_start"].pop()
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - started
+        if cursor.rowcount and cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+        stats.shapes[fingerprint(statement)] += 1
+
+    @event.listens_for(base, "load", propagate=True)
+    def _loaded(target, context):
+        stats = _current.get()
+        if stats is not None:
+            stats.loaded += 1
+
+
+# ── Middleware ───────────────────────────────────────────────
+class QueryAccountingMiddleware:
+    """
+    Adds a `Server-Timing` header (db time and statement count) and warns
+    in the log when a request goes over the configured budgets or repeats
+    one statement shape often enough to look like an N+1 loop.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1e3
+                timing = (
+                    f'db;dur={stats.db_seconds * 1e3:.2f};desc="{stats.statements} queries, '
+                    f'{stats.loaded} loaded", app;dur={total_ms:.2f}'
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            template = route.path if route is not None else "<unmatched>"
+            db_statements_per_request.observe(stats.statements, template)
+            for collector in list(_collectors):
+                collector.merge(stats)
+            _check_budgets(scope["method"], template, stats)
+
+
+def _check_budgets(method: str, template: str, stats: QueryStats) -> None:
+    problems = []
+    if stats.statements > settings.SQL_STATEMENT_BUDGET:
+        problems.append(f"{stats.statements} statements > budget {settings.SQL_STATEMENT_BUDGET}")
+    db_ms = stats.db_seconds * 1e3
+    if db_ms > settings.SQL_TIME_BUDGET_MS:
+        problems.append(f"{db_ms:.1f} ms in database > budget {settings.SQL_TIME_BUDGET_MS} ms")
+    for shape, n in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+        problems.append(f"possible N+1: {n}x {shape[:200]}")
+    if problems:
+        logger.warning(
+            "%s %s: %s", method, template, "; ".join(problems),
+            extra={"statements": stats.statements, "db_ms": round(db_ms, 2)},
+        )
+
+
+# ── Budget assertions (scripts / CI) ─────────────────────────
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_query_budget(max_statements: int, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Count statements issued inside the block and fail if there are more
+    than `max_statements`, or if any one statement shape runs more than
+    `max_repeats` times. Counts both direct calls in this context and any
+    requests served while the block is open (e.g. through TestClient).
+
+        with assert_query_budget(3):
+            client.get("/vehicles/1?expand=trips")
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+        _current.reset(token)
+    if stats.statements > max_statements:
+        raise QueryBudgetExceeded(
+            f"{stats.statements} statements > budget {max_statements}:\n"
+            + "\n".join(f"  {n}x {shape}" for shape, n in stats.shapes.most_common())
+        )
+    if max_repeats is not None:
+        over = stats.repeated(max_repeats + 1)
+        if over:
+            raise QueryBudgetExceeded(
+                "Repeated statements:\n" + "\n".join(f"  {n}x {shape}" for shape, n in over)
+            )
+
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from typing import Generator
 
@@ -17,6 +17,14 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 
+if settings.DATABASE_URL.startswith("sqlite"):
+    # SQLite ignores ON DELETE CASCADE / SET NULL unless asked per connection
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
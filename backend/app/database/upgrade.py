@@ -0,0 +1,105 @@
+"""
+FleetFlow Schema Upgrade – Bring existing databases up to the models.
+
+`Base.metadata.create_all` creates missing tables but never touches
+tables that already exist. `upgrade_schema` runs right after it at
+startup and adds what later versions introduced to existing tables:
+
+- nullable columns (e.g. the trip lifecycle timestamps)
+- indexes declared on the model but missing from the table
+- on SQLite, AUTOINCREMENT for tables that set `sqlite_autoincrement`
+  (trips, vehicles, drivers). SQLite cannot alter that in place, so the
+  table is rebuilt: renamed aside, created from the model, refilled,
+  and its triggers (the search index ones) put back.
+
+Every step is guarded by an inspector check, so it is a no-op on an
+up-to-date database and safe to run on every start.
+"""
+import logging
+
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(conn: Connection, metadata: MetaData) -> None:
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            if not column.nullable or column.server_default is not None:
+                logger.warning("column %s.%s is missing and needs a default; add it by hand", table.name, column.name)
+                continue
+            conn.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=conn.dialect)}"
+            ))
+            present.add(column.name)
+            logger.info("added column %s.%s", table.name, column.name)
+
+        indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes and all(c.name in present for c in index.columns):
+                index.create(conn)
+                logger.info("added index %s", index.name)
+
+
+def _rebuild_table(conn: Connection, table) -> None:
+    name, old = table.name, f"_{table.name}_old"
+    triggers = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :name"), {"name": name}
+    ).scalars().all()
+    for index in inspect(conn).get_indexes(name):
+        conn.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+    conn.exec_driver_sql(f'ALTER TABLE "{name}" RENAME TO "{old}"')
+    table.create(conn)
+    columns = ", ".join(f'"{c["name"]}"' for c in inspect(conn).get_columns(old) if c["name"] in table.c)
+    conn.exec_driver_sql(f'INSERT INTO "{name}" ({columns}) SELECT {columns} FROM "{old}"')
+    conn.exec_driver_sql(f'DROP TABLE "{old}"')
+    for sql in triggers:
+        conn.exec_driver_sql(sql)
+    logger.info("rebuilt table %s with AUTOINCREMENT", name)
+
+
+def _add_sqlite_autoincrement(engine: Engine, metadata: MetaData) -> None:
+    with engine.connect() as conn:
+        created = dict(conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'table'")).all())
+        stale = [
+            table for table in metadata.sorted_tables
+            if table.dialect_options["sqlite"]["autoincrement"]
+            and table.name in created and "AUTOINCREMENT" not in created[table.name].upper()
+        ]
+        conn.commit()
+        if not stale:
+            return
+        # Both pragmas only take effect outside a transaction. legacy_alter_table
+        # keeps the rename from repointing other tables' foreign keys at the
+        # table being moved aside.
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+        try:
+            conn.exec_driver_sql("BEGIN")  # SQLite DDL is transactional once a BEGIN is explicit
+            for table in stale:
+                _rebuild_table(conn, table)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def upgrade_schema(engine: Engine, metadata: MetaData) -> None:
+    """Apply the upgrades above. Run after create_all."""
+    if engine.dialect.name == "sqlite":
+        _add_sqlite_autoincrement(engine, metadata)
+    with engine.begin() as conn:
+        _add_missing_columns(conn, metadata)
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+
+
+class Expand:
+    """
+    FastAPI dependency that parses a comma-separated `expand` query parameter.
+
+    Relationships are lazy="raise", so routes load exactly the relations the
+    caller asked for and nothing else.
+
+    Usage:
+        vehicle_expand = Expand(["trips", "fuel_logs"])
+
+        @router.get("/{id}")
+        def get_item(expand: set[str] = Depends(vehicle_expand)):
+            ...
+    """
+
+    def __init__(self, allowed: list[str]):
+        self.allowed = allowed
+
+    def __call__(self, expand: Optional[str] = Query(None)) -> set[str]:
+        if not expand:
+            return set()
+        requested = {part.strip() for part in expand.split(",") if part.strip()}
+        unknown = requested.difference(self.allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Unknown expand value(s): {', '.join(sorted(unknown))}. "
+                    f"Allowed: {', '.join(self.allowed)}"
+                ),
+            )
+        return requested
@@ -0,0 +1,167 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Response, status
+
+from app.core.config import get_settings
+from app.core.metrics import Counter, registry
+from app.core.security import get_current_user
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+rate_limited_requests = Counter(
+    registry, "fleetflow_rate_limited_requests_total",
+    "Requests refused with 429 by the rate limiter.",
+    ("group", "role"),
+)
+
+
+# ── Bucket stores ────────────────────────────────────────────
+class MemoryBuckets:
+    """
+    Token buckets in this process. One dict lookup per check; buckets
+    not used for a while fall off the front once RATE_LIMIT_MAX_KEYS is
+    reached (an idle bucket has refilled anyway).
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()  # key -> [tokens, updated]
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(burst), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            bucket[0], bucket[1] = tokens, now
+            return allowed, tokens
+
+
+# Refill and take in one round-trip. Uses the Redis clock, so workers on
+# different hosts agree on elapsed time.
+_TAKE_SCRIPT = """
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1e6
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBuckets:
+    """
+    Buckets shared by every worker through Redis. If Redis cannot be
+    reached the check falls back to this worker's own buckets rather than
+    failing the request.
+    """
+
+    def __init__(self, url: str, fallback: MemoryBuckets):
+        import redis  # optional dependency, only needed when RATE_LIMIT_REDIS_URL is set
+
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+        self.fallback = fallback
+
+    def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = self._take(keys=[f"fleetflow:ratelimit:{key}"], args=[rate, burst, cost])
+            return bool(allowed), float(tokens)
+        except self._errors as e:
+            logger.warning("rate limit store unavailable, using local buckets: %s", e)
+            return self.fallback.take(key, rate, burst, cost)
+
+
+def _make_store():
+    memory = MemoryBuckets(settings.RATE_LIMIT_MAX_KEYS)
+    if not settings.RATE_LIMIT_REDIS_URL:
+        return memory
+    try:
+        return RedisBuckets(settings.RATE_LIMIT_REDIS_URL, memory)
+    except ImportError:
+        logger.warning("RATE_LIMIT_REDIS_URL is set but redis is not installed; limits are per worker")
+        return memory
+
+
+rate_limit_store = _make_store()
+
+
+# ── Dependency ───────────────────────────────────────────────
+class RateLimiter:
+    """
+    FastAPI dependency that enforces a token bucket per (user, role, route
+    group). Limits come from `settings.RATE_LIMITS[group]`, with a role's
+    own entry taking precedence over "*"; a group or role without an
+    entry is not limited.
+
+    Usage:
+        limit_analytics = RateLimiter("analytics")
+
+        @router.get("/dashboard", dependencies=[Depends(limit_analytics)])
+        def dashboard(...):
+            ...
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+
+    def limits(self, role: Optional[str]) -> Optional[Tuple[float, int]]:
+        group = settings.RATE_LIMITS.get(self.group, {})
+        return group.get(role) or group.get("*")
+
+    def check(self, current_user: dict, cost: float = 1.0) -> Optional[Tuple[int, float]]:
+        """Spend `cost` tokens or raise 429. Returns (burst, tokens left), or None when unlimited."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        role = current_user.get("role")
+        limits = self.limits(role)
+        if limits is None:
+            return None
+        rate, burst = limits
+        key = f"{self.group}:{role}:{current_user['user_id']}"
+        allowed, tokens = rate_limit_store.take(key, rate, burst, cost)
+        if not allowed:
+            rate_limited_requests.inc(self.group, str(role))
+            retry_after = max(1, math.ceil((cost - tokens) / rate))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit for {self.group} exceeded. Retry in {retry_after}s.",
+                headers={
+                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Limit": str(burst),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+        return burst, tokens
+
+    def __call__(self, response: Response, current_user: dict = Depends(get_current_user)):
+        state = self.check(current_user)
+        if state is not None:
+            response.headers["X-RateLimit-Limit"] = str(state[0])
+            response.headers["X-RateLimit-Remaining"] = str(math.floor(state[1]))
+        return current_user
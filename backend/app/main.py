@@ -1,27 +1,51 @@
 """
 FleetFlow Backend – FastAPI Application Entry Point
 """
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
+from app.core.logging import RequestLoggingMiddleware, setup_logging, shutdown_logging
 from app.database.base import Base
-from app.database.session import engine
+from app.database.session import engine, SessionLocal
+from app.database.upgrade import upgrade_schema
+from app.core.scheduler import scheduler
+from app.core.metrics import MetricsMiddleware, register_pool_metrics
+from app.core.sql_accounting import QueryAccountingMiddleware, instrument_engine
+from app.core.profiling import ProfilingMiddleware
+from app.core.idempotency import IdempotencyMiddleware
+from app.services.availability_index import availability_index
+from app.services.compliance_service import compliance_index
+from app.services.maintenance_service import backfill_schedules
+from app.services.trip_event_service import trip_projector
+from app.services.telematics_service import odometer_buffer
+from app.services.event_bus import event_bus
+from app.services.outbox_service import outbox
+from app.services.search_service import search_index
+from app.services import outbox_handlers  # noqa: F401  (registers handlers)
 
 # Import all models so Base.metadata knows about them
 from app.models.user import User  # noqa: F401
 from app.models.vehicle import Vehicle  # noqa: F401
 from app.models.driver import Driver  # noqa: F401
 from app.models.trip import Trip  # noqa: F401
+from app.models.trip_event import TripEvent, TripProjectionSnapshot  # noqa: F401
 from app.models.maintenance import MaintenanceLog  # noqa: F401
+from app.models.maintenance_schedule import MaintenanceSchedule  # noqa: F401
 from app.models.fuel_log import FuelLog  # noqa: F401
 from app.models.expense import Expense  # noqa: F401
 from app.models.audit_log import AuditLog  # noqa: F401
+from app.models.outbox import OutboxMessage  # noqa: F401
+from app.models.archive import TripArchive, FuelLogArchive, MaintenanceLogArchive, ExpenseArchive  # noqa: F401
 
 # Import routers
-from app.routes import auth, vehicles, drivers, trips, maintenance, fuel, analytics, audit_logs
+from app.routes import auth, vehicles, drivers, trips, maintenance, fuel, analytics, audit_logs, rules, telematics, events, outbox as outbox_routes, metrics, debug, export, batch, search
 
 settings = get_settings()
+setup_logging()
+logger = logging.getLogger(__name__)
 
 # ── Create app ───────────────────────────────────────────────
 app = FastAPI(
@@ -35,29 +59,38 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
-# ── CORS ─────────────────────────────────────────────────────
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 # ── Exception Logging Middleware ──────────────────────────────
 from fastapi import Request
-import traceback
-import sys
 
 @app.middleware("http")
 async def log_exceptions_middleware(request: Request, call_next):
     try:
         return await call_next(request)
     except Exception as e:
-        print(f"ERROR: {e}", file=sys.stderr)
-        traceback.print_exc()
+        logger.exception("unhandled error: %s", e)
         raise e
 
+# ── Metrics ──────────────────────────────────────────────────
+# Added after the app's own layers so they see the whole request; only CORS wraps them.
+instrument_engine(engine, Base)
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(QueryAccountingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestLoggingMiddleware)
+register_pool_metrics(engine)
+
+# ── CORS ─────────────────────────────────────────────────────
+# Outermost, so responses produced by the layers above (idempotency 400 /
+# 422s and replays) get headers for the origin of the current request.
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 # ── Include routers ──────────────────────────────────────────
 app.include_router(auth.router)
 app.include_router(vehicles.router)
@@ -67,12 +100,88 @@ app.include_router(maintenance.router)
 app.include_router(fuel.router)
 app.include_router(analytics.router)
 app.include_router(audit_logs.router)
+app.include_router(rules.router)
+app.include_router(telematics.router)
+app.include_router(events.router)
+app.include_router(outbox_routes.router)
+app.include_router(metrics.router)
+app.include_router(debug.router)
+app.include_router(export.router)
+app.include_router(batch.router)
+app.include_router(search.router)
+
+
+# ── Startup: create / upgrade tables, warm caches, start jobs ─────
+def _check_availability_index():
+    with SessionLocal() as db:
+        availability_index.check_consistency(db)
+
+
+def _run_compliance_sweep():
+    with SessionLocal() as db:
+        compliance_index.run_sweep(db)
+
+
+def _flush_odometer_buffer():
+    with SessionLocal() as db:
+        odometer_buffer.flush(db)
+
+
+def _snapshot_trip_projection():
+    with SessionLocal() as db:
+        trip_projector.catch_up(db)
+        trip_projector.snapshot(db)
+
+
+def _prune_outbox():
+    with SessionLocal() as db:
+        outbox.prune(db, settings.OUTBOX_RETENTION_HOURS)
 
 
-# ── Startup: auto-create tables ──────────────────────────────
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine, Base.metadata)
+
+    with SessionLocal() as db:
+        availability_index.rebuild(db)
+        backfill_schedules(db)
+        trip_projector.load(db)
+        search_index.install(engine, db)
+
+    scheduler.add(
+        "availability-index-check",
+        settings.AVAILABILITY_CHECK_INTERVAL_SECONDS,
+        _check_availability_index,
+    )
+    scheduler.add(
+        "license-compliance-sweep",
+        settings.COMPLIANCE_SWEEP_INTERVAL_SECONDS,
+        _run_compliance_sweep,
+        run_immediately=True,
+    )
+    scheduler.add(
+        "telemetry-flush",
+        settings.TELEMETRY_FLUSH_INTERVAL_SECONDS,
+        _flush_odometer_buffer,
+    )
+    scheduler.add(
+        "trip-projection-snapshot",
+        settings.TRIP_SNAPSHOT_INTERVAL_SECONDS,
+        _snapshot_trip_projection,
+    )
+    scheduler.add("outbox-prune", 3600, _prune_outbox)
+    scheduler.start()
+    outbox.start(SessionLocal)
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    scheduler.shutdown()
+    _flush_odometer_buffer()
+    outbox.stop()
+    event_bus.close_all()
+    shutdown_logging()
 
 
 # ── Health check ─────────────────────────────────────────────
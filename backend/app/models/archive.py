@@ -0,0 +1,53 @@
+"""
+Archive tables for retired vehicles' history.
+
+Each archive mirrors its source table column-for-column (no foreign keys
+or defaults) plus `archived_at`, so rows can be moved with a single
+INSERT … SELECT. The source `id` is kept as `source_id`; the archive has
+its own key, since a source id can come back into use once its row has
+been moved out (SQLite hands out max(id) + 1).
+"""
+from sqlalchemy import Column, DateTime, Index, Integer, Table, func
+
+from app.database.base import Base
+from app.models.trip import Trip
+from app.models.fuel_log import FuelLog
+from app.models.maintenance import MaintenanceLog
+from app.models.expense import Expense
+
+
+def archive_column(name: str) -> str:
+    """Name of a source column in its archive table."""
+    return "source_id" if name == "id" else name
+
+
+def _archive_of(source: Table, name: str) -> Table:
+    columns = [
+        Column(archive_column(c.name), c.type, nullable=c.nullable)
+        for c in source.columns
+    ]
+    return Table(
+        name,
+        Base.metadata,
+        Column("archive_id", Integer, primary_key=True, autoincrement=True),
+        *columns,
+        Column("archived_at", DateTime, server_default=func.now()),
+        Index(f"ix_{name}_source_id", "source_id"),
+        Index(f"ix_{name}_vehicle_id", "vehicle_id"),
+    )
+
+
+class TripArchive(Base):
+    __table__ = _archive_of(Trip.__table__, "trips_archive")
+
+
+class FuelLogArchive(Base):
+    __table__ = _archive_of(FuelLog.__table__, "fuel_logs_archive")
+
+
+class MaintenanceLogArchive(Base):
+    __table__ = _archive_of(MaintenanceLog.__table__, "maintenance_logs_archive")
+
+
+class ExpenseArchive(Base):
+    __table__ = _archive_of(Expense.__table__, "expenses_archive")
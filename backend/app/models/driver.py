@@ -5,14 +5,17 @@ from app.database.base import Base
 
 class Driver(Base):
     __tablename__ = "drivers"
+    # Never hand out an id again once its row is gone (SQLite otherwise
+    # reuses max(id) + 1), so trip events and archives keep pointing at one row.
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), nullable=False)
-    license_expiry = Column(Date, nullable=False)
+    license_expiry = Column(Date, nullable=False, index=True)
     safety_score = Column(Float, default=100.0)
     trip_completion_rate = Column(Float, default=100.0)
     status = Column(String(20), nullable=False, default="Off Duty")  # On Duty | Off Duty | Suspended
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationships
-    trips = relationship("Trip", back_populates="driver")
+    trips = relationship("Trip", back_populates="driver", lazy="raise")
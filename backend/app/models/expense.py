@@ -14,4 +14,4 @@ class Expense(Base):
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationships
-    vehicle = relationship("Vehicle", back_populates="expenses")
+    vehicle = relationship("Vehicle", back_populates="expenses", lazy="raise")
@@ -14,4 +14,4 @@ class FuelLog(Base):
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationships
-    vehicle = relationship("Vehicle", back_populates="fuel_logs")
+    vehicle = relationship("Vehicle", back_populates="fuel_logs", lazy="raise")
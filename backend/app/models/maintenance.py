@@ -15,4 +15,4 @@ class MaintenanceLog(Base):
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationships
-    vehicle = relationship("Vehicle", back_populates="maintenance_logs")
+    vehicle = relationship("Vehicle", back_populates="maintenance_logs", lazy="raise")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.database.base import Base
+
+
+class MaintenanceSchedule(Base):
+    """Next-due point for one service type on one vehicle (the due-queue)."""
+    __tablename__ = "maintenance_schedules"
+    __table_args__ = (UniqueConstraint("vehicle_id", "service_type"),)
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False, index=True)
+    service_type = Column(String(100), nullable=False)
+    last_service_odometer = Column(Float, nullable=False, default=0.0)
+    last_service_date = Column(Date, nullable=False)
+    due_odometer = Column(Float, nullable=True)   # None when the rule has no km interval
+    km_remaining = Column(Float, nullable=True, index=True)
+    due_date = Column(Date, nullable=True, index=True)  # None when the rule has no day interval
+
+    # Relationships
+    vehicle = relationship("Vehicle", back_populates="maintenance_schedules", lazy="raise")
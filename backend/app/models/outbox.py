@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.database.base import Base
+
+
+def utcnow() -> datetime:
+    """Naive UTC, the form timestamps set from Python are stored in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class OutboxMessage(Base):
+    """
+    Side effect recorded in the same transaction as the change that caused it.
+    The dispatcher delivers rows in id order per (entity, entity_id).
+    """
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    kind = Column(String(20), nullable=False)  # change | audit
+    entity = Column(String(30), nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    payload = Column(Text, nullable=False, default="{}")  # JSON
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(255), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    available_at = Column(DateTime, nullable=True)  # retry backoff
+    dispatched_at = Column(DateTime, nullable=True)
+    failed_at = Column(DateTime, nullable=True)  # gave up after max attempts
+
+    __table_args__ = (
+        Index("ix_outbox_pending", "dispatched_at", "failed_at", "id"),
+    )
@@ -5,6 +5,9 @@ from app.database.base import Base
 
 class Trip(Base):
     __tablename__ = "trips"
+    # Never hand out an id again once its row is gone (SQLite otherwise
+    # reuses max(id) + 1), so trip events and archives keep pointing at one row.
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
@@ -13,9 +16,12 @@ class Trip(Base):
     status = Column(String(20), nullable=False, default="Draft")  # Draft | Dispatched | Completed | Cancelled
     start_odometer = Column(Float, default=0.0)
     end_odometer = Column(Float, nullable=True)
+    dispatched_at = Column(DateTime, nullable=True, index=True)
+    completed_at = Column(DateTime, nullable=True, index=True)
+    cancelled_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    vehicle = relationship("Vehicle", back_populates="trips")
-    driver = relationship("Driver", back_populates="trips")
+    vehicle = relationship("Vehicle", back_populates="trips", lazy="raise")
+    driver = relationship("Driver", back_populates="trips", lazy="raise")
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, func
+from sqlalchemy.dialects import mysql
+from app.database.base import Base
+
+
+class TripEvent(Base):
+    """
+    Append-only trip lifecycle stream. Rows are never updated or deleted;
+    `trip_id` is deliberately not a foreign key so history outlives the trip;
+    trips, vehicles and drivers never reuse an id, so it stays unambiguous.
+    """
+    __tablename__ = "trip_events"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    trip_id = Column(Integer, nullable=False, index=True)
+    vehicle_id = Column(Integer, nullable=False, index=True)
+    driver_id = Column(Integer, nullable=True, index=True)
+    event_type = Column(String(20), nullable=False)  # Created | Dispatched | Completed | Cancelled
+    cargo_weight = Column(Float, nullable=True)
+    odometer = Column(Float, nullable=True)
+    actor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    occurred_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+
+
+class TripProjectionSnapshot(Base):
+    """Serialized projection state as of `last_event_id`."""
+    __tablename__ = "trip_projection_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    last_event_id = Column(Integer, nullable=False, index=True)
+    state = Column(Text().with_variant(mysql.LONGTEXT, "mysql"), nullable=False)  # JSON; TEXT caps at 64 KB on MySQL
+    created_at = Column(DateTime, server_default=func.now())
@@ -5,6 +5,9 @@ from app.database.base import Base
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
+    # Never hand out an id again once its row is gone (SQLite otherwise
+    # reuses max(id) + 1), so trip events and archives keep pointing at one row.
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), nullable=False)
@@ -14,8 +17,10 @@ class Vehicle(Base):
     status = Column(String(20), nullable=False, default="Available")  # Available | On Trip | In Shop | Retired
     created_at = Column(DateTime, server_default=func.now())
 
-    # Relationships
-    trips = relationship("Trip", back_populates="vehicle", cascade="all, delete-orphan")
-    maintenance_logs = relationship("MaintenanceLog", back_populates="vehicle", cascade="all, delete-orphan")
-    fuel_logs = relationship("FuelLog", back_populates="vehicle", cascade="all, delete-orphan")
-    expenses = relationship("Expense", back_populates="vehicle", cascade="all, delete-orphan")
+    # Relationships – children are removed by ON DELETE CASCADE in the database.
+    # lazy="raise": load explicitly (selectinload / joinedload) or it's an error.
+    trips = relationship("Trip", back_populates="vehicle", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    maintenance_logs = relationship("MaintenanceLog", back_populates="vehicle", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    fuel_logs = relationship("FuelLog", back_populates="vehicle", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    expenses = relationship("Expense", back_populates="vehicle", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    maintenance_schedules = relationship("MaintenanceSchedule", back_populates="vehicle", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.database.session import get_db
-from app.services.analytics_service import get_dashboard_analytics
+from app.services.analytics_service import as_utc, get_dashboard_analytics, get_utilization_timeline
+from app.dependencies.rate_limiter import RateLimiter
 from app.dependencies.role_checker import RoleChecker
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 allow_analytics = RoleChecker(["Manager", "Analyst"])
+limit_analytics = RateLimiter("analytics")
 
 
-@router.get("/dashboard", response_model=dict)
+@router.get("/dashboard", response_model=dict, dependencies=[Depends(limit_analytics)])
 def dashboard(
     db: Session = Depends(get_db),
     current_user: dict = Depends(allow_analytics),
@@ -22,3 +27,22 @@ def dashboard(
         "message": "Dashboard analytics computed.",
         "data": analytics.model_dump(),
     }
+
+
+@router.get("/utilization", response_model=dict, dependencies=[Depends(limit_analytics)])
+def utilization(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    bucket: str = Query("day"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(allow_analytics),
+):
+    """Fleet utilisation over time: share of vehicle-hours on trip per bucket (default: last 30 days)."""
+    end = as_utc(end or datetime.now(timezone.utc))
+    start = as_utc(start) if start else end - timedelta(days=30)
+    timeline = get_utilization_timeline(db, start, end, bucket)
+    return {
+        "success": True,
+        "message": f"Utilization computed over {len(timeline.buckets)} buckets.",
+        "data": timeline.model_dump(),
+    }
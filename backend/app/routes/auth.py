@@ -28,11 +28,11 @@ def register(payload: UserRegister, request: Request, db: Session = Depends(get_
         role=payload.role,
     )
     db.add(user)
+    db.flush()
+    log_event(db, "Registration", "Success", user_id=user.id, request=request, commit=False)
     db.commit()
     db.refresh(user)
 
-    log_event(db, "Registration", "Success", user_id=user.id, request=request)
-
     token = create_access_token(
         data={"sub": str(user.id), "email": user.email, "role": user.role}
     )
@@ -0,0 +1,123 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Type
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.database.session import get_db
+from app.dependencies.rate_limiter import RateLimiter
+from app.dependencies.role_checker import RoleChecker
+from app.routes import analytics, drivers, fuel, maintenance, trips, vehicles
+from app.schemas.batch_schema import (
+    AvailableVehicleParams,
+    BatchRequest,
+    DueMaintenanceParams,
+    ExpandParams,
+    SubResponse,
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["Batch"])
+
+limit_batch = RateLimiter("batch")
+
+
+@dataclass(frozen=True)
+class BatchOperation:
+    run: Callable[[Session, dict, Any], dict]  # (db, current_user, params) -> response envelope
+    params: Optional[Type[BaseModel]] = None
+    guard: Optional[RoleChecker] = None  # the route's own role dependency, if it has one
+    limit: Optional[RateLimiter] = None  # and its rate limit, so batching cannot get around it
+
+
+# Read-only routes that may be batched, keyed by their path. Handlers are
+# called directly, so route dependencies are resolved here by hand.
+OPERATIONS: Dict[str, BatchOperation] = {
+    "/vehicles/": BatchOperation(
+        lambda db, user, p: vehicles.list_vehicles(db=db, current_user=user)),
+    "/vehicles/available": BatchOperation(
+        lambda db, user, p: vehicles.list_available_vehicles(
+            min_capacity=p.min_capacity, limit=p.limit, db=db, current_user=user),
+        AvailableVehicleParams),
+    "/drivers/": BatchOperation(
+        lambda db, user, p: drivers.list_drivers(db=db, current_user=user)),
+    "/drivers/compliance": BatchOperation(
+        lambda db, user, p: drivers.driver_compliance(current_user=user)),
+    "/trips/": BatchOperation(
+        lambda db, user, p: trips.list_trips(expand=trips.trip_expand(p.expand), db=db, current_user=user),
+        ExpandParams),
+    "/maintenance/": BatchOperation(
+        lambda db, user, p: maintenance.list_maintenance(db=db, current_user=user)),
+    "/maintenance/due": BatchOperation(
+        lambda db, user, p: maintenance.list_due_maintenance(
+            within_km=p.within_km, within_days=p.within_days, limit=p.limit, db=db, current_user=user),
+        DueMaintenanceParams),
+    "/fuel": BatchOperation(
+        lambda db, user, p: fuel.list_fuel_logs(db=db, current_user=user)),
+    "/expenses": BatchOperation(
+        lambda db, user, p: fuel.list_expenses(db=db, current_user=user)),
+    "/analytics/dashboard": BatchOperation(
+        lambda db, user, p: analytics.dashboard(db=db, current_user=user),
+        guard=analytics.allow_analytics, limit=analytics.limit_analytics),
+}
+
+
+def _run_one(db: Session, current_user: dict, path: str, raw_params: Dict[str, Any]) -> tuple:
+    op = OPERATIONS.get(path)
+    if op is None:
+        return 404, {"detail": f"'{path}' cannot be batched. Allowed: {', '.join(OPERATIONS)}"}
+    try:
+        if op.guard is not None:
+            op.guard(current_user=current_user)
+        if op.limit is not None:
+            op.limit.check(current_user)
+        params = op.params(**raw_params) if op.params else None
+        return 200, op.run(db, current_user, params)
+    except HTTPException as e:
+        return e.status_code, {"detail": e.detail}
+    except ValidationError as e:
+        return 422, {"detail": e.errors(include_url=False, include_context=False)}
+    except Exception:
+        logger.exception("batched request %s failed", path)
+        db.rollback()
+        return 500, {"detail": "Internal server error."}
+
+
+@router.post("", response_model=dict)
+def run_batch(
+    payload: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(limit_batch),
+):
+    """
+    Run several read requests in one round-trip: the token is checked once
+    and all sub-requests share one database session. Each result carries
+    its own status; one failing does not fail the others.
+
+        {"requests": [{"id": "v", "path": "/vehicles/"},
+                      {"id": "t", "path": "/trips/", "params": {"expand": "vehicle"}}]}
+    """
+    if len(payload.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} sub-requests per batch.",
+        )
+
+    # Sequential on purpose: a Session is not thread-safe, and separate
+    # sessions per sub-request would give up the single connection checkout.
+    results = []
+    for sub in payload.requests:
+        code, body = _run_one(db, current_user, sub.path, sub.params)
+        results.append(SubResponse(id=sub.id, path=sub.path, status=code, body=body).model_dump())
+
+    failed = sum(1 for r in results if r["status"] >= 400)
+    return {
+        "success": failed == 0,
+        "message": f"Ran {len(results)} sub-requests, {failed} failed.",
+        "data": results,
+    }
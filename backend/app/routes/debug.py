@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import profile_store
+from app.dependencies.role_checker import RoleChecker
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+allow_manager = RoleChecker(["Manager"])
+
+PSTATS_SORTS = ("cumulative", "tottime", "calls", "filename", "name")
+
+
+@router.get("/profiles", response_model=dict)
+def list_profiles(current_user: dict = Depends(allow_manager)):
+    """Captured request profiles, newest first (Manager only)."""
+    profiles = profile_store.list()
+    return {
+        "success": True,
+        "message": f"Found {len(profiles)} profiles.",
+        "data": [p.summary() for p in profiles],
+    }
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(
+    profile_id: int,
+    format: str = Query("pstats", description="pstats | collapsed"),
+    sort: str = Query("cumulative", description=f"pstats sort key: {', '.join(PSTATS_SORTS)}"),
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: dict = Depends(allow_manager),
+):
+    """
+    One profile as a pstats report, or as collapsed stacks for
+    flamegraph.pl / speedscope (Manager only).
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found (it may have been evicted).")
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    if format != "pstats":
+        raise HTTPException(status_code=400, detail="format must be 'pstats' or 'collapsed'.")
+    if sort not in PSTATS_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(PSTATS_SORTS)}")
+    return PlainTextResponse(profile.pstats_text(sort, limit))
@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from typing import List
 
 from app.database.session import get_db
 from app.models.driver import Driver
-from app.schemas.driver_schema import DriverCreate, DriverUpdate, DriverResponse
+from app.schemas.driver_schema import DriverCreate, DriverUpdate, DriverResponse, DriverUpsert
+from app.services.bulk_service import upsert_drivers
+from app.services.compliance_service import compliance_index
+from app.services.outbox_service import enqueue_change
 from app.dependencies.role_checker import RoleChecker
 from app.core.security import get_current_user
 
@@ -23,6 +27,20 @@ def list_drivers(db: Session = Depends(get_db), current_user: dict = Depends(get
     }
 
 
+@router.get("/compliance", response_model=dict)
+def driver_compliance(current_user: dict = Depends(get_current_user)):
+    """Expired and soon-to-expire licences, precomputed by the daily sweep."""
+    report = compliance_index.report()
+    return {
+        "success": True,
+        "message": (
+            f"{len(report.expired)} expired, {len(report.expiring)} expiring "
+            f"within {report.window_days} days."
+        ),
+        "data": report.model_dump(),
+    }
+
+
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_driver(
     payload: DriverCreate,
@@ -32,8 +50,11 @@ def create_driver(
     """Create a new driver (Manager or Safety only)."""
     driver = Driver(**payload.model_dump())
     db.add(driver)
+    db.flush()
+    enqueue_change(db, "driver", driver.id, "created", status=driver.status)
     db.commit()
     db.refresh(driver)
+    compliance_index.sync(driver)
 
     return {
         "success": True,
@@ -42,6 +63,24 @@ def create_driver(
     }
 
 
+@router.put("/bulk", response_model=dict)
+def bulk_upsert_drivers(
+    payload: List[DriverUpsert],
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(allow_manager_safety),
+):
+    """Create or update many drivers in one transaction (Manager or Safety only)."""
+    report = upsert_drivers(db, payload)
+    return {
+        "success": True,
+        "message": (
+            f"{len(report.created)} created, {len(report.updated)} updated, "
+            f"{len(report.rejected)} rejected."
+        ),
+        "data": report.model_dump(),
+    }
+
+
 @router.put("/{driver_id}", response_model=dict)
 def update_driver(
     driver_id: int,
@@ -57,9 +96,11 @@ def update_driver(
     update_data = payload.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(driver, field, value)
+    enqueue_change(db, "driver", driver_id, "updated", status=driver.status)
 
     db.commit()
     db.refresh(driver)
+    compliance_index.sync(driver)
 
     return {
         "success": True,
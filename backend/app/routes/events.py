@@ -0,0 +1,97 @@
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+
+from app.core.config import get_settings
+from app.core.security import decode_access_token
+from app.dependencies.role_checker import RoleChecker
+from app.services.event_bus import ENTITIES, entities_for, event_bus
+
+settings = get_settings()
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+allow_manager = RoleChecker(["Manager"])
+optional_bearer = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+
+def stream_user(
+    bearer: Optional[str] = Depends(optional_bearer),
+    token: Optional[str] = Query(None, description="For EventSource clients, which cannot set headers."),
+) -> dict:
+    """Like get_current_user, but also accepts the JWT as a query parameter."""
+    raw = bearer or token
+    if not raw:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    payload = decode_access_token(raw)
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+    return {"user_id": int(payload["sub"]), "role": payload.get("role"), "email": payload.get("email")}
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    entities: Optional[List[str]] = Query(None, description=f"Any of: {', '.join(ENTITIES)}"),
+    last_event_id: Optional[int] = Header(None),
+    current_user: dict = Depends(stream_user),
+):
+    """
+    Server-sent events for fleet state changes.
+    Defaults to the entity types relevant to the caller's role; pass
+    `entities` to choose. Reconnecting clients resume from Last-Event-ID
+    while the event is still in the replay window.
+    """
+    unknown = set(entities or ()) - set(ENTITIES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown entities: {', '.join(sorted(unknown))}")
+
+    sub = event_bus.subscribe(entities_for(current_user["role"], entities), last_event_id)
+    if sub is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many event stream subscribers.",
+            headers={"Retry-After": "30"},
+        )
+
+    async def body():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), settings.EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    if sub.evicted:
+                        yield "event: evicted\ndata: {}\n\n"
+                    break
+                yield event.to_sse()
+        finally:
+            event_bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats", response_model=dict)
+def event_stats(current_user: dict = Depends(allow_manager)):
+    """Subscriber count and delivery counters."""
+    return {
+        "success": True,
+        "message": "Event stream statistics.",
+        "data": event_bus.snapshot(),
+    }
@@ -0,0 +1,45 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.database.session import SessionLocal
+from app.services.export_service import EXPORTS, FORMATS, load_pyarrow, stream_table
+from app.dependencies.rate_limiter import RateLimiter
+from app.dependencies.role_checker import RoleChecker
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+allow_analytics = RoleChecker(["Manager", "Analyst"])
+limit_export = RateLimiter("export")
+
+
+@router.get("/{table}", dependencies=[Depends(limit_export)])
+def export_table(
+    table: str,
+    format: str = Query("arrow", description="arrow | parquet"),
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    current_user: dict = Depends(allow_analytics),
+):
+    """
+    Stream `trips`, `fuel_logs` or `expenses` as an Arrow IPC stream or a
+    Parquet file. `from` / `to` are inclusive dates (trips: created date).
+
+        pyarrow.ipc.open_stream(response.raw).read_pandas()
+    """
+    if table not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'. Use one of: {', '.join(EXPORTS)}.")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail="format must be 'arrow' or 'parquet'.")
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'.")
+    load_pyarrow()  # 501 now rather than halfway through a stream
+
+    media_type, extension = FORMATS[format]
+    return StreamingResponse(
+        stream_table(SessionLocal, table, format, start, end),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table}.{extension}"'},
+    )
@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.database.session import get_db
 from app.models.fuel_log import FuelLog
 from app.models.expense import Expense
 from app.models.vehicle import Vehicle
-from app.schemas.fuel_schema import FuelLogCreate, FuelLogResponse, ExpenseCreate, ExpenseResponse
+from app.schemas.fuel_schema import (
+    FuelLogCreate,
+    FuelLogResponse,
+    ExpenseCreate,
+    ExpenseResponse,
+    FuelLogImportRow,
+    ExpenseImportRow,
+)
+from app.services.import_service import detect_format, import_records
+from app.services.outbox_service import enqueue_change
 from app.dependencies.role_checker import RoleChecker
 from app.core.security import get_current_user
 
@@ -39,6 +50,8 @@ def create_fuel_log(
 
     log = FuelLog(**payload.model_dump())
     db.add(log)
+    db.flush()
+    enqueue_change(db, "fuel_log", log.id, "created", vehicle_id=log.vehicle_id)
     db.commit()
     db.refresh(log)
 
@@ -49,6 +62,22 @@ def create_fuel_log(
     }
 
 
+@router.post("/fuel/import", response_model=dict)
+def import_fuel_logs(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv | ndjson (default: from file name)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(allow_write),
+):
+    """Bulk import fuel logs from a CSV or NDJSON file (vehicle by id or license_plate)."""
+    report = import_records(db, file, detect_format(file, format), FuelLogImportRow, FuelLog)
+    return {
+        "success": True,
+        "message": f"Imported {report.inserted} fuel logs, {report.failed} rows rejected.",
+        "data": report.model_dump(),
+    }
+
+
 # ── Expenses ─────────────────────────────────────────────────
 @router.get("/expenses", response_model=dict)
 def list_expenses(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -74,6 +103,8 @@ def create_expense(
 
     expense = Expense(**payload.model_dump())
     db.add(expense)
+    db.flush()
+    enqueue_change(db, "expense", expense.id, "created", vehicle_id=expense.vehicle_id)
     db.commit()
     db.refresh(expense)
 
@@ -82,3 +113,19 @@ def create_expense(
         "message": "Expense logged.",
         "data": ExpenseResponse.model_validate(expense).model_dump(),
     }
+
+
+@router.post("/expenses/import", response_model=dict)
+def import_expenses(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv | ndjson (default: from file name)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(allow_write),
+):
+    """Bulk import expenses from a CSV or NDJSON file (vehicle by id or license_plate)."""
+    report = import_records(db, file, detect_format(file, format), ExpenseImportRow, Expense)
+    return {
+        "success": True,
+        "message": f"Imported {report.inserted} expenses, {report.failed} rows rejected.",
+        "data": report.model_dump(),
+    }
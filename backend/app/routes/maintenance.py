@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database.session import get_db
@@ -6,6 +6,7 @@ from app.models.maintenance import MaintenanceLog
 from app.models.vehicle import Vehicle
 from app.schemas.maintenance_schema import MaintenanceCreate, MaintenanceResponse
 from app.services.rule_engine import on_maintenance_created
+from app.services.maintenance_service import get_due
 from app.dependencies.role_checker import RoleChecker
 from app.core.security import get_current_user
 
@@ -25,6 +26,23 @@ def list_maintenance(db: Session = Depends(get_db), current_user: dict = Depends
     }
 
 
+@router.get("/due", response_model=dict)
+def list_due_maintenance(
+    within_km: float = Query(0.0, ge=0),
+    within_days: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Services due (or due within the given km / days), read from the due-queue."""
+    due = get_due(db, within_km=within_km, within_days=within_days, limit=limit)
+    return {
+        "success": True,
+        "message": f"Found {len(due)} services due.",
+        "data": [d.model_dump() for d in due],
+    }
+
+
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_maintenance(
     payload: MaintenanceCreate,
@@ -36,13 +54,8 @@ def create_maintenance(
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found.")
 
-    log = MaintenanceLog(**payload.model_dump())
-    db.add(log)
-    db.commit()
-    db.refresh(log)
-
-    # Rule engine hook: vehicle → In Shop
-    on_maintenance_created(db, payload.vehicle_id)
+    # Rule engine hook: vehicle → In Shop, committed together with the log
+    log = on_maintenance_created(db, MaintenanceLog(**payload.model_dump()))
 
     return {
         "success": True,
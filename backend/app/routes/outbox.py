@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database.session import get_db
+from app.services.outbox_service import outbox
+from app.dependencies.role_checker import RoleChecker
+
+router = APIRouter(prefix="/outbox", tags=["Outbox"])
+
+allow_manager = RoleChecker(["Manager"])
+
+
+@router.get("/stats", response_model=dict)
+def outbox_stats(db: Session = Depends(get_db), current_user: dict = Depends(allow_manager)):
+    """Pending depth, dispatch lag and retry / dead-letter counters."""
+    return {
+        "success": True,
+        "message": "Outbox statistics.",
+        "data": outbox.snapshot(db),
+    }
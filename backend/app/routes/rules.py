@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database.session import get_db
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+from app.models.driver import Driver
+from app.schemas.rule_schema import RuleDryRunRequest, RuleDryRunResult, RuleViolation
+from app.services.rule_engine import rules, RuleContext, TRANSITIONS
+from app.dependencies.role_checker import RoleChecker
+from app.core.security import get_current_user
+
+router = APIRouter(prefix="/rules", tags=["Rules"])
+
+allow_manager = RoleChecker(["Manager"])
+
+
+@router.get("/", response_model=dict)
+def list_rules(current_user: dict = Depends(get_current_user)):
+    """List the compiled guard pipeline for each transition."""
+    return {
+        "success": True,
+        "message": f"{len(rules.rules())} rules registered.",
+        "data": {t: [r.name for r in rules.compile(t)] for t in TRANSITIONS},
+    }
+
+
+@router.post("/dry-run", response_model=dict)
+def dry_run(
+    payload: RuleDryRunRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Evaluate a transition without changing anything.
+    Reports every violation for each trip in the batch.
+    """
+    trips = db.query(Trip).filter(Trip.id.in_(payload.trip_ids)).all() if payload.trip_ids else []
+    vehicle_ids = {t.vehicle_id for t in trips} | {t.vehicle_id for t in payload.trips}
+    driver_ids = {t.driver_id for t in trips if t.driver_id} | {t.driver_id for t in payload.trips}
+    vehicles = {v.id: v for v in db.query(Vehicle).filter(Vehicle.id.in_(vehicle_ids))} if vehicle_ids else {}
+    drivers = {d.id: d for d in db.query(Driver).filter(Driver.id.in_(driver_ids))} if driver_ids else {}
+
+    # Each slot is either a finished result or a pending (ref, context) pair,
+    # so the response keeps request order while rules run as one batch.
+    slots, contexts = [], []
+
+    found = {t.id: t for t in trips}
+    for trip_id in payload.trip_ids:
+        trip = found.get(trip_id)
+        if trip is None:
+            slots.append(RuleDryRunResult(
+                trip_id=trip_id, ok=False,
+                violations=[RuleViolation(rule="exists", message="Trip not found.")],
+            ))
+            continue
+        contexts.append(RuleContext(
+            trip=trip, vehicle=vehicles.get(trip.vehicle_id), driver=drivers.get(trip.driver_id),
+        ))
+        slots.append({"trip_id": trip_id})
+
+    for index, draft in enumerate(payload.trips):
+        vehicle, driver = vehicles.get(draft.vehicle_id), drivers.get(draft.driver_id)
+        missing = [
+            RuleViolation(rule="exists", message=f"{name} not found.")
+            for name, obj in (("Vehicle", vehicle), ("Driver", driver)) if obj is None
+        ]
+        if missing:
+            slots.append(RuleDryRunResult(index=index, ok=False, violations=missing))
+            continue
+        contexts.append(RuleContext(vehicle=vehicle, driver=driver, cargo_weight=draft.cargo_weight))
+        slots.append({"index": index})
+
+    evaluated = iter(rules.evaluate_batch(payload.transition, contexts))
+    results = []
+    for slot in slots:
+        if not isinstance(slot, RuleDryRunResult):
+            violations = next(evaluated)
+            slot = RuleDryRunResult(**slot, ok=not violations, violations=violations)
+        results.append(slot)
+
+    failed = sum(1 for r in results if not r.ok)
+    return {
+        "success": True,
+        "message": f"Evaluated {len(results)} trips: {failed} with violations.",
+        "data": [r.model_dump() for r in results],
+    }
+
+
+@router.get("/stats", response_model=dict)
+def rule_stats(current_user: dict = Depends(allow_manager)):
+    """Per-rule timing (requires RULE_TIMING_ENABLED)."""
+    return {
+        "success": True,
+        "message": "Rule timings." if rules.instrument else "Rule timing is disabled.",
+        "data": rules.stats(),
+    }
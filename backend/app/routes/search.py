@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database.session import get_db
+from app.services.search_service import search_index
+from app.core.security import get_current_user
+from app.dependencies.rate_limiter import RateLimiter
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+limit_search = RateLimiter("search")
+
+
+@router.get("", response_model=dict, dependencies=[Depends(limit_search)])
+def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Type-ahead over vehicle names, licence plates and driver names, best match first."""
+    hits = search_index.search(db, q, limit)
+    return {
+        "success": True,
+        "message": f"Found {len(hits)} matches.",
+        "data": [h.model_dump() for h in hits],
+    }
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, status
+
+from app.schemas.telematics_schema import OdometerBatch
+from app.services.telematics_service import odometer_buffer
+from app.dependencies.role_checker import RoleChecker
+
+router = APIRouter(prefix="/telematics", tags=["Telematics"])
+
+allow_ingest = RoleChecker(["Manager", "Dispatcher"])
+allow_manager = RoleChecker(["Manager"])
+
+
+@router.post("/odometer", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+def ingest_odometer(
+    payload: OdometerBatch,
+    current_user: dict = Depends(allow_ingest),
+):
+    """
+    Accept a batch of tracker odometer readings.
+    Readings are buffered and written on the next flush; only increases are accepted.
+    """
+    result = odometer_buffer.offer(payload.readings)
+    return {
+        "success": True,
+        "message": f"Accepted {result.accepted} readings, rejected {result.rejected}.",
+        "data": result.model_dump(),
+    }
+
+
+@router.get("/stats", response_model=dict)
+def ingest_stats(current_user: dict = Depends(allow_manager)):
+    """Buffer depth and flush statistics."""
+    return {
+        "success": True,
+        "message": "Telemetry ingest statistics.",
+        "data": odometer_buffer.snapshot(),
+    }
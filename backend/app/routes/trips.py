@@ -1,36 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.database.session import get_db
 from app.models.trip import Trip
 from app.models.vehicle import Vehicle
 from app.models.driver import Driver
-from app.schemas.trip_schema import TripCreate, TripComplete, TripResponse
+from app.models.trip_event import TripEvent
+from app.schemas.trip_schema import TripCreate, TripComplete, TripResponse, TripEventResponse
+from app.schemas.vehicle_schema import VehicleResponse
+from app.schemas.driver_schema import DriverResponse
 from app.services.rule_engine import (
-    validate_capacity,
-    validate_driver_license,
-    validate_vehicle_available,
-    validate_driver_available,
+    rules,
+    RuleContext,
     dispatch_trip,
     complete_trip,
     cancel_trip,
 )
+from app.services.assignment_service import auto_assign_draft_trips
+from app.services.trip_event_service import record_event, trip_projector
+from app.services.outbox_service import enqueue_change
 from app.dependencies.role_checker import RoleChecker
+from app.dependencies.expand import Expand
 from app.core.security import get_current_user
 
 router = APIRouter(prefix="/trips", tags=["Trips"])
 
 allow_dispatch = RoleChecker(["Manager", "Dispatcher"])
 
+trip_expand = Expand(["vehicle", "driver"])
+_EXPAND_SCHEMAS = {"vehicle": VehicleResponse, "driver": DriverResponse}
+
 
 @router.get("/", response_model=dict)
-def list_trips(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    """Get all trips."""
-    trips = db.query(Trip).all()
+def list_trips(
+    expand: set[str] = Depends(trip_expand),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Get all trips. `expand=vehicle,driver` embeds them via a single joined query."""
+    query = db.query(Trip)
+    for relation in expand:
+        query = query.options(joinedload(getattr(Trip, relation)))
+    trips = query.all()
+
+    data = []
+    for t in trips:
+        item = TripResponse.model_validate(t).model_dump()
+        for relation in expand:
+            related = getattr(t, relation)
+            item[relation] = _EXPAND_SCHEMAS[relation].model_validate(related).model_dump() if related else None
+        data.append(item)
+
     return {
         "success": True,
         "message": f"Found {len(trips)} trips.",
-        "data": [TripResponse.model_validate(t).model_dump() for t in trips],
+        "data": data,
     }
 
 
@@ -53,11 +77,13 @@ def create_trip(
         raise HTTPException(status_code=404, detail="Driver not found.")
 
     # Pre-flight validation
-    validate_capacity(payload.cargo_weight, vehicle)
-    validate_driver_license(driver)
+    rules.enforce("create", RuleContext(vehicle=vehicle, driver=driver, cargo_weight=payload.cargo_weight))
 
     trip = Trip(**payload.model_dump(), status="Draft")
     db.add(trip)
+    db.flush()
+    record_event(db, trip, "Created", current_user["user_id"])
+    enqueue_change(db, "trip", trip.id, "created", status=trip.status, vehicle_id=trip.vehicle_id, driver_id=trip.driver_id)
     db.commit()
     db.refresh(trip)
 
@@ -68,6 +94,28 @@ def create_trip(
     }
 
 
+@router.post("/auto-assign", response_model=dict)
+def auto_assign(
+    apply: bool = False,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(allow_dispatch),
+):
+    """
+    Match all Draft trips to Available vehicles and Off Duty drivers.
+    Returns the plan; pass `apply=true` to write it back to the trips.
+    """
+    plan = auto_assign_draft_trips(db, apply=apply)
+
+    return {
+        "success": True,
+        "message": (
+            f"Assigned {len(plan.assignments)} trips, "
+            f"{len(plan.unassigned)} could not be assigned."
+        ),
+        "data": plan.model_dump(),
+    }
+
+
 @router.put("/{trip_id}/dispatch", response_model=dict)
 def dispatch(
     trip_id: int,
@@ -79,7 +127,7 @@ def dispatch(
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found.")
 
-    updated = dispatch_trip(db, trip)
+    updated = dispatch_trip(db, trip, current_user["user_id"])
 
     return {
         "success": True,
@@ -100,7 +148,7 @@ def complete(
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found.")
 
-    updated = complete_trip(db, trip, payload.end_odometer)
+    updated = complete_trip(db, trip, payload.end_odometer, current_user["user_id"])
 
     return {
         "success": True,
@@ -120,10 +168,61 @@ def cancel(
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found.")
 
-    updated = cancel_trip(db, trip)
+    updated = cancel_trip(db, trip, current_user["user_id"])
 
     return {
         "success": True,
         "message": "Trip cancelled.",
         "data": TripResponse.model_validate(updated).model_dump(),
     }
+
+
+# ── Lifecycle history ────────────────────────────────────────
+@router.get("/{trip_id}/events", response_model=dict)
+def trip_events(
+    trip_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Full lifecycle event stream of a trip, oldest first."""
+    events = db.query(TripEvent).filter(TripEvent.trip_id == trip_id).order_by(TripEvent.id).all()
+    trip_projector.catch_up(db)
+    return {
+        "success": True,
+        "message": f"Found {len(events)} events.",
+        "data": {
+            "state": trip_projector.trip_state(trip_id, events),
+            "events": [TripEventResponse.model_validate(e).model_dump() for e in events],
+        },
+    }
+
+
+@router.get("/projections/vehicles/{vehicle_id}", response_model=dict)
+def vehicle_timeline(
+    vehicle_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """The most recent dispatch → completion/cancellation spans of a vehicle, from the event projection."""
+    trip_projector.catch_up(db)
+    timeline = trip_projector.vehicle_timeline(vehicle_id)
+    return {
+        "success": True,
+        "message": f"Found {len(timeline)} trips.",
+        "data": timeline,
+    }
+
+
+@router.get("/projections/drivers/{driver_id}", response_model=dict)
+def driver_trip_stats(
+    driver_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Dispatched / completed / cancelled counts and km driven, from the event projection."""
+    trip_projector.catch_up(db)
+    return {
+        "success": True,
+        "message": "Driver trip statistics.",
+        "data": trip_projector.driver_summary(driver_id),
+    }
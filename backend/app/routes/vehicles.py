@@ -1,17 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import List, Optional
 
+from app.core.config import get_settings
 from app.database.session import get_db
 from app.models.vehicle import Vehicle
-from app.schemas.vehicle_schema import VehicleCreate, VehicleUpdate, VehicleResponse
+from app.models.trip import Trip
+from app.models.fuel_log import FuelLog
+from app.models.maintenance import MaintenanceLog
+from app.schemas.vehicle_schema import VehicleCreate, VehicleUpdate, VehicleResponse, VehicleUpsert
+from app.schemas.trip_schema import TripResponse
+from app.schemas.fuel_schema import FuelLogResponse
+from app.schemas.maintenance_schema import MaintenanceResponse
+from app.services.bulk_service import upsert_vehicles
+from app.services.archive_service import archive_vehicle
+from app.services.availability_index import availability_index
+from app.services.outbox_service import enqueue_change
+from app.services.maintenance_service import create_schedules, on_odometer_changed
 from app.dependencies.role_checker import RoleChecker
+from app.dependencies.expand import Expand
 from app.core.security import get_current_user
 
+settings = get_settings()
+
 router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
 
 allow_manager = RoleChecker(["Manager"])
 
+# relation -> (model, newest-first ordering, response schema)
+_EXPANDABLE = {
+    "trips": (Trip, Trip.created_at, TripResponse),
+    "fuel_logs": (FuelLog, FuelLog.date, FuelLogResponse),
+    "maintenance_logs": (MaintenanceLog, MaintenanceLog.date, MaintenanceResponse),
+}
+vehicle_expand = Expand(list(_EXPANDABLE))
+
 
 @router.get("/", response_model=dict)
 def list_vehicles(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -24,6 +48,60 @@ def list_vehicles(db: Session = Depends(get_db), current_user: dict = Depends(ge
     }
 
 
+@router.get("/available", response_model=dict)
+def list_available_vehicles(
+    min_capacity: float = Query(0.0, ge=0),
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Available vehicles that can carry `min_capacity`, smallest capacity first."""
+    ids = availability_index.query(min_capacity, limit)
+    by_id = {v.id: v for v in db.query(Vehicle).filter(Vehicle.id.in_(ids)).all()} if ids else {}
+    vehicles = [by_id[i] for i in ids if i in by_id]
+    return {
+        "success": True,
+        "message": f"Found {len(vehicles)} available vehicles.",
+        "data": [VehicleResponse.model_validate(v).model_dump() for v in vehicles],
+    }
+
+
+@router.get("/{vehicle_id}", response_model=dict)
+def get_vehicle(
+    vehicle_id: int,
+    expand: set[str] = Depends(vehicle_expand),
+    limit: Optional[int] = Query(None, ge=1, le=settings.EXPAND_MAX_LIMIT),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Get a vehicle, optionally with its most recent trips, fuel logs and
+    maintenance logs (`expand=trips,fuel_logs,maintenance_logs`).
+    Each expanded relation is one query capped at `limit` rows, newest first.
+    """
+    vehicle = db.get(Vehicle, vehicle_id)
+    if not vehicle:
+        raise HTTPException(status_code=404, detail="Vehicle not found.")
+
+    limit = limit or settings.EXPAND_DEFAULT_LIMIT
+    data = VehicleResponse.model_validate(vehicle).model_dump()
+    for relation in sorted(expand):
+        model, newest, schema = _EXPANDABLE[relation]
+        rows = (
+            db.query(model)
+            .filter(model.vehicle_id == vehicle_id)
+            .order_by(newest.desc(), model.id.desc())
+            .limit(limit)
+            .all()
+        )
+        # Populate the collection without marking it dirty, so the loaded
+        # (partial) list is never flushed back as the full relationship.
+        set_committed_value(vehicle, relation, rows)
+        data[relation] = [schema.model_validate(r).model_dump() for r in rows]
+
+    return {"success": True, "message": "Vehicle found.", "data": data}
+
+
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_vehicle(
     payload: VehicleCreate,
@@ -40,8 +118,12 @@ def create_vehicle(
 
     vehicle = Vehicle(**payload.model_dump())
     db.add(vehicle)
+    db.flush()
+    create_schedules(db, [(vehicle.id, vehicle.odometer)])
+    enqueue_change(db, "vehicle", vehicle.id, "created", status=vehicle.status)
     db.commit()
     db.refresh(vehicle)
+    availability_index.sync(vehicle)
 
     return {
         "success": True,
@@ -50,6 +132,24 @@ def create_vehicle(
     }
 
 
+@router.put("/bulk", response_model=dict)
+def bulk_upsert_vehicles(
+    payload: List[VehicleUpsert],
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(allow_manager),
+):
+    """Create or update many vehicles, keyed by license_plate, in one transaction (Manager only)."""
+    report = upsert_vehicles(db, payload)
+    return {
+        "success": True,
+        "message": (
+            f"{len(report.created)} created, {len(report.updated)} updated, "
+            f"{len(report.rejected)} rejected."
+        ),
+        "data": report.model_dump(),
+    }
+
+
 @router.put("/{vehicle_id}", response_model=dict)
 def update_vehicle(
     vehicle_id: int,
@@ -65,9 +165,13 @@ def update_vehicle(
     update_data = payload.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(vehicle, field, value)
+    if "odometer" in update_data:
+        on_odometer_changed(db, vehicle_id, vehicle.odometer)
+    enqueue_change(db, "vehicle", vehicle_id, "updated", status=vehicle.status)
 
     db.commit()
     db.refresh(vehicle)
+    availability_index.sync(vehicle)
 
     return {
         "success": True,
@@ -79,15 +183,31 @@ def update_vehicle(
 @router.delete("/{vehicle_id}", response_model=dict)
 def delete_vehicle(
     vehicle_id: int,
+    archive: bool = False,
     db: Session = Depends(get_db),
     current_user: dict = Depends(allow_manager),
 ):
-    """Delete a vehicle (Manager only)."""
+    """
+    Delete a vehicle (Manager only).
+    History is removed by the database's ON DELETE CASCADE; pass
+    `archive=true` to retire the vehicle and move its history to the
+    archive tables instead.
+    """
     vehicle = db.get(Vehicle, vehicle_id)
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found.")
 
+    if archive:
+        moved = archive_vehicle(db, vehicle)
+        return {
+            "success": True,
+            "message": "Vehicle retired and history archived.",
+            "data": {"archived": moved},
+        }
+
     db.delete(vehicle)
+    enqueue_change(db, "vehicle", vehicle_id, "deleted")
     db.commit()
+    availability_index.mark_unavailable(vehicle_id)
 
     return {"success": True, "message": "Vehicle deleted successfully.", "data": None}
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
 
 
 class DashboardAnalytics(BaseModel):
@@ -21,3 +22,19 @@ class DashboardAnalytics(BaseModel):
     total_operational_cost: float = 0.0
 
     avg_fuel_efficiency: Optional[float] = None
+
+
+class UtilizationBucket(BaseModel):
+    start: datetime
+    end: datetime
+    on_trip_hours: float = 0.0
+    vehicle_hours: float = 0.0
+    utilization: float = 0.0  # percent of vehicle-hours spent on trip
+
+
+class UtilizationTimeline(BaseModel):
+    start: datetime
+    end: datetime
+    bucket: str
+    vehicles: int = 0
+    buckets: List[UtilizationBucket] = []
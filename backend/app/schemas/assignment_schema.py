@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class TripAssignment(BaseModel):
+    trip_id: int
+    vehicle_id: int
+    driver_id: int
+
+
+class UnassignedTrip(BaseModel):
+    trip_id: int
+    reason: str
+
+
+class AssignmentPlan(BaseModel):
+    assignments: List[TripAssignment] = []
+    unassigned: List[UnassignedTrip] = []
+    applied: bool = False
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class SubRequest(BaseModel):
+    id: Optional[str] = None  # echoed back so the client can match results
+    path: str
+    params: Dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[SubRequest] = Field(min_length=1)
+
+
+class SubResponse(BaseModel):
+    id: Optional[str] = None
+    path: str
+    status: int
+    body: Any
+
+
+# ── Query parameters of the batchable operations ─────────────
+class ExpandParams(BaseModel):
+    expand: Optional[str] = None
+
+
+class AvailableVehicleParams(BaseModel):
+    min_capacity: float = Field(0.0, ge=0)
+    limit: int = Field(20, ge=1, le=500)
+
+
+class DueMaintenanceParams(BaseModel):
+    within_km: float = Field(0.0, ge=0)
+    within_days: int = Field(0, ge=0)
+    limit: int = Field(100, ge=1, le=1000)
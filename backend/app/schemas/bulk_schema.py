@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class BulkRejected(BaseModel):
+    index: int               # position in the request list
+    key: Optional[str] = None  # license plate or driver id, when present
+    reason: str
+
+
+class BulkUpsertReport(BaseModel):
+    created: List[int] = []
+    updated: List[int] = []
+    rejected: List[BulkRejected] = []
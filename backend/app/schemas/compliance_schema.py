@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+
+
+class DriverComplianceEntry(BaseModel):
+    id: int
+    name: str
+    license_expiry: date
+    days_until_expiry: int
+
+
+class ComplianceReport(BaseModel):
+    as_of: Optional[date] = None
+    generated_at: Optional[datetime] = None
+    window_days: int = 0
+    expired: List[DriverComplianceEntry] = []
+    expiring: List[DriverComplianceEntry] = []
+    suspended: List[int] = []  # driver ids suspended by the latest sweep
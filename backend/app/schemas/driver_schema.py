@@ -29,3 +29,13 @@ class DriverResponse(BaseModel):
     created_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class DriverUpsert(BaseModel):
+    """Bulk upsert row: updates when `id` is given, creates otherwise."""
+    id: Optional[int] = None
+    name: Optional[str] = None
+    license_expiry: Optional[date] = None
+    safety_score: Optional[float] = None
+    trip_completion_rate: Optional[float] = None
+    status: Optional[str] = None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, model_validator
+from typing import List, Optional
 from datetime import date, datetime
 
 
@@ -37,3 +37,39 @@ class ExpenseResponse(BaseModel):
     created_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+# ── Bulk import ──────────────────────────────────────────────
+class _VehicleRef(BaseModel):
+    """Import rows may reference the vehicle by id or by licence plate."""
+    vehicle_id: Optional[int] = None
+    license_plate: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _require_vehicle_ref(self):
+        if self.vehicle_id is None and not self.license_plate:
+            raise ValueError("Either vehicle_id or license_plate is required.")
+        return self
+
+
+class FuelLogImportRow(_VehicleRef):
+    liters: float
+    cost: float
+    date: date
+
+
+class ExpenseImportRow(_VehicleRef):
+    type: str
+    amount: float
+    date: date
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []  # capped at IMPORT_MAX_ERRORS
@@ -21,3 +21,15 @@ class MaintenanceResponse(BaseModel):
     created_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class MaintenanceDueItem(BaseModel):
+    vehicle_id: int
+    vehicle_name: str
+    license_plate: str
+    service_type: str
+    due_odometer: Optional[float] = None
+    km_remaining: Optional[float] = None
+    due_date: Optional[date] = None
+    days_remaining: Optional[int] = None
+    overdue: bool = False
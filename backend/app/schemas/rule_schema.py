@@ -0,0 +1,29 @@
+from pydantic import BaseModel, model_validator
+from typing import List, Literal, Optional
+
+from app.schemas.trip_schema import TripCreate
+
+
+class RuleViolation(BaseModel):
+    rule: str
+    message: str
+
+
+class RuleDryRunRequest(BaseModel):
+    transition: Literal["create", "dispatch", "complete", "cancel"]
+    trip_ids: List[int] = []       # existing trips (dispatch | complete | cancel)
+    trips: List[TripCreate] = []   # prospective trips (create)
+
+    @model_validator(mode="after")
+    def _trips_only_for_create(self):
+        # Prospective trips have no status yet, so only the create rules apply to them.
+        if self.trips and self.transition != "create":
+            raise ValueError(f"`trips` can only be dry-run for 'create'; use `trip_ids` for '{self.transition}'.")
+        return self
+
+
+class RuleDryRunResult(BaseModel):
+    trip_id: Optional[int] = None  # set for existing trips
+    index: Optional[int] = None    # position in `trips` for prospective ones
+    ok: bool
+    violations: List[RuleViolation] = []
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class SearchHit(BaseModel):
+    entity: str  # vehicle | driver
+    id: int
+    name: str
+    license_plate: Optional[str] = None
+    score: float
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class OdometerReading(BaseModel):
+    vehicle_id: int
+    odometer: float = Field(ge=0)
+    recorded_at: Optional[datetime] = None
+
+
+class OdometerBatch(BaseModel):
+    readings: List[OdometerReading]
+
+
+class RejectedReading(BaseModel):
+    vehicle_id: int
+    odometer: float
+    reason: str
+
+
+class IngestResult(BaseModel):
+    accepted: int = 0
+    rejected: int = 0
+    rejections: List[RejectedReading] = []  # first few only
@@ -22,7 +22,24 @@ class TripResponse(BaseModel):
     status: str
     start_odometer: float
     end_odometer: Optional[float] = None
+    dispatched_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    cancelled_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class TripEventResponse(BaseModel):
+    id: int
+    trip_id: int
+    vehicle_id: int
+    driver_id: Optional[int] = None
+    event_type: str
+    cargo_weight: Optional[float] = None
+    odometer: Optional[float] = None
+    actor_id: Optional[int] = None
+    occurred_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -29,3 +29,12 @@ class VehicleResponse(BaseModel):
     created_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class VehicleUpsert(BaseModel):
+    """Bulk upsert row keyed by license_plate. Omitted fields are left unchanged on update."""
+    name: str
+    license_plate: str
+    max_capacity: float
+    odometer: Optional[float] = None
+    status: Optional[str] = None
@@ -1,15 +1,27 @@
 """
 FleetFlow Analytics Service – Computed metrics for the dashboard.
 """
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, or_, select
 
 from app.models.vehicle import Vehicle
 from app.models.driver import Driver
 from app.models.trip import Trip
 from app.models.maintenance import MaintenanceLog
 from app.models.fuel_log import FuelLog
-from app.schemas.analytics_schema import DashboardAnalytics
+from app.schemas.analytics_schema import (
+    DashboardAnalytics,
+    UtilizationBucket,
+    UtilizationTimeline,
+)
+
+BUCKET_SECONDS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+MAX_BUCKETS = 10_000
 
 
 def get_dashboard_analytics(db: Session) -> DashboardAnalytics:
@@ -64,3 +76,103 @@ def get_dashboard_analytics(db: Session) -> DashboardAnalytics:
         total_operational_cost=round(total_operational_cost, 2),
         avg_fuel_efficiency=avg_fuel_efficiency,
     )
+
+
+# Trip timestamps are stored as naive UTC (models.outbox.utcnow), so all utilization
+# arithmetic is done in naive UTC against a fixed epoch, never local time.
+EPOCH = datetime(1970, 1, 1)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Naive UTC. Aware values are converted; naive ones are taken to be UTC already."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _seconds(value: datetime) -> float:
+    return (value - EPOCH).total_seconds()
+
+
+def get_utilization_timeline(
+    db: Session, start: datetime, end: datetime, bucket: str = "day"
+) -> UtilizationTimeline:
+    """
+    Share of vehicle-hours spent on trip per time bucket.
+
+    Every dispatched trip contributes a [dispatched_at, completed_at or
+    cancelled_at) interval. Start and end points are each sorted once;
+    the on-trip time up to any instant T is then
+        Σ(T - start for starts ≤ T) - Σ(T - end for ends ≤ T),
+    which prefix sums answer with two bisects. Sweeping the bucket
+    boundaries costs O(buckets · log trips) after a single fetch.
+    """
+    start, end = as_utc(start), as_utc(end)
+    if bucket not in BUCKET_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown bucket '{bucket}'. Use one of: {', '.join(BUCKET_SECONDS)}.",
+        )
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be after 'from'.",
+        )
+    width = BUCKET_SECONDS[bucket]
+    t0, t1 = _seconds(start), _seconds(end)
+    n_buckets = int(-(-(t1 - t0) // width))
+    if n_buckets > MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range covers {n_buckets} buckets; the limit is {MAX_BUCKETS}.",
+        )
+
+    vehicles = db.query(func.count(Vehicle.id)).filter(Vehicle.status != "Retired").scalar() or 0
+
+    # ── Interval endpoints, relative to `start` ──────────────
+    ended_at = func.coalesce(Trip.completed_at, Trip.cancelled_at)
+    rows = db.execute(
+        select(Trip.dispatched_at, ended_at)
+        .where(
+            Trip.dispatched_at.isnot(None),
+            Trip.dispatched_at < end,
+            or_(ended_at.is_(None), ended_at > start),
+        )
+        .execution_options(yield_per=10_000)
+    )
+    open_until = min(_seconds(as_utc(datetime.now(timezone.utc))), t1) - t0  # trips still on the road
+    starts, ends = [], []
+    for dispatched_at, finished_at in rows:
+        a = max(_seconds(dispatched_at) - t0, 0.0)
+        b = _seconds(finished_at) - t0 if finished_at else open_until
+        starts.append(a)
+        ends.append(max(a, b))
+    starts.sort()
+    ends.sort()
+    start_sums = [0.0, *accumulate(starts)]
+    end_sums = [0.0, *accumulate(ends)]
+
+    def on_trip_seconds_until(t: float) -> float:
+        i, j = bisect_right(starts, t), bisect_right(ends, t)
+        return (i * t - start_sums[i]) - (j * t - end_sums[j])
+
+    # ── Sweep bucket boundaries ──────────────────────────────
+    buckets = []
+    span = t1 - t0
+    previous = 0.0
+    for k in range(n_buckets):
+        lo, hi = k * width, min((k + 1) * width, span)
+        cumulative = on_trip_seconds_until(hi)
+        seconds, previous = cumulative - previous, cumulative
+        capacity = vehicles * (hi - lo)
+        buckets.append(UtilizationBucket(
+            start=EPOCH + timedelta(seconds=t0 + lo),
+            end=EPOCH + timedelta(seconds=t0 + hi),
+            on_trip_hours=round(seconds / 3600, 2),
+            vehicle_hours=round(capacity / 3600, 2),
+            utilization=round(seconds / capacity * 100, 1) if capacity else 0.0,
+        ))
+
+    return UtilizationTimeline(
+        start=start, end=end, bucket=bucket, vehicles=vehicles, buckets=buckets,
+    )
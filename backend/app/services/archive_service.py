@@ -0,0 +1,63 @@
+"""
+FleetFlow Archive Service – Retire a vehicle and move its history aside.
+
+History is moved with one INSERT … SELECT and one DELETE per table, so
+the cost does not depend on how many rows the ORM would have loaded.
+"""
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.vehicle import Vehicle
+from app.models.trip import Trip
+from app.models.fuel_log import FuelLog
+from app.models.maintenance import MaintenanceLog
+from app.models.maintenance_schedule import MaintenanceSchedule
+from app.models.expense import Expense
+from app.models.archive import TripArchive, FuelLogArchive, MaintenanceLogArchive, ExpenseArchive, archive_column
+from app.services.availability_index import availability_index
+from app.services.outbox_service import enqueue_change
+
+ARCHIVES = (
+    (Trip, TripArchive),
+    (FuelLog, FuelLogArchive),
+    (MaintenanceLog, MaintenanceLogArchive),
+    (Expense, ExpenseArchive),
+)
+
+
+def archive_vehicle(db: Session, vehicle: Vehicle) -> dict:
+    """
+    Soft-delete a vehicle:
+    - Vehicle  → 'Retired'
+    - Trips, fuel logs, maintenance logs, expenses → archive tables
+    - Maintenance schedules → dropped
+    Returns the number of rows archived per table.
+    """
+    if vehicle.status == "On Trip":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Vehicle '{vehicle.name}' is currently 'On Trip'. Complete or cancel the trip first.",
+        )
+
+    vehicle_id = vehicle.id
+    moved = {}
+    for model, archive in ARCHIVES:
+        source = model.__table__
+        columns = [archive_column(c.name) for c in source.columns]
+        db.execute(
+            insert(archive.__table__).from_select(
+                columns, select(*source.columns).where(source.c.vehicle_id == vehicle_id)
+            )
+        )
+        result = db.execute(delete(source).where(source.c.vehicle_id == vehicle_id))
+        moved[source.name] = result.rowcount
+
+    db.execute(delete(MaintenanceSchedule.__table__).where(
+        MaintenanceSchedule.__table__.c.vehicle_id == vehicle_id
+    ))
+    vehicle.status = "Retired"
+    enqueue_change(db, "vehicle", vehicle_id, "status", status="Retired")
+    db.commit()
+    availability_index.mark_unavailable(vehicle_id)
+    return moved
@@ -0,0 +1,112 @@
+"""
+FleetFlow Assignment Service – Automatic trip → vehicle/driver matching.
+
+Draft trips are matched against the pool of Available vehicles and
+Off Duty drivers. Every candidate passes through the same guards the
+rule engine applies at dispatch time.
+"""
+from bisect import bisect_left
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.models.vehicle import Vehicle
+from app.models.driver import Driver
+from app.models.trip import Trip
+from app.schemas.assignment_schema import AssignmentPlan, TripAssignment, UnassignedTrip
+from app.services.rule_engine import rules, RuleContext
+from app.services.outbox_service import enqueue_change
+
+
+def _eligible_vehicle(vehicle: Vehicle) -> bool:
+    return not rules.check(("vehicle_available",), RuleContext(vehicle=vehicle))
+
+
+def _eligible_driver(driver: Driver) -> bool:
+    return not rules.check(
+        ("driver_available", "driver_license_valid"), RuleContext(driver=driver)
+    )
+
+
+def plan_assignments(
+    trips: Iterable[Trip],
+    vehicles: Iterable[Vehicle],
+    drivers: Iterable[Driver],
+) -> AssignmentPlan:
+    """
+    Match trips to vehicles and drivers without touching the database.
+
+    - Heaviest cargo is placed first, each on the smallest vehicle that
+      can carry it (best fit via bisect over a capacity-sorted index).
+    - Drivers are handed out in descending `safety_score` order.
+    """
+    pool = sorted(
+        (v for v in vehicles if _eligible_vehicle(v)),
+        key=lambda v: v.max_capacity,
+    )
+    capacities = [v.max_capacity for v in pool]
+
+    ranked_drivers = sorted(
+        (d for d in drivers if _eligible_driver(d)),
+        key=lambda d: d.safety_score or 0.0,
+        reverse=True,
+    )
+    next_driver = 0
+
+    plan = AssignmentPlan()
+    for trip in sorted(trips, key=lambda t: t.cargo_weight, reverse=True):
+        if trip.status != "Draft":
+            plan.unassigned.append(UnassignedTrip(
+                trip_id=trip.id, reason=f"Only 'Draft' trips can be assigned. Current: '{trip.status}'.",
+            ))
+            continue
+
+        slot = bisect_left(capacities, trip.cargo_weight)
+        if slot == len(pool):
+            plan.unassigned.append(UnassignedTrip(
+                trip_id=trip.id, reason="No available vehicle with sufficient capacity.",
+            ))
+            continue
+
+        if next_driver == len(ranked_drivers):
+            plan.unassigned.append(UnassignedTrip(
+                trip_id=trip.id, reason="No eligible driver available.",
+            ))
+            continue
+
+        # bisect_left only ever lands on a vehicle that satisfies the capacity rule
+        vehicle = pool.pop(slot)
+        del capacities[slot]
+        driver = ranked_drivers[next_driver]
+        next_driver += 1
+
+        plan.assignments.append(TripAssignment(
+            trip_id=trip.id, vehicle_id=vehicle.id, driver_id=driver.id,
+        ))
+
+    return plan
+
+
+def auto_assign_draft_trips(db: Session, apply: bool = False) -> AssignmentPlan:
+    """
+    Plan assignments for every Draft trip.
+    When `apply` is set, the chosen vehicle and driver are written back
+    to the trips in a single commit; the trips stay in Draft.
+    """
+    trips = db.query(Trip).filter(Trip.status == "Draft").all()
+    vehicles = db.query(Vehicle).filter(Vehicle.status == "Available").all()
+    drivers = db.query(Driver).filter(Driver.status == "Off Duty").all()
+
+    plan = plan_assignments(trips, vehicles, drivers)
+
+    if apply and plan.assignments:
+        by_id = {t.id: t for t in trips}
+        for a in plan.assignments:
+            trip = by_id[a.trip_id]
+            trip.vehicle_id = a.vehicle_id
+            trip.driver_id = a.driver_id
+            enqueue_change(db, "trip", a.trip_id, "updated", vehicle_id=a.vehicle_id, driver_id=a.driver_id)
+        db.commit()
+        plan.applied = True
+
+    return plan
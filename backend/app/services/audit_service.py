@@ -1,18 +1,25 @@
 from sqlalchemy.orm import Session
 from fastapi import Request
-from app.models.audit_log import AuditLog
+from app.services.outbox_service import enqueue
 from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 def log_event(
     db: Session,
     event: str,
     status: str,
     user_id: Optional[int] = None,
-    request: Optional[Request] = None
+    request: Optional[Request] = None,
+    commit: bool = True,
 ):
     """
     Centralized service to log audit events.
     Captures IP address and User Agent if request object is provided.
+
+    The event is written through the outbox; pass `commit=False` to make
+    it part of the caller's transaction instead of committing it alone.
     """
     ip_address = None
     user_agent = None
@@ -21,21 +28,18 @@ def log_event(
         ip_address = request.client.host
         user_agent = request.headers.get("user-agent")
         
-    new_log = AuditLog(
-        user_id=user_id,
+    enqueue(
+        db, "audit", "user", user_id,
         event=event,
         status=status,
         ip_address=ip_address,
-        user_agent=user_agent
+        user_agent=user_agent,
     )
-    
-    db.add(new_log)
+    if not commit:
+        return
+
     try:
         db.commit()
-        db.refresh(new_log)
-    except Exception as e:
+    except Exception:
         db.rollback()
-        # In a real production system, we'd log this error to a file or monitoring service
-        print(f"Failed to save audit log: {e}")
-    
-    return new_log
+        logger.exception("failed to save audit log", extra={"event": event, "user_id": user_id})
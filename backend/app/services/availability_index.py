@@ -0,0 +1,110 @@
+"""
+FleetFlow Availability Index – In-memory lookup of Available vehicles.
+
+Keeps (max_capacity, vehicle_id) pairs sorted so that "smallest free
+vehicle that can carry N kg" is a bisect away. The database stays the
+source of truth: the index is rebuilt on startup, updated by every
+status transition, and periodically checked for drift.
+"""
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.vehicle import Vehicle
+
+logger = logging.getLogger(__name__)
+
+
+class FleetAvailabilityIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[float, int]] = []
+        self._capacity: Dict[int, float] = {}
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ── Mutations ────────────────────────────────────────────
+    def mark_available(self, vehicle_id: int, max_capacity: float) -> None:
+        with self._lock:
+            self._remove_locked(vehicle_id)
+            self._capacity[vehicle_id] = max_capacity
+            insort(self._keys, (max_capacity, vehicle_id))
+            self._version += 1
+
+    def mark_unavailable(self, vehicle_id: int) -> None:
+        with self._lock:
+            self._remove_locked(vehicle_id)
+            self._version += 1
+
+    def sync(self, vehicle: Vehicle) -> None:
+        """Reflect a (loaded) vehicle's current status in the index."""
+        if vehicle.status == "Available":
+            self.mark_available(vehicle.id, vehicle.max_capacity)
+        else:
+            self.mark_unavailable(vehicle.id)
+
+    def _remove_locked(self, vehicle_id: int) -> None:
+        capacity = self._capacity.pop(vehicle_id, None)
+        if capacity is None:
+            return
+        i = bisect_left(self._keys, (capacity, vehicle_id))
+        if i < len(self._keys) and self._keys[i] == (capacity, vehicle_id):
+            del self._keys[i]
+
+    # ── Queries ──────────────────────────────────────────────
+    def query(self, min_capacity: float = 0.0, limit: int = 20) -> List[int]:
+        """Ids of Available vehicles with capacity >= min_capacity, smallest first."""
+        with self._lock:
+            i = bisect_left(self._keys, (min_capacity, -1))
+            return [vehicle_id for _, vehicle_id in self._keys[i:i + limit]]
+
+    # ── Database reconciliation ──────────────────────────────
+    def _load(self, db: Session) -> Dict[int, float]:
+        rows = (
+            db.query(Vehicle.id, Vehicle.max_capacity)
+            .filter(Vehicle.status == "Available")
+            .all()
+        )
+        return {vehicle_id: capacity for vehicle_id, capacity in rows}
+
+    def rebuild(self, db: Session) -> None:
+        """Replace the index contents with the Available vehicles in the database."""
+        with self._lock:
+            version = self._version
+        capacity = self._load(db)
+        keys = sorted((c, vid) for vid, c in capacity.items())
+        with self._lock:
+            # A transition landed while we were reading; keep the live index.
+            if self._version != version:
+                return
+            self._capacity = capacity
+            self._keys = keys
+            self._version += 1
+
+    def check_consistency(self, db: Session) -> int:
+        """
+        Compare the index against the database and rebuild on drift.
+        Returns the number of vehicles that were out of sync.
+        """
+        with self._lock:
+            version = self._version
+            snapshot = dict(self._capacity)
+        expected = self._load(db)
+        with self._lock:
+            if self._version != version:
+                return 0
+        drift = len(snapshot.keys() ^ expected.keys()) + sum(
+            1 for vid, c in expected.items() if vid in snapshot and snapshot[vid] != c
+        )
+        if drift:
+            logger.warning("availability index drifted by %d vehicles; rebuilding", drift, extra={"drift": drift})
+            self.rebuild(db)
+        return drift
+
+
+availability_index = FleetAvailabilityIndex()
@@ -0,0 +1,138 @@
+"""
+FleetFlow Bulk Service – Set-based upserts for vehicles and drivers.
+
+Existing rows are found with a single IN query, new rows are flushed
+together, and the whole list is committed in one transaction. Rows that
+cannot be applied are rejected individually without failing the batch.
+"""
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.vehicle import Vehicle
+from app.models.driver import Driver
+from app.schemas.bulk_schema import BulkRejected, BulkUpsertReport
+from app.schemas.vehicle_schema import VehicleUpsert
+from app.schemas.driver_schema import DriverUpsert
+from app.services.availability_index import availability_index
+from app.services.compliance_service import compliance_index
+from app.services.maintenance_service import create_schedules, on_odometers_changed
+from app.services.outbox_service import enqueue_many
+
+settings = get_settings()
+
+
+def _check_size(rows: list) -> None:
+    if len(rows) > settings.BULK_UPSERT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_UPSERT_MAX_ROWS} rows per bulk request.",
+        )
+
+
+def upsert_vehicles(db: Session, rows: List[VehicleUpsert]) -> BulkUpsertReport:
+    _check_size(rows)
+    report = BulkUpsertReport()
+
+    plates = {r.license_plate for r in rows}
+    existing = {
+        v.license_plate: v
+        for v in db.query(Vehicle).filter(Vehicle.license_plate.in_(plates))
+    } if plates else {}
+
+    seen, created, touched, odometers = set(), [], [], []
+    for index, row in enumerate(rows):
+        if row.license_plate in seen:
+            report.rejected.append(BulkRejected(
+                index=index, key=row.license_plate,
+                reason="Duplicate license_plate in request.",
+            ))
+            continue
+        seen.add(row.license_plate)
+
+        vehicle = existing.get(row.license_plate)
+        if vehicle is None:
+            vehicle = Vehicle(**row.model_dump(exclude_none=True))
+            db.add(vehicle)
+            created.append(vehicle)
+        else:
+            changes = row.model_dump(exclude_unset=True, exclude_none=True)
+            for field, value in changes.items():
+                setattr(vehicle, field, value)
+            if "odometer" in changes:
+                odometers.append((vehicle.id, vehicle.odometer))
+            report.updated.append(vehicle.id)
+        touched.append(vehicle)
+
+    db.flush()
+    create_schedules(db, [(v.id, v.odometer) for v in created])
+    on_odometers_changed(db, odometers)
+    report.created = [v.id for v in created]
+    created_ids = set(report.created)
+    enqueue_many(db, "change", "vehicle", [
+        (v.id, {"action": "created" if v.id in created_ids else "updated", "status": v.status})
+        for v in touched
+    ])
+    # Capture index entries before commit expires the instances.
+    availability = [(v.id, v.max_capacity, v.status) for v in touched]
+    db.commit()
+
+    for vehicle_id, capacity, state in availability:
+        if state == "Available":
+            availability_index.mark_available(vehicle_id, capacity)
+        else:
+            availability_index.mark_unavailable(vehicle_id)
+    return report
+
+
+def upsert_drivers(db: Session, rows: List[DriverUpsert]) -> BulkUpsertReport:
+    _check_size(rows)
+    report = BulkUpsertReport()
+
+    ids = {r.id for r in rows if r.id is not None}
+    existing = {d.id: d for d in db.query(Driver).filter(Driver.id.in_(ids))} if ids else {}
+
+    seen, created, touched = set(), [], []
+    for index, row in enumerate(rows):
+        if row.id is None:
+            if row.name is None or row.license_expiry is None:
+                report.rejected.append(BulkRejected(
+                    index=index, reason="New drivers need name and license_expiry.",
+                ))
+                continue
+            driver = Driver(**row.model_dump(exclude={"id"}, exclude_none=True))
+            db.add(driver)
+            created.append(driver)
+        else:
+            if row.id in seen:
+                report.rejected.append(BulkRejected(
+                    index=index, key=str(row.id), reason="Duplicate id in request.",
+                ))
+                continue
+            seen.add(row.id)
+            driver = existing.get(row.id)
+            if driver is None:
+                report.rejected.append(BulkRejected(
+                    index=index, key=str(row.id), reason="Driver not found.",
+                ))
+                continue
+            for field, value in row.model_dump(exclude={"id"}, exclude_unset=True, exclude_none=True).items():
+                setattr(driver, field, value)
+            report.updated.append(driver.id)
+        touched.append(driver)
+
+    db.flush()
+    report.created = [d.id for d in created]
+    created_ids = set(report.created)
+    enqueue_many(db, "change", "driver", [
+        (d.id, {"action": "created" if d.id in created_ids else "updated", "status": d.status})
+        for d in touched
+    ])
+    compliance = [(d.id, d.name, d.license_expiry) for d in touched]
+    db.commit()
+
+    for driver_id, name, expiry in compliance:
+        compliance_index.sync_entry(driver_id, name, expiry)
+    return report
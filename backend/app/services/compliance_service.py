@@ -0,0 +1,128 @@
+"""
+FleetFlow Compliance Service – Licence expiry tracking.
+
+A daily sweep suspends Off Duty drivers whose licence has expired and
+precomputes the expired / expiring-soon lists with range queries on the
+indexed `license_expiry` column. Driver writes patch the lists in place,
+so serving `/drivers/compliance` never touches the database.
+"""
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.driver import Driver
+from app.schemas.compliance_schema import ComplianceReport, DriverComplianceEntry
+from app.services.outbox_service import enqueue_many
+
+
+class ComplianceIndex:
+    def __init__(self, window_days: int):
+        self.window_days = window_days
+        self._lock = threading.Lock()
+        self._as_of: Optional[date] = None
+        self._generated_at: Optional[datetime] = None
+        self._expired: List[Tuple[date, int]] = []
+        self._expiring: List[Tuple[date, int]] = []
+        self._entries: Dict[int, DriverComplianceEntry] = {}
+        self._suspended: List[int] = []
+
+    # ── Sweep ────────────────────────────────────────────────
+    def run_sweep(self, db: Session, today: Optional[date] = None) -> List[int]:
+        """
+        Suspend Off Duty drivers with an expired licence and rebuild the lists.
+        Drivers currently On Duty are left alone until their trip ends.
+        Returns the ids suspended by this run.
+        """
+        today = today or date.today()
+        horizon = today + timedelta(days=self.window_days)
+
+        suspended = [
+            driver_id for (driver_id,) in db.query(Driver.id)
+            .filter(Driver.license_expiry < today, Driver.status == "Off Duty")
+        ]
+        if suspended:
+            db.query(Driver).filter(Driver.id.in_(suspended)).update(
+                {Driver.status: "Suspended"}, synchronize_session=False,
+            )
+            enqueue_many(db, "change", "driver", [
+                (driver_id, {"action": "status", "status": "Suspended"}) for driver_id in suspended
+            ])
+            db.commit()
+
+        rows = (
+            db.query(Driver.id, Driver.name, Driver.license_expiry)
+            .filter(Driver.license_expiry <= horizon)
+            .order_by(Driver.license_expiry, Driver.id)
+            .all()
+        )
+
+        entries, expired, expiring = {}, [], []
+        for driver_id, name, expiry in rows:
+            entries[driver_id] = self._entry(driver_id, name, expiry, today)
+            (expired if expiry < today else expiring).append((expiry, driver_id))
+
+        with self._lock:
+            self._as_of = today
+            self._generated_at = datetime.now()
+            self._entries = entries
+            self._expired = expired
+            self._expiring = expiring
+            self._suspended = suspended
+        return suspended
+
+    @staticmethod
+    def _entry(driver_id: int, name: str, expiry: date, today: date) -> DriverComplianceEntry:
+        return DriverComplianceEntry(
+            id=driver_id, name=name, license_expiry=expiry,
+            days_until_expiry=(expiry - today).days,
+        )
+
+    # ── Incremental updates ──────────────────────────────────
+    def sync(self, driver: Driver) -> None:
+        """Re-file a (loaded) driver after a create or update."""
+        self.sync_entry(driver.id, driver.name, driver.license_expiry)
+
+    def sync_entry(self, driver_id: int, name: str, expiry: date) -> None:
+        with self._lock:
+            if self._as_of is None:
+                return
+            self._discard_locked(driver_id)
+            today = self._as_of
+            if expiry > today + timedelta(days=self.window_days):
+                return
+            self._entries[driver_id] = self._entry(driver_id, name, expiry, today)
+            insort(self._expired if expiry < today else self._expiring, (expiry, driver_id))
+
+    def discard(self, driver_id: int) -> None:
+        with self._lock:
+            self._discard_locked(driver_id)
+
+    def _discard_locked(self, driver_id: int) -> None:
+        entry = self._entries.pop(driver_id, None)
+        if entry is None:
+            return
+        key = (entry.license_expiry, driver_id)
+        for bucket in (self._expired, self._expiring):
+            i = bisect_left(bucket, key)
+            if i < len(bucket) and bucket[i] == key:
+                del bucket[i]
+                return
+
+    # ── Read ─────────────────────────────────────────────────
+    def report(self) -> ComplianceReport:
+        with self._lock:
+            return ComplianceReport(
+                as_of=self._as_of,
+                generated_at=self._generated_at,
+                window_days=self.window_days,
+                expired=[self._entries[i] for _, i in self._expired],
+                expiring=[self._entries[i] for _, i in self._expiring],
+                suspended=list(self._suspended),
+            )
+
+
+compliance_index = ComplianceIndex(window_days=get_settings().LICENSE_EXPIRY_WARNING_DAYS)
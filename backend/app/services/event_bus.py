@@ -0,0 +1,155 @@
+"""
+FleetFlow Event Bus – In-process publish/subscribe for fleet state changes.
+
+Write paths publish small change notices after they commit. Each SSE
+client owns a bounded asyncio.Queue on the server's event loop; publishers
+run in the threadpool and hand events over with call_soon_threadsafe, so
+an idle connection costs one queue and no thread. A client whose queue
+fills up is evicted rather than allowed to hold memory or slow publishers.
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+ENTITIES = ("vehicle", "driver", "trip", "maintenance", "fuel_log", "expense")
+
+# Entities a role receives when the client doesn't choose its own.
+ROLE_DEFAULTS: Dict[str, FrozenSet[str]] = {
+    "Manager": frozenset(ENTITIES),
+    "Dispatcher": frozenset({"vehicle", "driver", "trip"}),
+    "Safety": frozenset({"driver", "trip", "maintenance"}),
+    "Analyst": frozenset({"trip", "maintenance", "fuel_log", "expense"}),
+}
+
+
+@dataclass(frozen=True)
+class FleetEvent:
+    id: int
+    entity: str
+    entity_id: int
+    action: str
+    data: Dict[str, Any]
+    ts: float
+
+    def to_sse(self) -> str:
+        payload = json.dumps(
+            {"entity": self.entity, "id": self.entity_id, "action": self.action,
+             "data": self.data, "ts": self.ts},
+            default=str,
+        )
+        return f"id: {self.id}\nevent: {self.entity}\ndata: {payload}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    loop: asyncio.AbstractEventLoop
+    entities: FrozenSet[str]
+    queue: asyncio.Queue
+    evicted: bool = False
+    closed: bool = field(default=False, repr=False)
+
+    def _deliver(self, event: Optional[FleetEvent]) -> None:
+        """Runs on the subscriber's loop. `None` is the close sentinel."""
+        if self.closed:
+            return
+        if event is not None and not self.queue.full():
+            self.queue.put_nowait(event)
+            return
+        if event is not None:
+            # Slow consumer: drop what it hasn't read and tell it to go away.
+            self.evicted = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        elif self.queue.full():
+            self.queue.get_nowait()
+        self.closed = True
+        self.queue.put_nowait(None)
+
+
+class EventBus:
+    def __init__(self, queue_size: int, max_subscribers: int, replay_size: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+        self._recent: deque = deque(maxlen=replay_size)
+        self.stats = {"published": 0, "delivered": 0, "evicted": 0}
+
+    # ── Publishing (any thread) ─────────────────────────────
+    def publish(self, entity: str, entity_id: int, action: str, **data: Any) -> FleetEvent:
+        with self._lock:
+            event = FleetEvent(next(self._ids), entity, entity_id, action, data, time.time())
+            self._recent.append(event)
+            targets = [s for s in self._subscribers if entity in s.entities]
+            self.stats["published"] += 1
+            self.stats["delivered"] += len(targets)
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub._deliver, event)
+            except RuntimeError:  # loop already closed
+                self.unsubscribe(sub)
+        return event
+
+    # ── Subscribing (event loop) ────────────────────────────
+    def subscribe(self, entities: FrozenSet[str], last_event_id: Optional[int] = None) -> Optional[Subscription]:
+        """Register a client on the running loop. Returns None when at capacity."""
+        sub = Subscription(asyncio.get_running_loop(), entities, asyncio.Queue(self.queue_size))
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(sub)
+            backlog = [e for e in self._recent if last_event_id is not None and e.id > last_event_id]
+        for event in backlog:
+            if event.entity in entities:
+                sub._deliver(event)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+            if sub.evicted:
+                self.stats["evicted"] += 1
+
+    def close_all(self) -> None:
+        """Ask every stream to finish, e.g. on shutdown."""
+        with self._lock:
+            subs = list(self._subscribers)
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._deliver, None)
+            except RuntimeError:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "subscribers": len(self._subscribers),
+                "queue_size": self.queue_size,
+                "max_subscribers": self.max_subscribers,
+            }
+
+
+def entities_for(role: str, requested: Optional[List[str]] = None) -> FrozenSet[str]:
+    """Entities a subscriber receives: the explicit list, else its role's defaults."""
+    if requested:
+        return frozenset(requested)
+    return ROLE_DEFAULTS.get(role, frozenset(ENTITIES))
+
+
+event_bus = EventBus(
+    queue_size=settings.EVENT_QUEUE_SIZE,
+    max_subscribers=settings.EVENT_MAX_SUBSCRIBERS,
+    replay_size=settings.EVENT_REPLAY_SIZE,
+)
+publish = event_bus.publish
@@ -0,0 +1,166 @@
+"""
+FleetFlow Export Service – Columnar Arrow / Parquet streams of fact tables.
+
+Rows are fetched in chunks of EXPORT_BATCH_SIZE as plain column tuples
+(no ORM objects), turned into one Arrow record batch per chunk and
+written straight into the response stream: each chunk is encoded once
+and yielded as it is, so the whole table is never in memory at once.
+Arrow streams are zstd-compressed IPC, which pyarrow / polars / pandas
+read without parsing; Parquet gets one row group per chunk.
+
+pyarrow is optional: it is imported on first use and the endpoint
+answers 501 when it is missing.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.expense import Expense
+from app.models.fuel_log import FuelLog
+from app.models.trip import Trip
+
+settings = get_settings()
+
+FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    model: Any
+    filter_column: str  # what `from` / `to` apply to
+    columns: Tuple[Tuple[str, str], ...]  # (column name, arrow type name)
+
+
+EXPORTS = {
+    "trips": ExportTable(Trip, "created_at", (
+        ("id", "int64"), ("vehicle_id", "int64"), ("driver_id", "int64"),
+        ("cargo_weight", "float64"), ("status", "dictionary"),
+        ("start_odometer", "float64"), ("end_odometer", "float64"),
+        ("created_at", "timestamp"), ("dispatched_at", "timestamp"),
+        ("completed_at", "timestamp"), ("cancelled_at", "timestamp"),
+    )),
+    "fuel_logs": ExportTable(FuelLog, "date", (
+        ("id", "int64"), ("vehicle_id", "int64"), ("liters", "float64"),
+        ("cost", "float64"), ("date", "date32"),
+    )),
+    "expenses": ExportTable(Expense, "date", (
+        ("id", "int64"), ("vehicle_id", "int64"), ("type", "dictionary"),
+        ("amount", "float64"), ("date", "date32"),
+    )),
+}
+
+
+def load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Columnar export needs pyarrow, which is not installed on this server.",
+        )
+    return pyarrow
+
+
+def _schema(pa, table: ExportTable):
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        # Low-cardinality strings: the values are stored once per batch.
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "timestamp": pa.timestamp("us"),
+        "date32": pa.date32(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in table.columns])
+
+
+def _bounds(table: ExportTable, start: Optional[date], end: Optional[date]) -> List:
+    column = getattr(table.model, table.filter_column)
+    conditions = []
+    if table.filter_column == "date":
+        if start:
+            conditions.append(column >= start)
+        if end:
+            conditions.append(column <= end)
+    else:
+        if start:
+            conditions.append(column >= datetime.combine(start, time.min))
+        if end:
+            conditions.append(column < datetime.combine(end + timedelta(days=1), time.min))
+    return conditions
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> Iterator[memoryview]:
+        chunks, self._chunks = self._chunks, []
+        for chunk in chunks:
+            yield memoryview(chunk)
+
+
+def stream_table(
+    session_factory: Callable[[], Session],
+    name: str,
+    fmt: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Iterator[memoryview]:
+    """
+    Yield the encoded export chunk by chunk. Opens its own session, since
+    the response body is produced after the request handler has returned.
+    """
+    pa = load_pyarrow()
+    table = EXPORTS[name]
+    schema = _schema(pa, table)
+    columns = [getattr(table.model, c) for c, _ in table.columns]
+    query = (
+        select(*columns)
+        .where(*_bounds(table, start, end))
+        .order_by(table.model.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+    if fmt == "arrow":
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        writer = pa.ipc.new_stream(out, schema, options=options)
+    else:
+        writer = pa.parquet.ParquetWriter(out, schema, compression="zstd")
+
+    with session_factory() as db:
+        for rows in db.execute(query).partitions():
+            arrays = [
+                pa.array(values, type=field.type) if not pa.types.is_dictionary(field.type)
+                else pa.array(values, type=pa.string()).dictionary_encode()
+                for values, field in zip(zip(*rows), schema)
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield from sink.drain()
+    writer.close()
+    yield from sink.drain()
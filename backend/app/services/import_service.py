@@ -0,0 +1,156 @@
+"""
+FleetFlow Import Service – Streaming bulk import of fuel logs and expenses.
+
+Uploads are parsed row by row (CSV or NDJSON) and handled in fixed-size
+chunks: one batched vehicle lookup per chunk, then a single executemany
+INSERT. Only the current chunk is held in memory, whatever the file size.
+"""
+import csv
+import io
+import json
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.vehicle import Vehicle
+from app.schemas.fuel_schema import ImportReport, ImportRowError
+
+settings = get_settings()
+
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(upload: UploadFile, fmt: Optional[str]) -> str:
+    if fmt:
+        if fmt not in FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported format '{fmt}'. Use one of: {', '.join(FORMATS)}.",
+            )
+        return fmt
+    name = (upload.filename or "").lower()
+    return "ndjson" if name.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def _iter_records(text: io.TextIOBase, fmt: str) -> Iterator[Tuple[int, object]]:
+    """Yield (row number, raw record) pairs; a raw record may be a parse error."""
+    if fmt == "csv":
+        for row, record in enumerate(csv.DictReader(text), start=1):
+            # Empty CSV cells mean "not provided"
+            yield row, {k: v for k, v in record.items() if k and v not in ("", None)}
+        return
+    for row, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, e
+
+
+def _first_error(e: ValidationError) -> str:
+    err = e.errors()[0]
+    field = ".".join(str(p) for p in err["loc"])
+    return f"{field}: {err['msg']}" if field else err["msg"]
+
+
+class _VehicleResolver:
+    """Maps vehicle ids / plates to ids, remembering answers across chunks."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.ids: Dict[int, bool] = {}
+        self.plates: Dict[str, Optional[int]] = {}
+
+    def prime(self, rows: List[BaseModel]) -> None:
+        ids = {r.vehicle_id for r in rows if r.vehicle_id is not None} - self.ids.keys()
+        plates = {r.license_plate for r in rows if r.vehicle_id is None} - self.plates.keys()
+        if not ids and not plates:
+            return
+        found = self.db.execute(
+            select(Vehicle.id, Vehicle.license_plate).where(
+                or_(Vehicle.id.in_(ids), Vehicle.license_plate.in_(plates))
+            )
+        ).all()
+        for vehicle_id, plate in found:
+            self.ids[vehicle_id] = True
+            self.plates[plate] = vehicle_id
+        self.ids.update({i: False for i in ids if i not in self.ids})
+        self.plates.update({p: None for p in plates if p not in self.plates})
+
+    def resolve(self, row: BaseModel) -> Optional[int]:
+        if row.vehicle_id is not None:
+            return row.vehicle_id if self.ids.get(row.vehicle_id) else None
+        return self.plates.get(row.license_plate)
+
+
+def import_records(
+    db: Session,
+    upload: UploadFile,
+    fmt: str,
+    row_schema: Type[BaseModel],
+    model,
+) -> ImportReport:
+    """
+    Stream `upload` into `model`'s table.
+    Valid rows are inserted in one transaction; invalid rows are reported.
+    """
+    report = ImportReport()
+    resolver = _VehicleResolver(db)
+    columns = [c for c in row_schema.model_fields if c != "license_plate"]
+
+    def fail(row: int, error: str) -> None:
+        report.failed += 1
+        if len(report.errors) < settings.IMPORT_MAX_ERRORS:
+            report.errors.append(ImportRowError(row=row, error=error))
+
+    def flush(chunk: List[Tuple[int, BaseModel]]) -> None:
+        resolver.prime([r for _, r in chunk])
+        values = []
+        for row, record in chunk:
+            vehicle_id = resolver.resolve(record)
+            if vehicle_id is None:
+                ref = record.vehicle_id if record.vehicle_id is not None else record.license_plate
+                fail(row, f"Vehicle '{ref}' not found.")
+                continue
+            values.append({**record.model_dump(include=set(columns)), "vehicle_id": vehicle_id})
+        if values:
+            db.execute(insert(model), values)
+            report.inserted += len(values)
+
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        chunk: List[Tuple[int, BaseModel]] = []
+        for row, raw in _iter_records(text, fmt):
+            if isinstance(raw, Exception):
+                fail(row, f"Malformed record: {raw}")
+                continue
+            try:
+                chunk.append((row, row_schema.model_validate(raw)))
+            except ValidationError as e:
+                fail(row, _first_error(e))
+                continue
+            if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        db.commit()
+        report.errors.sort(key=lambda e: e.row)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is not valid UTF-8 text.",
+        )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        text.detach()
+
+    return report
@@ -0,0 +1,190 @@
+"""
+FleetFlow Maintenance Service – Predictive service scheduling.
+
+Each service type with an interval rule gets one row per vehicle in
+`maintenance_schedules`. Rows are reset when the service is logged and
+their `km_remaining` is moved forward whenever the odometer changes, so
+the due list is a pair of indexed range lookups.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, insert, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.vehicle import Vehicle
+from app.models.maintenance_schedule import MaintenanceSchedule
+from app.schemas.maintenance_schema import MaintenanceDueItem
+
+# service_type → (interval km, interval days); None disables that trigger.
+SERVICE_INTERVALS: Dict[str, Tuple[Optional[float], Optional[int]]] = {
+    "Oil Change": (10_000, 180),
+    "Tire Rotation": (10_000, 180),
+    "Brake Inspection": (20_000, 365),
+    "Transmission Service": (60_000, 730),
+    "General Inspection": (None, 365),
+}
+
+# Reactive work has no interval and no schedule.
+REACTIVE_SERVICES = ("Engine Repair", "Other")
+
+
+def schedule_values(
+    service_type: str, odometer: float, service_date: date
+) -> dict:
+    """Schedule columns for `service_type` last done at `odometer` on `service_date`."""
+    interval_km, interval_days = SERVICE_INTERVALS[service_type]
+    return {
+        "last_service_odometer": odometer,
+        "last_service_date": service_date,
+        "due_odometer": odometer + interval_km if interval_km is not None else None,
+        "km_remaining": float(interval_km) if interval_km is not None else None,
+        "due_date": service_date + timedelta(days=interval_days) if interval_days is not None else None,
+    }
+
+
+# Rough daily distance, used only to weigh km_remaining against days
+# remaining when ranking the due list.
+KM_PER_DAY = 200.0
+
+
+# ── Schedule creation ────────────────────────────────────────
+def create_schedules(db: Session, vehicles: Iterable[Tuple[int, float]], start: Optional[date] = None) -> None:
+    """
+    Insert a schedule row per interval rule for each (vehicle_id, odometer).
+    Runs inside the caller's transaction; does not commit.
+    """
+    start = start or date.today()
+    rows = [
+        {"vehicle_id": vehicle_id, "service_type": service_type,
+         **schedule_values(service_type, odometer or 0.0, start)}
+        for vehicle_id, odometer in vehicles
+        for service_type in SERVICE_INTERVALS
+    ]
+    if rows:
+        # Core insert: the ORM bulk form drops None keys and so splits rows
+        # with and without a km interval into separate statements.
+        db.execute(insert(MaintenanceSchedule.__table__), rows)
+
+
+def backfill_schedules(db: Session) -> int:
+    """Create schedules for vehicles that have none yet. Returns the vehicle count."""
+    missing = (
+        db.query(Vehicle.id, Vehicle.odometer)
+        .filter(~Vehicle.id.in_(db.query(MaintenanceSchedule.vehicle_id)))
+        .all()
+    )
+    if missing:
+        create_schedules(db, missing)
+        db.commit()
+    return len(missing)
+
+
+# ── Incremental updates ──────────────────────────────────────
+def record_service(db: Session, vehicle: Vehicle, service_type: str, service_date: date) -> None:
+    """Reset the schedule for `service_type` after it was performed. Does not commit."""
+    if service_type not in SERVICE_INTERVALS:
+        return
+    values = schedule_values(service_type, vehicle.odometer or 0.0, service_date)
+    result = db.execute(
+        update(MaintenanceSchedule)
+        .where(
+            MaintenanceSchedule.vehicle_id == vehicle.id,
+            MaintenanceSchedule.service_type == service_type,
+        )
+        .values(**values)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(MaintenanceSchedule), [
+            {"vehicle_id": vehicle.id, "service_type": service_type, **values}
+        ])
+
+
+def on_odometer_changed(db: Session, vehicle_id: int, odometer: float) -> None:
+    """Move the vehicle's km-based due points forward. Does not commit."""
+    db.execute(
+        update(MaintenanceSchedule)
+        .where(
+            MaintenanceSchedule.vehicle_id == vehicle_id,
+            MaintenanceSchedule.due_odometer.isnot(None),
+        )
+        .values(km_remaining=MaintenanceSchedule.due_odometer - odometer)
+    )
+
+
+def on_odometers_changed(db: Session, odometers: Iterable[Tuple[int, float]]) -> None:
+    """`on_odometer_changed` for many (vehicle_id, odometer) in one executemany. Does not commit."""
+    schedules = MaintenanceSchedule.__table__
+    rows = [{"b_id": vehicle_id, "b_odometer": odometer} for vehicle_id, odometer in odometers]
+    if rows:
+        db.execute(
+            update(schedules)
+            .where(schedules.c.vehicle_id == bindparam("b_id"), schedules.c.due_odometer.isnot(None))
+            .values(km_remaining=schedules.c.due_odometer - bindparam("b_odometer")),
+            rows,
+        )
+
+
+# ── Due queue ────────────────────────────────────────────────
+def get_due(
+    db: Session,
+    within_km: float = 0.0,
+    within_days: int = 0,
+    limit: int = 100,
+) -> List[MaintenanceDueItem]:
+    """
+    Services due within the given km / day horizon, most urgent first.
+
+    Urgency is the sooner of the two triggers, with km converted to days
+    at KM_PER_DAY. The `limit` most urgent rows are always among the
+    `limit` soonest by date plus the `limit` soonest by km, so one indexed
+    query per trigger is enough.
+    """
+    today = date.today()
+    base = (
+        db.query(MaintenanceSchedule, Vehicle.name, Vehicle.license_plate)
+        .join(Vehicle, Vehicle.id == MaintenanceSchedule.vehicle_id)
+        .filter(
+            or_(
+                MaintenanceSchedule.km_remaining <= within_km,
+                MaintenanceSchedule.due_date <= today + timedelta(days=within_days),
+            ),
+            Vehicle.status != "Retired",
+        )
+    )
+    by_date = (
+        base.filter(MaintenanceSchedule.due_date.isnot(None))
+        .order_by(MaintenanceSchedule.due_date, MaintenanceSchedule.id)
+        .limit(limit)
+        .all()
+    )
+    by_km = (
+        base.filter(MaintenanceSchedule.km_remaining.isnot(None))
+        .order_by(MaintenanceSchedule.km_remaining, MaintenanceSchedule.id)
+        .limit(limit)
+        .all()
+    )
+
+    def urgency(schedule: MaintenanceSchedule) -> float:
+        days = [(schedule.due_date - today).days] if schedule.due_date else []
+        if schedule.km_remaining is not None:
+            days.append(schedule.km_remaining / KM_PER_DAY)
+        return min(days)
+
+    rows = {s.id: (s, name, plate) for s, name, plate in by_date + by_km}
+    ranked = sorted(rows.values(), key=lambda row: (urgency(row[0]), row[0].id))[:limit]
+    return [
+        MaintenanceDueItem(
+            vehicle_id=s.vehicle_id,
+            vehicle_name=name,
+            license_plate=plate,
+            service_type=s.service_type,
+            due_odometer=s.due_odometer,
+            km_remaining=s.km_remaining,
+            due_date=s.due_date,
+            days_remaining=(s.due_date - today).days if s.due_date else None,
+            overdue=(s.km_remaining is not None and s.km_remaining <= 0)
+            or (s.due_date is not None and s.due_date <= today),
+        )
+        for s, name, plate in ranked
+    ]
@@ -0,0 +1,94 @@
+"""
+FleetFlow Outbox Handlers – What each outbox message kind does.
+
+Imported once at startup to register the handlers. Database writes here
+commit together with the message's dispatched mark; in-memory work must
+tolerate being repeated.
+"""
+from typing import Any, Dict
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+from app.models.driver import Driver
+from app.models.outbox import OutboxMessage
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+from app.services.availability_index import availability_index
+from app.services.compliance_service import compliance_index
+from app.services.event_bus import event_bus
+from app.services.outbox_service import outbox
+from app.services.search_service import search_index
+
+
+# ── Audit ────────────────────────────────────────────────────
+@outbox.handler("audit", "audit-log")
+def write_audit_log(db: Session, message: OutboxMessage, payload: Dict[str, Any]) -> None:
+    db.add(AuditLog(
+        user_id=message.entity_id,
+        event=payload["event"],
+        status=payload["status"],
+        ip_address=payload.get("ip_address"),
+        user_agent=payload.get("user_agent"),
+    ))
+
+
+# ── Rollups ──────────────────────────────────────────────────
+@outbox.handler("change", "driver-completion-rate")
+def update_completion_rate(db: Session, message: OutboxMessage, payload: Dict[str, Any]) -> None:
+    """Recompute a driver's trip_completion_rate when one of their trips closes."""
+    if message.entity != "trip" or payload.get("status") not in ("Completed", "Cancelled"):
+        return
+    driver_id = payload.get("driver_id")
+    if driver_id is None:
+        return
+    completed, closed = (
+        db.query(
+            func.coalesce(func.sum(case((Trip.status == "Completed", 1), else_=0)), 0),
+            func.count(Trip.id),
+        )
+        .filter(Trip.driver_id == driver_id, Trip.status.in_(("Completed", "Cancelled")))
+        .one()
+    )
+    if closed:
+        db.query(Driver).filter(Driver.id == driver_id).update(
+            {Driver.trip_completion_rate: round(100.0 * completed / closed, 1)},
+            synchronize_session=False,
+        )
+
+
+# ── Cache refresh ────────────────────────────────────────────
+@outbox.handler("change", "cache-refresh")
+def refresh_caches(db: Session, message: OutboxMessage, payload: Dict[str, Any]) -> None:
+    """
+    Re-file the row as it is now. Routes already patch the caches inline
+    for read-your-writes; this converges them if two requests' inline
+    updates landed out of commit order.
+    """
+    if message.entity == "vehicle":
+        vehicle = db.get(Vehicle, message.entity_id)
+        if vehicle is None:
+            availability_index.mark_unavailable(message.entity_id)
+        else:
+            availability_index.sync(vehicle)
+    elif message.entity == "driver":
+        driver = db.get(Driver, message.entity_id)
+        if driver is None:
+            compliance_index.discard(message.entity_id)
+        else:
+            compliance_index.sync(driver)
+
+
+@outbox.handler("change", "search-index")
+def refresh_search_index(db: Session, message: OutboxMessage, payload: Dict[str, Any]) -> None:
+    """Only the in-memory search backend needs this; FTS5 / FULLTEXT follow the tables."""
+    if message.entity in ("vehicle", "driver"):
+        search_index.sync(db, message.entity, message.entity_id)
+
+
+# ── Notifications ────────────────────────────────────────────
+@outbox.handler("change", "event-stream")
+def notify_subscribers(db: Session, message: OutboxMessage, payload: Dict[str, Any]) -> None:
+    action = payload.pop("action")
+    event_bus.publish(message.entity, message.entity_id, action, **payload)
@@ -0,0 +1,257 @@
+"""
+FleetFlow Outbox Service – Transactional side effects.
+
+Write paths call `enqueue` before their commit, so a side effect is
+recorded if and only if the change that caused it is. The dispatcher
+drains the table on a background thread and hands each message to the
+handlers registered for its kind.
+
+Delivery is at-least-once: a message is marked dispatched in the same
+transaction as its handlers' database writes, and handlers must be
+idempotent for their in-memory work. Messages for one (entity, entity_id)
+are delivered in id order; a message waiting on retry holds back the
+ones queued behind it.
+"""
+import json
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, event, func, insert, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import get_settings
+from app.models.outbox import OutboxMessage, utcnow
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Session, OutboxMessage, Dict[str, Any]], None]
+
+
+# ── Producer side ────────────────────────────────────────────
+def enqueue(db: Session, kind: str, entity: str, entity_id: Optional[int], **payload: Any) -> None:
+    """Add a message to the caller's transaction. Does not commit."""
+    db.add(OutboxMessage(
+        kind=kind, entity=entity, entity_id=entity_id,
+        payload=json.dumps(payload, default=str),
+    ))
+    db.info["outbox_enqueued"] = True
+
+
+def enqueue_change(db: Session, entity: str, entity_id: int, action: str, **data: Any) -> None:
+    """A fleet state change: notifies subscribers, refreshes caches and rollups."""
+    enqueue(db, "change", entity, entity_id, action=action, **data)
+
+
+def enqueue_many(
+    db: Session, kind: str, entity: str, messages: Iterable[Tuple[Optional[int], Dict[str, Any]]]
+) -> None:
+    """
+    Add one message per (entity_id, payload) with a single executemany, for
+    set-based write paths. Ids follow the order given. Does not commit.
+    """
+    rows = [
+        {"kind": kind, "entity": entity, "entity_id": entity_id, "payload": json.dumps(payload, default=str)}
+        for entity_id, payload in messages
+    ]
+    if rows:
+        db.execute(insert(OutboxMessage.__table__), rows)
+        db.info["outbox_enqueued"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session: Session) -> None:
+    if session.info.pop("outbox_enqueued", False):
+        outbox.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session: Session) -> None:
+    session.info.pop("outbox_enqueued", None)
+
+
+# ── Dispatcher ───────────────────────────────────────────────
+class OutboxDispatcher:
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        retry_base: float,
+        retry_max: float,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._handlers: Dict[str, List[Tuple[str, Handler]]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {"dispatched": 0, "retried": 0, "failed": 0, "last_lag_seconds": 0.0}
+
+    def handler(self, kind: str, name: str):
+        """Decorator registering a handler for messages of `kind`, run in registration order."""
+        def register(func: Handler) -> Handler:
+            self._handlers.setdefault(kind, []).append((name, func))
+            return func
+        return register
+
+    # ── Draining ─────────────────────────────────────────────
+    def drain(self, db: Session) -> int:
+        """Deliver one batch of pending messages. Returns how many were attempted."""
+        now = utcnow()
+        # Skip messages still backing off, and those queued behind one for the
+        # same entity, in SQL: otherwise a stuck entity with a full batch of
+        # messages behind it would keep everyone else's out of every batch.
+        waiting = aliased(OutboxMessage)
+        held_back = (
+            select(waiting.id)
+            .where(
+                waiting.dispatched_at.is_(None), waiting.failed_at.is_(None),
+                waiting.available_at > now,
+                waiting.entity == OutboxMessage.entity,
+                or_(
+                    waiting.entity_id == OutboxMessage.entity_id,
+                    and_(waiting.entity_id.is_(None), OutboxMessage.entity_id.is_(None)),
+                ),
+                waiting.id < OutboxMessage.id,
+            )
+            .exists()
+        )
+        pending = (
+            db.query(OutboxMessage.id, OutboxMessage.entity, OutboxMessage.entity_id)
+            .filter(
+                OutboxMessage.dispatched_at.is_(None), OutboxMessage.failed_at.is_(None),
+                or_(OutboxMessage.available_at.is_(None), OutboxMessage.available_at <= now),
+                ~held_back,
+            )
+            .order_by(OutboxMessage.id)
+            .limit(self.batch_size)
+            .all()
+        )
+        blocked = set()
+        attempted = 0
+        for message_id, entity, entity_id in pending:
+            key = (entity, entity_id)
+            if key in blocked:
+                continue
+            attempted += 1
+            if not self._deliver(db, message_id):
+                blocked.add(key)
+        return attempted
+
+    def _deliver(self, db: Session, message_id: int) -> bool:
+        message = db.get(OutboxMessage, message_id)
+        try:
+            payload = json.loads(message.payload)
+            for _, handle in self._handlers.get(message.kind, ()):
+                handle(db, message, payload)
+            done_at = utcnow()
+            lag = (done_at - message.created_at).total_seconds()
+            message.dispatched_at = done_at
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._record_failure(db, message_id, e)
+            return False
+
+        with self._lock:
+            self.stats["dispatched"] += 1
+            self.stats["last_lag_seconds"] = lag
+        return True
+
+    def _record_failure(self, db: Session, message_id: int, error: Exception) -> None:
+        message = db.get(OutboxMessage, message_id)
+        message.attempts += 1
+        message.last_error = f"{type(error).__name__}: {error}"[:255]
+        if message.attempts >= self.max_attempts:
+            # Dead letter: stop holding back the rest of this entity's messages.
+            message.failed_at = utcnow()
+            logger.error(
+                "outbox message %s (%s %s:%s) failed permanently: %s",
+                message_id, message.kind, message.entity, message.entity_id, error,
+                exc_info=error,
+                extra={"outbox_id": message_id, "attempts": message.attempts},
+            )
+            counter = "failed"
+        else:
+            delay = min(self.retry_base * 2 ** (message.attempts - 1), self.retry_max)
+            message.available_at = utcnow() + timedelta(seconds=delay)
+            counter = "retried"
+        db.commit()
+        with self._lock:
+            self.stats[counter] += 1
+
+    def prune(self, db: Session, older_than_hours: int) -> int:
+        """Delete messages dispatched more than `older_than_hours` ago."""
+        cutoff = utcnow() - timedelta(hours=older_than_hours)
+        deleted = (
+            db.query(OutboxMessage)
+            .filter(OutboxMessage.dispatched_at.isnot(None), OutboxMessage.dispatched_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+    # ── Background thread ────────────────────────────────────
+    def wake(self) -> None:
+        self._wake.set()
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(session_factory,), name="outbox-dispatcher", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self, session_factory: Callable[[], Session]) -> None:
+        while not self._stop.is_set():
+            attempted = 0
+            try:
+                with session_factory() as db:
+                    attempted = self.drain(db)
+            except Exception:
+                logger.exception("outbox drain failed")
+            if attempted < self.batch_size:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    # ── Metrics ──────────────────────────────────────────────
+    def snapshot(self, db: Session) -> Dict[str, Any]:
+        pending, oldest = (
+            db.query(func.count(OutboxMessage.id), func.min(OutboxMessage.created_at))
+            .filter(OutboxMessage.dispatched_at.is_(None), OutboxMessage.failed_at.is_(None))
+            .one()
+        )
+        dead = db.query(func.count(OutboxMessage.id)).filter(OutboxMessage.failed_at.isnot(None)).scalar()
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "pending": pending,
+            "dead_letters": dead,
+            "lag_seconds": (utcnow() - oldest).total_seconds() if oldest else 0.0,
+            "handlers": {kind: [name for name, _ in hs] for kind, hs in self._handlers.items()},
+        }
+
+
+outbox = OutboxDispatcher(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    retry_base=settings.OUTBOX_RETRY_BASE_SECONDS,
+    retry_max=settings.OUTBOX_RETRY_MAX_SECONDS,
+)
@@ -3,161 +3,350 @@ FleetFlow Rule Engine – Deterministic Business Logic Layer
 
 All validations and state transitions live here.
 Routes call these functions; they never contain business logic directly.
+
+Guards are declared once in a `RuleRegistry`. Each rule names the
+transitions it applies to, and the registry compiles one pipeline per
+transition that reports every violation in a single pass.
 """
+import time
+from dataclasses import dataclass
 from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.vehicle import Vehicle
 from app.models.driver import Driver
 from app.models.trip import Trip
+from app.models.maintenance import MaintenanceLog
+from app.models.outbox import utcnow
+from app.schemas.rule_schema import RuleViolation
+from app.services.availability_index import availability_index
+from app.services.maintenance_service import on_odometer_changed, record_service
+from app.services.trip_event_service import record_event
+from app.services.outbox_service import enqueue_change
 
+TRANSITIONS = ("create", "dispatch", "complete", "cancel")
 
-# ── Guard: Capacity ──────────────────────────────────────────
-def validate_capacity(cargo_weight: float, vehicle: Vehicle) -> None:
-    """Raises HTTP 400 if cargo exceeds vehicle capacity."""
-    if cargo_weight > vehicle.max_capacity:
+
+@dataclass
+class RuleContext:
+    """Everything a rule may inspect. Rules ignore fields they don't need."""
+    trip: Optional[Trip] = None
+    vehicle: Optional[Vehicle] = None
+    driver: Optional[Driver] = None
+    cargo_weight: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    transitions: Tuple[str, ...]
+    check: Callable[[RuleContext], Optional[str]]  # violation message or None
+
+
+class RuleRegistry:
+    """Declares rules once and compiles them into per-transition pipelines."""
+
+    def __init__(self, instrument: bool = False):
+        self._rules: Dict[str, Rule] = {}
+        self._pipelines: Dict[str, Tuple[Rule, ...]] = {}
+        self.instrument = instrument
+        self._timings: Dict[str, List[int]] = {}  # rule name → [calls, total ns]
+
+    def rule(self, name: str, *transitions: str):
+        """Decorator registering `check` under `name` for the given transitions."""
+        unknown = set(transitions) - set(TRANSITIONS)
+        if unknown:
+            raise ValueError(f"Unknown transitions for rule '{name}': {sorted(unknown)}")
+
+        def register(check: Callable[[RuleContext], Optional[str]]):
+            self._rules[name] = Rule(name, tuple(transitions), check)
+            self._pipelines.clear()
+            return check
+
+        return register
+
+    def rules(self) -> List[Rule]:
+        return list(self._rules.values())
+
+    def compile(self, transition: str) -> Tuple[Rule, ...]:
+        pipeline = self._pipelines.get(transition)
+        if pipeline is None:
+            pipeline = tuple(r for r in self._rules.values() if transition in r.transitions)
+            self._pipelines[transition] = pipeline
+        return pipeline
+
+    def _run(self, pipeline: Iterable[Rule], ctx: RuleContext) -> List[RuleViolation]:
+        violations = []
+        if not self.instrument:
+            for r in pipeline:
+                message = r.check(ctx)
+                if message:
+                    violations.append(RuleViolation(rule=r.name, message=message))
+            return violations
+
+        for r in pipeline:
+            started = time.perf_counter_ns()
+            message = r.check(ctx)
+            timing = self._timings.setdefault(r.name, [0, 0])
+            timing[0] += 1
+            timing[1] += time.perf_counter_ns() - started
+            if message:
+                violations.append(RuleViolation(rule=r.name, message=message))
+        return violations
+
+    def evaluate(self, transition: str, ctx: RuleContext) -> List[RuleViolation]:
+        """All violations of `transition`'s pipeline for one entity."""
+        return self._run(self.compile(transition), ctx)
+
+    def evaluate_batch(
+        self, transition: str, contexts: Iterable[RuleContext]
+    ) -> List[List[RuleViolation]]:
+        """Violations per context, compiling the pipeline once."""
+        pipeline = self.compile(transition)
+        return [self._run(pipeline, ctx) for ctx in contexts]
+
+    def check(self, names: Iterable[str], ctx: RuleContext) -> List[RuleViolation]:
+        """Run specific rules by name, regardless of transition."""
+        return self._run([self._rules[n] for n in names], ctx)
+
+    def enforce(self, transition: str, ctx: RuleContext) -> None:
+        """Raises HTTP 400 listing every violation of `transition`."""
+        raise_violations(self.evaluate(transition, ctx))
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            name: {
+                "calls": calls,
+                "total_ms": round(total_ns / 1e6, 3),
+                "avg_us": round(total_ns / calls / 1e3, 3) if calls else 0.0,
+            }
+            for name, (calls, total_ns) in self._timings.items()
+        }
+
+    def reset_stats(self) -> None:
+        self._timings.clear()
+
+
+def raise_violations(violations: List[RuleViolation]) -> None:
+    if violations:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f"Cargo weight ({cargo_weight} kg) exceeds "
-                f"vehicle max capacity ({vehicle.max_capacity} kg)."
-            ),
+            detail=" ".join(v.message for v in violations),
         )
 
 
-# ── Guard: Driver License ───────────────────────────────────
+rules = RuleRegistry(instrument=get_settings().RULE_TIMING_ENABLED)
+
+
+# ── Rule: Trip Status ────────────────────────────────────────
+@rules.rule("trip_is_draft", "dispatch")
+def _trip_is_draft(ctx: RuleContext) -> Optional[str]:
+    if ctx.trip.status != "Draft":
+        return f"Only 'Draft' trips can be dispatched. Current: '{ctx.trip.status}'."
+
+
+@rules.rule("trip_is_dispatched", "complete")
+def _trip_is_dispatched(ctx: RuleContext) -> Optional[str]:
+    if ctx.trip.status != "Dispatched":
+        return f"Only 'Dispatched' trips can be completed. Current: '{ctx.trip.status}'."
+
+
+@rules.rule("trip_is_cancellable", "cancel")
+def _trip_is_cancellable(ctx: RuleContext) -> Optional[str]:
+    if ctx.trip.status not in ("Draft", "Dispatched"):
+        return f"Cannot cancel a '{ctx.trip.status}' trip."
+
+
+# ── Rule: Vehicle Availability ───────────────────────────────
+@rules.rule("vehicle_available", "dispatch")
+def _vehicle_available(ctx: RuleContext) -> Optional[str]:
+    if ctx.vehicle.status != "Available":
+        return (
+            f"Vehicle '{ctx.vehicle.name}' is currently '{ctx.vehicle.status}'. "
+            f"Only 'Available' vehicles can be dispatched."
+        )
+
+
+# ── Rule: Driver Assigned ────────────────────────────────────
+@rules.rule("driver_assigned", "dispatch")
+def _driver_assigned(ctx: RuleContext) -> Optional[str]:
+    if ctx.driver is None:
+        return "Trip has no driver assigned. Cannot dispatch."
+
+
+# ── Rule: Driver Availability ────────────────────────────────
+@rules.rule("driver_available", "dispatch")
+def _driver_available(ctx: RuleContext) -> Optional[str]:
+    if ctx.driver is not None and ctx.driver.status not in ("Off Duty",):
+        return (
+            f"Driver '{ctx.driver.name}' is currently '{ctx.driver.status}'. "
+            f"Only 'Off Duty' drivers can be assigned."
+        )
+
+
+# ── Rule: Driver License ─────────────────────────────────────
+@rules.rule("driver_license_valid", "create", "dispatch")
+def _driver_license_valid(ctx: RuleContext) -> Optional[str]:
+    if ctx.driver is not None and ctx.driver.license_expiry < date.today():
+        return (
+            f"Driver '{ctx.driver.name}' has an expired license "
+            f"(expired {ctx.driver.license_expiry}). Cannot dispatch."
+        )
+
+
+# ── Rule: Capacity ───────────────────────────────────────────
+@rules.rule("capacity", "create", "dispatch")
+def _capacity(ctx: RuleContext) -> Optional[str]:
+    cargo_weight = ctx.cargo_weight if ctx.cargo_weight is not None else ctx.trip.cargo_weight
+    if cargo_weight > ctx.vehicle.max_capacity:
+        return (
+            f"Cargo weight ({cargo_weight} kg) exceeds "
+            f"vehicle max capacity ({ctx.vehicle.max_capacity} kg)."
+        )
+
+
+# ── Guards (single-rule shortcuts) ───────────────────────────
+def validate_capacity(cargo_weight: float, vehicle: Vehicle) -> None:
+    """Raises HTTP 400 if cargo exceeds vehicle capacity."""
+    raise_violations(rules.check(("capacity",), RuleContext(vehicle=vehicle, cargo_weight=cargo_weight)))
+
+
 def validate_driver_license(driver: Driver) -> None:
     """Raises HTTP 400 if the driver's license has expired."""
-    if driver.license_expiry < date.today():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f"Driver '{driver.name}' has an expired license "
-                f"(expired {driver.license_expiry}). Cannot dispatch."
-            ),
-        )
+    raise_violations(rules.check(("driver_license_valid",), RuleContext(driver=driver)))
 
 
-# ── Guard: Vehicle Availability ──────────────────────────────
 def validate_vehicle_available(vehicle: Vehicle) -> None:
     """Raises HTTP 400 if vehicle is not Available."""
-    if vehicle.status != "Available":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f"Vehicle '{vehicle.name}' is currently '{vehicle.status}'. "
-                f"Only 'Available' vehicles can be dispatched."
-            ),
-        )
+    raise_violations(rules.check(("vehicle_available",), RuleContext(vehicle=vehicle)))
 
 
-# ── Guard: Driver Availability ───────────────────────────────
 def validate_driver_available(driver: Driver) -> None:
     """Raises HTTP 400 if the driver is not Off Duty (available)."""
-    if driver.status not in ("Off Duty",):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f"Driver '{driver.name}' is currently '{driver.status}'. "
-                f"Only 'Off Duty' drivers can be assigned."
-            ),
-        )
+    raise_violations(rules.check(("driver_available",), RuleContext(driver=driver)))
 
 
 # ── Transition: Dispatch Trip ────────────────────────────────
-def dispatch_trip(db: Session, trip: Trip) -> Trip:
+def dispatch_trip(db: Session, trip: Trip, actor_id: Optional[int] = None) -> Trip:
     """
     Dispatch a draft trip:
     - Vehicle → 'On Trip'
     - Driver  → 'On Duty'
     - Trip    → 'Dispatched'
     """
-    if trip.status != "Draft":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Only 'Draft' trips can be dispatched. Current: '{trip.status}'.",
-        )
-
     vehicle = db.get(Vehicle, trip.vehicle_id)
-    driver = db.get(Driver, trip.driver_id)
+    driver = db.get(Driver, trip.driver_id) if trip.driver_id is not None else None
 
     # Run all guards
-    validate_vehicle_available(vehicle)
-    validate_driver_available(driver)
-    validate_driver_license(driver)
-    validate_capacity(trip.cargo_weight, vehicle)
+    rules.enforce("dispatch", RuleContext(trip=trip, vehicle=vehicle, driver=driver))
 
     # State transitions
     vehicle.status = "On Trip"
     driver.status = "On Duty"
     trip.status = "Dispatched"
     trip.start_odometer = vehicle.odometer
+    trip.dispatched_at = utcnow()
+    record_event(db, trip, "Dispatched", actor_id, odometer=vehicle.odometer)
+    enqueue_change(db, "trip", trip.id, "status", status="Dispatched", vehicle_id=vehicle.id, driver_id=driver.id)
+    enqueue_change(db, "vehicle", vehicle.id, "status", status="On Trip")
+    enqueue_change(db, "driver", driver.id, "status", status="On Duty")
+    vehicle_id = vehicle.id
 
     db.commit()
+    availability_index.mark_unavailable(vehicle_id)
     db.refresh(trip)
     return trip
 
 
 # ── Transition: Complete Trip ────────────────────────────────
-def complete_trip(db: Session, trip: Trip, end_odometer: float) -> Trip:
+def complete_trip(
+    db: Session, trip: Trip, end_odometer: float, actor_id: Optional[int] = None
+) -> Trip:
     """
     Complete a dispatched trip:
     - Vehicle → 'Available', odometer updated
     - Driver  → 'Off Duty'
     - Trip    → 'Completed'
     """
-    if trip.status != "Dispatched":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Only 'Dispatched' trips can be completed. Current: '{trip.status}'.",
-        )
+    rules.enforce("complete", RuleContext(trip=trip))
 
     vehicle = db.get(Vehicle, trip.vehicle_id)
     driver = db.get(Driver, trip.driver_id)
 
     trip.end_odometer = end_odometer
     trip.status = "Completed"
+    trip.completed_at = utcnow()
     vehicle.odometer = end_odometer
     vehicle.status = "Available"
     if driver:
         driver.status = "Off Duty"
+    vehicle_id, capacity = vehicle.id, vehicle.max_capacity
+    on_odometer_changed(db, vehicle_id, end_odometer)
+    record_event(db, trip, "Completed", actor_id, odometer=end_odometer)
+    enqueue_change(db, "trip", trip.id, "status", status="Completed", vehicle_id=vehicle_id, driver_id=trip.driver_id)
+    enqueue_change(db, "vehicle", vehicle_id, "status", status="Available", odometer=end_odometer)
+    if driver:
+        enqueue_change(db, "driver", driver.id, "status", status="Off Duty")
 
     db.commit()
+    availability_index.mark_available(vehicle_id, capacity)
     db.refresh(trip)
     return trip
 
 
 # ── Transition: Cancel Trip ──────────────────────────────────
-def cancel_trip(db: Session, trip: Trip) -> Trip:
+def cancel_trip(db: Session, trip: Trip, actor_id: Optional[int] = None) -> Trip:
     """
     Cancel a trip (Draft or Dispatched):
     - If Dispatched: release vehicle and driver
     - Trip → 'Cancelled'
     """
-    if trip.status not in ("Draft", "Dispatched"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot cancel a '{trip.status}' trip.",
-        )
+    rules.enforce("cancel", RuleContext(trip=trip))
 
+    released = None
     if trip.status == "Dispatched":
         vehicle = db.get(Vehicle, trip.vehicle_id)
         driver = db.get(Driver, trip.driver_id)
         vehicle.status = "Available"
         if driver:
             driver.status = "Off Duty"
+        released = (vehicle.id, vehicle.max_capacity)
+        enqueue_change(db, "vehicle", vehicle.id, "status", status="Available")
+        if driver:
+            enqueue_change(db, "driver", driver.id, "status", status="Off Duty")
 
     trip.status = "Cancelled"
+    trip.cancelled_at = utcnow()
+    record_event(db, trip, "Cancelled", actor_id)
+    enqueue_change(db, "trip", trip.id, "status", status="Cancelled", vehicle_id=trip.vehicle_id, driver_id=trip.driver_id)
     db.commit()
+    if released:
+        availability_index.mark_available(*released)
     db.refresh(trip)
     return trip
 
 
 # ── Hook: Maintenance → Vehicle "In Shop" ────────────────────
-def on_maintenance_created(db: Session, vehicle_id: int) -> None:
-    """Set vehicle status to 'In Shop' when maintenance is logged."""
-    vehicle = db.get(Vehicle, vehicle_id)
-    if vehicle:
-        vehicle.status = "In Shop"
-        db.commit()
+def on_maintenance_created(db: Session, log: MaintenanceLog) -> MaintenanceLog:
+    """
+    Persist a new maintenance log in one transaction:
+    - Vehicle  → 'In Shop'
+    - Schedule → reset for the service type
+    """
+    vehicle = db.get(Vehicle, log.vehicle_id)
+    vehicle.status = "In Shop"
+    record_service(db, vehicle, log.service_type, log.date)
+    vehicle_id = vehicle.id
+
+    db.add(log)
+    db.flush()
+    enqueue_change(db, "maintenance", log.id, "created", vehicle_id=vehicle_id, service_type=log.service_type)
+    enqueue_change(db, "vehicle", vehicle_id, "status", status="In Shop")
+    db.commit()
+    availability_index.mark_unavailable(vehicle_id)
+    db.refresh(log)
+    return log
@@ -0,0 +1,378 @@
+"""
+FleetFlow Search Service – Ranked type-ahead over vehicles and drivers.
+
+Matches every query term as a prefix of a word in Vehicle.name,
+Vehicle.license_plate or Driver.name. A plate hit weighs twice a name
+hit. There are three backends, and SEARCH_BACKEND=auto picks the first
+one the database supports:
+
+- fts:    SQLite FTS5 table kept in step by triggers on vehicles and
+          drivers (so bulk Core writes are covered too), ranked by bm25.
+- mysql:  FULLTEXT indexes in boolean mode. InnoDB skips words shorter
+          than innodb_ft_min_token_size (3), so shorter prefixes go
+          through LIKE instead.
+- memory: an in-process sorted-token prefix index, rebuilt at startup
+          and kept current by the outbox "search-index" handler.
+"""
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.driver import Driver
+from app.models.vehicle import Vehicle
+from app.schemas.search_schema import SearchHit
+
+settings = get_settings()
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+PLATE_WEIGHT = 2.0
+NAME_WEIGHT = 1.0
+MYSQL_MIN_TOKEN = 3
+MATERIALISE_CAP = 50_000
+
+Key = Tuple[str, int]  # (entity, id)
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return _TOKEN.findall(value.lower()) if value else []
+
+
+def _boosted(token: str, term: str, weight: float) -> float:
+    return weight * 2.0 if token == term else weight  # whole word beats prefix
+
+
+def _best(doc_tokens: Dict[str, float], term: str) -> float:
+    return max((_boosted(tok, term, w) for tok, w in doc_tokens.items() if tok.startswith(term)), default=0.0)
+
+
+# ── In-memory prefix index ───────────────────────────────────
+class PrefixIndex:
+    """
+    Sorted unique tokens plus a posting map per token. A prefix is a
+    contiguous run of the sorted list, found with one bisect.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: List[str] = []
+        self._postings: Dict[str, Dict[Key, float]] = {}  # token -> {doc: field weight}
+        self._docs: Dict[Key, Tuple[str, Optional[str], Dict[str, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def upsert(self, entity: str, entity_id: int, name: str, plate: Optional[str] = None) -> None:
+        key = (entity, entity_id)
+        with self._lock:
+            self._remove_locked(key)
+            for token in self._add(key, name, plate):
+                self._tokens.insert(bisect_left(self._tokens, token), token)
+
+    def _add(self, key: Key, name: str, plate: Optional[str]) -> List[str]:
+        """File a document; returns the tokens that are new to the index."""
+        weights: Dict[str, float] = {}
+        for token in tokenize(name):
+            weights[token] = max(weights.get(token, 0.0), NAME_WEIGHT)
+        for token in tokenize(plate):
+            weights[token] = max(weights.get(token, 0.0), PLATE_WEIGHT)
+        self._docs[key] = (name, plate, weights)
+        new_tokens = []
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                new_tokens.append(token)
+            postings[key] = weight
+        return new_tokens
+
+    def remove(self, entity: str, entity_id: int) -> None:
+        with self._lock:
+            self._remove_locked((entity, entity_id))
+
+    def _remove_locked(self, key: Key) -> None:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for token in doc[2]:
+            postings = self._postings[token]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def rebuild(self, db: Session) -> None:
+        # Sort the token list once at the end instead of inserting into it per row.
+        fresh = PrefixIndex()
+        for vid, name, plate in db.query(Vehicle.id, Vehicle.name, Vehicle.license_plate).yield_per(10_000):
+            fresh._add(("vehicle", vid), name, plate)
+        for did, name in db.query(Driver.id, Driver.name).yield_per(10_000):
+            fresh._add(("driver", did), name, None)
+        fresh._tokens = sorted(fresh._postings)
+        with self._lock:
+            self._tokens, self._postings, self._docs = fresh._tokens, fresh._postings, fresh._docs
+
+    def _span(self, term: str) -> Tuple[int, int]:
+        """Index range of the sorted tokens that start with `term`."""
+        lo = bisect_left(self._tokens, term)
+        return lo, bisect_left(self._tokens, term + "\uffff", lo)
+
+    def _cost(self, span: Tuple[int, int], cap: int) -> int:
+        """Documents posted under the span, counted up to just past `cap`."""
+        total = 0
+        for token in self._tokens[span[0]:span[1]]:
+            total += len(self._postings[token])
+            if total > cap:
+                break
+        return total
+
+    def _matches(self, term: str, span: Tuple[int, int]) -> Dict[Key, float]:
+        found: Dict[Key, float] = {}
+        for token in self._tokens[span[0]:span[1]]:
+            for key, weight in self._postings[token].items():
+                score = _boosted(token, term, weight)
+                if score > found.get(key, 0.0):
+                    found[key] = score
+        return found
+
+    def search(self, terms: List[str], limit: int, window: int) -> List[SearchHit]:
+        """
+        Walk the postings of the rarest term. Every other term is either
+        materialised (when that is cheaper than checking candidates one by
+        one) or checked against the candidate's own few tokens. Stops after
+        `window` matching documents, so a one-letter prefix costs about the
+        same as a selective one; the top `limit` of those are returned.
+        """
+        with self._lock:
+            spans = {term: self._span(term) for term in set(terms)}
+            costs = {term: self._cost(span, MATERIALISE_CAP) for term, span in spans.items()}
+            ordered = sorted(spans, key=costs.get)
+            first = ordered[0]
+            # A candidate check reads ~3 tokens; materialising reads each posting once.
+            filters = {
+                term: self._matches(term, spans[term])
+                for term in ordered[1:] if costs[term] <= 3 * costs[first]
+            }
+
+            # Sorted order visits a whole-word token before its extensions, so the
+            # first time a document shows up it already has its best score for `first`.
+            rest = ordered[1:]
+            scores: Dict[Key, float] = {}
+            for token in self._tokens[spans[first][0]:spans[first][1]]:
+                for key, weight in self._postings[token].items():
+                    if key in scores:
+                        continue
+                    total = _boosted(token, first, weight)
+                    for term in rest:
+                        best = filters[term].get(key, 0.0) if term in filters else _best(self._docs[key][2], term)
+                        if not best:
+                            break
+                        total += best
+                    else:
+                        scores[key] = total
+                        if len(scores) >= window:
+                            break
+                if len(scores) >= window:
+                    break
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda kv: (kv[1], -len(self._docs[kv[0]][0])))
+            return [
+                SearchHit(entity=entity, id=entity_id, name=self._docs[(entity, entity_id)][0],
+                          license_plate=self._docs[(entity, entity_id)][1], score=round(score, 3))
+                for (entity, entity_id), score in top
+            ]
+
+
+# ── SQLite FTS5 ──────────────────────────────────────────────
+# rowid = id * 2 for vehicles, id * 2 + 1 for drivers, so triggers can
+# address a row without an indexed entity column.
+_FTS_DDL = [
+    """CREATE VIRTUAL TABLE search_fts USING fts5(
+        name, plate, tokenize = "unicode61", prefix = '1 2 3')""",
+    """CREATE TRIGGER search_vehicles_ai AFTER INSERT ON vehicles BEGIN
+        INSERT INTO search_fts(rowid, name, plate) VALUES (new.id * 2, new.name, new.license_plate);
+    END""",
+    """CREATE TRIGGER search_vehicles_au AFTER UPDATE OF name, license_plate ON vehicles BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id * 2;
+        INSERT INTO search_fts(rowid, name, plate) VALUES (new.id * 2, new.name, new.license_plate);
+    END""",
+    """CREATE TRIGGER search_vehicles_ad AFTER DELETE ON vehicles BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id * 2;
+    END""",
+    """CREATE TRIGGER search_drivers_ai AFTER INSERT ON drivers BEGIN
+        INSERT INTO search_fts(rowid, name) VALUES (new.id * 2 + 1, new.name);
+    END""",
+    """CREATE TRIGGER search_drivers_au AFTER UPDATE OF name ON drivers BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id * 2 + 1;
+        INSERT INTO search_fts(rowid, name) VALUES (new.id * 2 + 1, new.name);
+    END""",
+    """CREATE TRIGGER search_drivers_ad AFTER DELETE ON drivers BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id * 2 + 1;
+    END""",
+    """INSERT INTO search_fts(rowid, name, plate)
+        SELECT id * 2, name, license_plate FROM vehicles
+        UNION ALL SELECT id * 2 + 1, name, NULL FROM drivers""",
+]
+
+# Rank only the first :window matches: without it a one-letter prefix
+# scores most of the table before the LIMIT applies.
+_FTS_QUERY = text(f"""
+    SELECT rowid, name, plate, score FROM (
+        SELECT rowid, name, plate, -bm25(search_fts, {NAME_WEIGHT}, {PLATE_WEIGHT}) AS score
+        FROM search_fts WHERE search_fts MATCH :match LIMIT :window
+    ) ORDER BY score DESC LIMIT :limit
+""")
+
+
+def _fts_available(conn) -> bool:
+    try:
+        conn.execute(text("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)"))
+        conn.execute(text("DROP TABLE temp.fts5_probe"))
+        return True
+    except Exception:
+        return False
+
+
+def _install_fts(engine) -> None:
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_fts'"
+        )).first()
+        if not exists:
+            for statement in _FTS_DDL:
+                conn.execute(text(statement))
+
+
+# ── MySQL FULLTEXT ───────────────────────────────────────────
+_MYSQL_INDEXES = (
+    ("vehicles", "ft_vehicles_search", "name, license_plate"),
+    ("drivers", "ft_drivers_search", "name"),
+)
+
+_MYSQL_QUERY = text("""
+    (SELECT 'vehicle' AS entity, id, name, license_plate,
+            MATCH(name, license_plate) AGAINST (:match IN BOOLEAN MODE) AS score
+     FROM vehicles WHERE MATCH(name, license_plate) AGAINST (:match IN BOOLEAN MODE))
+    UNION ALL
+    (SELECT 'driver', id, name, NULL, MATCH(name) AGAINST (:match IN BOOLEAN MODE)
+     FROM drivers WHERE MATCH(name) AGAINST (:match IN BOOLEAN MODE))
+    ORDER BY score DESC LIMIT :limit
+""")
+
+
+def _install_mysql(engine) -> None:
+    with engine.begin() as conn:
+        for table, index, columns in _MYSQL_INDEXES:
+            present = conn.execute(text(
+                "SELECT COUNT(*) FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = :t AND index_name = :i"
+            ), {"t": table, "i": index}).scalar()
+            if not present:
+                conn.execute(text(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index} ({columns})"))
+
+
+def _word_prefix(column, term: str):
+    return or_(column.like(f"{term}%"), column.like(f"% {term}%"), column.like(f"%-{term}%"))
+
+
+def _like_prefix(db: Session, terms: List[str], limit: int) -> List[SearchHit]:
+    """Short-prefix path for MySQL: every term must start a word of the name or plate."""
+    vehicles = db.query(Vehicle.id, Vehicle.name, Vehicle.license_plate)
+    drivers = db.query(Driver.id, Driver.name)
+    for term in terms:
+        vehicles = vehicles.filter(or_(_word_prefix(Vehicle.name, term), _word_prefix(Vehicle.license_plate, term)))
+        drivers = drivers.filter(_word_prefix(Driver.name, term))
+    hits = [
+        SearchHit(entity="vehicle", id=vid, name=name, license_plate=plate, score=1.0)
+        for vid, name, plate in vehicles.limit(limit)
+    ] + [
+        SearchHit(entity="driver", id=did, name=name, score=1.0)
+        for did, name in drivers.limit(limit)
+    ]
+    return sorted(hits, key=lambda h: len(h.name))[:limit]
+
+
+# ── Facade ───────────────────────────────────────────────────
+class SearchService:
+    def __init__(self):
+        self.backend = "memory"
+        self.memory = PrefixIndex()
+
+    def install(self, engine, db: Session) -> str:
+        """Pick and prepare a backend. Call once at startup, after create_all."""
+        choice = settings.SEARCH_BACKEND
+        dialect = engine.dialect.name
+        if choice in ("auto", "fts") and dialect == "sqlite":
+            with engine.connect() as conn:
+                supported = _fts_available(conn)
+            if supported:
+                _install_fts(engine)
+                self.backend = "fts"
+                return self.backend
+        if choice in ("auto", "fts") and dialect == "mysql":
+            _install_mysql(engine)
+            self.backend = "mysql"
+            return self.backend
+        self.backend = "memory"
+        self.memory.rebuild(db)
+        return self.backend
+
+    def search(self, db: Session, query: str, limit: int) -> List[SearchHit]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        if self.backend == "fts":
+            return self._search_fts(db, terms, limit)
+        if self.backend == "mysql":
+            if min(len(t) for t in terms) < MYSQL_MIN_TOKEN:
+                return _like_prefix(db, terms, limit)
+            match = " ".join(f"+{t}*" for t in terms)
+            return [
+                SearchHit(entity=entity, id=row_id, name=name, license_plate=plate, score=round(score, 3))
+                for entity, row_id, name, plate, score in db.execute(_MYSQL_QUERY, {"match": match, "limit": limit})
+            ]
+        return self.memory.search(terms, limit, settings.SEARCH_CANDIDATE_WINDOW)
+
+    def _search_fts(self, db: Session, terms: List[str], limit: int) -> List[SearchHit]:
+        # Whole-word matches first, then prefix matches. The window caps each
+        # pass, so without the first one a short prefix would rank only the
+        # oldest few rows and could miss an exact hit (plate "TR" for "tr").
+        hits: Dict[int, SearchHit] = {}
+        for match in (" ".join(f'"{t}"' for t in terms), " ".join(f'"{t}"*' for t in terms)):
+            rows = db.execute(
+                _FTS_QUERY, {"match": match, "window": settings.SEARCH_CANDIDATE_WINDOW, "limit": limit},
+            )
+            for rowid, name, plate, score in rows:
+                if rowid not in hits and len(hits) < limit:
+                    hits[rowid] = SearchHit(
+                        entity="vehicle" if rowid % 2 == 0 else "driver", id=rowid // 2,
+                        name=name, license_plate=plate, score=round(score, 3),
+                    )
+            if len(hits) >= limit:
+                break
+        return list(hits.values())
+
+    def sync(self, db: Session, entity: str, entity_id: int) -> None:
+        """Re-file one row in the memory index. The database backends keep themselves current."""
+        if self.backend != "memory":
+            return
+        if entity == "vehicle":
+            row = db.query(Vehicle.name, Vehicle.license_plate).filter(Vehicle.id == entity_id).first()
+            if row is None:
+                self.memory.remove("vehicle", entity_id)
+            else:
+                self.memory.upsert("vehicle", entity_id, row.name, row.license_plate)
+        elif entity == "driver":
+            row = db.query(Driver.name).filter(Driver.id == entity_id).first()
+            if row is None:
+                self.memory.remove("driver", entity_id)
+            else:
+                self.memory.upsert("driver", entity_id, row.name)
+
+
+search_index = SearchService()
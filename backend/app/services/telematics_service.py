@@ -0,0 +1,138 @@
+"""
+FleetFlow Telematics Service – Coalescing odometer ingest.
+
+Tracker readings are validated against the highest reading seen for the
+vehicle and folded into a per-vehicle buffer that keeps only the latest
+value. A scheduled flush writes the buffer as two executemany UPDATEs,
+so thousands of readings cost one short transaction per interval.
+"""
+import threading
+import time
+from typing import Dict, List
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.vehicle import Vehicle
+from app.models.maintenance_schedule import MaintenanceSchedule
+from app.schemas.telematics_schema import IngestResult, OdometerReading, RejectedReading
+
+settings = get_settings()
+
+MAX_REJECTIONS_REPORTED = 100
+
+vehicles_table = Vehicle.__table__
+schedules_table = MaintenanceSchedule.__table__
+
+# Only ever move the odometer forward, even if the database moved first.
+_advance_odometer = (
+    update(vehicles_table)
+    .where(vehicles_table.c.id == bindparam("b_id"))
+    .where(vehicles_table.c.odometer < bindparam("b_odometer"))
+    .values(odometer=bindparam("b_odometer"))
+)
+
+# Keep the maintenance due-queue in step with whatever odometer won.
+_refresh_km_remaining = (
+    update(schedules_table)
+    .where(schedules_table.c.vehicle_id == bindparam("b_id"))
+    .where(schedules_table.c.due_odometer.isnot(None))
+    .values(
+        km_remaining=schedules_table.c.due_odometer
+        - vehicles_table.select()
+        .with_only_columns(vehicles_table.c.odometer)
+        .where(vehicles_table.c.id == bindparam("b_id"))
+        .scalar_subquery()
+    )
+)
+
+
+class OdometerBuffer:
+    def __init__(self, max_pending: int, max_lag_seconds: float):
+        self.max_pending = max_pending
+        self.max_lag_seconds = max_lag_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[int, float] = {}
+        self._high_water: Dict[int, float] = {}  # highest accepted reading per vehicle
+        self._last_flush = time.monotonic()
+        self.stats = {
+            "accepted": 0, "rejected": 0, "flushes": 0,
+            "vehicles_flushed": 0, "last_flush_ms": 0.0,
+        }
+
+    def _check_backpressure(self) -> None:
+        lag = time.monotonic() - self._last_flush
+        if len(self._pending) >= self.max_pending or lag > self.max_lag_seconds:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Telemetry ingest is behind; retry shortly.",
+                headers={"Retry-After": str(max(1, round(settings.TELEMETRY_FLUSH_INTERVAL_SECONDS)))},
+            )
+
+    def offer(self, readings: List[OdometerReading]) -> IngestResult:
+        """Validate and buffer a batch. Raises HTTP 503 when the writer is behind."""
+        # Trackers may batch out of order; apply in the order they were taken.
+        if any(r.recorded_at for r in readings):
+            readings = sorted(readings, key=lambda r: (r.recorded_at is None, r.recorded_at or 0))
+
+        result = IngestResult()
+        with self._lock:
+            self._check_backpressure()
+            pending, high_water = self._pending, self._high_water
+            for r in readings:
+                last = high_water.get(r.vehicle_id)
+                if last is not None and r.odometer < last:
+                    result.rejected += 1
+                    if len(result.rejections) < MAX_REJECTIONS_REPORTED:
+                        result.rejections.append(RejectedReading(
+                            vehicle_id=r.vehicle_id, odometer=r.odometer,
+                            reason=f"Odometer went backwards (last {last}).",
+                        ))
+                    continue
+                high_water[r.vehicle_id] = r.odometer
+                pending[r.vehicle_id] = r.odometer
+                result.accepted += 1
+            self.stats["accepted"] += result.accepted
+            self.stats["rejected"] += result.rejected
+        return result
+
+    def flush(self, db: Session) -> int:
+        """Write buffered readings in one transaction. Returns the vehicle count."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        started = time.perf_counter()
+        if batch:
+            params = [{"b_id": vid, "b_odometer": odo} for vid, odo in batch.items()]
+            try:
+                db.execute(_advance_odometer, params)
+                db.execute(_refresh_km_remaining, [{"b_id": vid} for vid in batch])
+                db.commit()
+            except Exception:
+                db.rollback()
+                # Put the readings back unless newer ones arrived meanwhile.
+                with self._lock:
+                    for vid, odo in batch.items():
+                        self._pending.setdefault(vid, odo)
+                raise
+        with self._lock:
+            self._last_flush = time.monotonic()
+            self.stats["flushes"] += 1
+            self.stats["vehicles_flushed"] += len(batch)
+            self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return len(batch)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "pending": len(self._pending),
+                "seconds_since_flush": round(time.monotonic() - self._last_flush, 2),
+            }
+
+
+odometer_buffer = OdometerBuffer(
+    max_pending=settings.TELEMETRY_MAX_PENDING,
+    max_lag_seconds=settings.TELEMETRY_MAX_LAG_SECONDS,
+)
@@ -0,0 +1,248 @@
+"""
+FleetFlow Trip Events – Append-only lifecycle stream and its projections.
+
+Transitions append a `TripEvent` in the same transaction as the state
+change. `TripProjector` folds the stream into read models (current trip
+state, per-vehicle timelines, per-driver stats). A background job
+writes a snapshot every TRIP_SNAPSHOT_EVERY events so a cold start only
+replays the tail of the stream; reads never write one.
+
+State is bounded so snapshots stay small: only open (Draft / Dispatched)
+trips are held, a closed trip's state is folded from its own events when
+asked for, and each vehicle keeps its TIMELINE_KEPT most recent spans.
+
+Event ids are allocated at insert but become visible at commit, so under
+concurrent writers a smaller id can appear after a larger one has been
+applied. Ids skipped by the high-water mark are remembered as gaps and
+looked for again on every catch-up until GAP_GRACE_SECONDS have passed
+(after that the id belonged to a rolled-back transaction).
+"""
+import json
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.trip import Trip
+from app.models.outbox import utcnow
+from app.models.trip_event import TripEvent, TripProjectionSnapshot
+
+SNAPSHOTS_KEPT = 3
+TIMELINE_KEPT = 100
+CLOSED = ("Completed", "Cancelled")
+GAP_GRACE_SECONDS = 60.0
+MAX_OPEN_GAPS = 1000
+
+
+def record_event(
+    db: Session,
+    trip: Trip,
+    event_type: str,
+    actor_id: Optional[int] = None,
+    odometer: Optional[float] = None,
+) -> TripEvent:
+    """Append a lifecycle event to the session. The caller commits."""
+    event = TripEvent(
+        trip_id=trip.id,
+        vehicle_id=trip.vehicle_id,
+        driver_id=trip.driver_id,
+        event_type=event_type,
+        cargo_weight=trip.cargo_weight,
+        odometer=odometer,
+        actor_id=actor_id,
+        occurred_at=utcnow(),  # same clock as the trip's own timestamps
+    )
+    db.add(event)
+    return event
+
+
+def _fold_trip(trip: Optional[dict], e: TripEvent) -> dict:
+    """Apply one event to a trip's state (None before its first event)."""
+    at = e.occurred_at.isoformat() if e.occurred_at else None
+    if trip is None:
+        trip = {
+            "trip_id": e.trip_id,
+            "status": "Draft",
+            "cargo_weight": e.cargo_weight,
+            "created_at": at,
+            "dispatched_at": None,
+            "completed_at": None,
+            "cancelled_at": None,
+            "start_odometer": None,
+            "end_odometer": None,
+        }
+    trip["vehicle_id"], trip["driver_id"] = e.vehicle_id, e.driver_id
+    if e.event_type == "Dispatched":
+        trip.update(status="Dispatched", dispatched_at=at, start_odometer=e.odometer)
+    elif e.event_type == "Completed":
+        trip.update(status="Completed", completed_at=at, end_odometer=e.odometer)
+    elif e.event_type == "Cancelled":
+        trip.update(status="Cancelled", cancelled_at=at)
+    return trip
+
+
+class TripProjector:
+    def __init__(self, snapshot_every: int):
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.last_event_id = 0
+        self._gaps: Dict[int, float] = {}  # skipped event id -> when it was first missed
+        self._since_snapshot = 0
+        self.trips: dict = {}
+        self.vehicle_timelines: dict = {}
+        self.driver_stats: dict = {}
+
+    # ── Fold ─────────────────────────────────────────────────
+    def apply(self, e: TripEvent) -> None:
+        at = e.occurred_at.isoformat() if e.occurred_at else None
+        previous = self.trips.get(e.trip_id)
+        was_dispatched = previous is not None and previous["status"] == "Dispatched"
+        trip = _fold_trip(previous, e)
+        if trip["status"] in CLOSED:
+            self.trips.pop(e.trip_id, None)
+        else:
+            self.trips[e.trip_id] = trip
+
+        if e.event_type == "Dispatched":
+            timeline = self.vehicle_timelines.setdefault(e.vehicle_id, [])
+            timeline.append({
+                "trip_id": e.trip_id,
+                "driver_id": e.driver_id,
+                "dispatched_at": at,
+                "ended_at": None,
+                "outcome": None,
+            })
+            del timeline[:-TIMELINE_KEPT]
+            self._driver(e.driver_id)["dispatched"] += 1
+
+        elif e.event_type == "Completed":
+            self._close_timeline(e.vehicle_id, e.trip_id, at, "Completed")
+            stats = self._driver(e.driver_id)
+            stats["completed"] += 1
+            if e.odometer is not None and trip["start_odometer"] is not None:
+                stats["km"] += e.odometer - trip["start_odometer"]
+
+        elif e.event_type == "Cancelled":
+            if was_dispatched:
+                self._close_timeline(e.vehicle_id, e.trip_id, at, "Cancelled")
+                self._driver(e.driver_id)["cancelled"] += 1
+
+    def _driver(self, driver_id: Optional[int]) -> dict:
+        return self.driver_stats.setdefault(driver_id, {
+            "dispatched": 0, "completed": 0, "cancelled": 0, "km": 0.0,
+        })
+
+    def _close_timeline(self, vehicle_id: int, trip_id: int, at: Optional[str], outcome: str) -> None:
+        for span in reversed(self.vehicle_timelines.get(vehicle_id, [])):
+            if span["trip_id"] == trip_id and span["ended_at"] is None:
+                span.update(ended_at=at, outcome=outcome)
+                return
+
+    # ── Persistence ──────────────────────────────────────────
+    def load(self, db: Session) -> None:
+        """Start from the newest snapshot (if any) and replay the tail."""
+        snapshot = (
+            db.query(TripProjectionSnapshot)
+            .order_by(TripProjectionSnapshot.last_event_id.desc())
+            .first()
+        )
+        with self._lock:
+            self._reset()
+            if snapshot:
+                state = json.loads(snapshot.state)
+                # JSON object keys are strings; restore the integer ids. Older
+                # snapshots held every trip and span, so trim them to the bounds.
+                self.trips = {int(k): v for k, v in state["trips"].items() if v["status"] not in CLOSED}
+                self.vehicle_timelines = {int(k): v[-TIMELINE_KEPT:] for k, v in state["vehicle_timelines"].items()}
+                self.driver_stats = {
+                    (int(k) if k != "null" else None): v for k, v in state["driver_stats"].items()
+                }
+                self.last_event_id = snapshot.last_event_id
+                self._gaps = dict.fromkeys(state.get("gaps", []), time.monotonic())
+        self.catch_up(db)
+
+    def catch_up(self, db: Session) -> int:
+        """Apply events newer than the last one seen, plus late commits into gaps. Returns how many."""
+        with self._lock:
+            now = time.monotonic()
+            self._gaps = {i: seen for i, seen in self._gaps.items() if now - seen < GAP_GRACE_SECONDS}
+            unseen = TripEvent.id > self.last_event_id
+            if self._gaps:
+                unseen = or_(unseen, TripEvent.id.in_(list(self._gaps)))
+            applied = 0
+            events = db.query(TripEvent).filter(unseen).order_by(TripEvent.id).yield_per(1000)
+            for e in events:
+                if e.id <= self.last_event_id:
+                    del self._gaps[e.id]
+                else:
+                    for missing in range(max(self.last_event_id + 1, e.id - MAX_OPEN_GAPS), e.id):
+                        self._gaps[missing] = now
+                    self.last_event_id = e.id
+                self.apply(e)
+                applied += 1
+            if len(self._gaps) > MAX_OPEN_GAPS:
+                self._gaps = dict(sorted(self._gaps.items())[-MAX_OPEN_GAPS:])
+            self._since_snapshot += applied
+            return applied
+
+    def snapshot(self, db: Session) -> bool:
+        """
+        Write a snapshot if TRIP_SNAPSHOT_EVERY events were applied since the
+        last one. Called by the background job; the lock is held only while
+        the state is serialized, not for the write.
+        """
+        with self._lock:
+            if self._since_snapshot < self.snapshot_every:
+                return False
+            last_event_id = self.last_event_id
+            state = json.dumps({
+                "trips": self.trips,
+                "vehicle_timelines": self.vehicle_timelines,
+                "driver_stats": {("null" if k is None else k): v for k, v in self.driver_stats.items()},
+                "gaps": sorted(self._gaps),
+            })
+            self._since_snapshot = 0
+        db.add(TripProjectionSnapshot(last_event_id=last_event_id, state=state))
+        db.flush()
+        stale = [
+            sid for (sid,) in db.query(TripProjectionSnapshot.id)
+            .order_by(TripProjectionSnapshot.last_event_id.desc())
+            .offset(SNAPSHOTS_KEPT)
+        ]
+        if stale:
+            db.query(TripProjectionSnapshot).filter(
+                TripProjectionSnapshot.id.in_(stale)
+            ).delete(synchronize_session=False)
+        db.commit()
+        return True
+
+    # ── Reads ────────────────────────────────────────────────
+    def trip_state(self, trip_id: int, events: Iterable[TripEvent] = ()) -> Optional[dict]:
+        """Open trips come from the projection; closed ones are folded from `events`."""
+        with self._lock:
+            trip = self.trips.get(trip_id)
+            if trip:
+                return dict(trip)
+        for e in events:
+            trip = _fold_trip(trip, e)
+        return trip
+
+    def vehicle_timeline(self, vehicle_id: int) -> list:
+        with self._lock:
+            return [dict(span) for span in self.vehicle_timelines.get(vehicle_id, [])]
+
+    def driver_summary(self, driver_id: int) -> dict:
+        with self._lock:
+            stats = self.driver_stats.get(driver_id)
+            if stats is None:
+                return {"dispatched": 0, "completed": 0, "cancelled": 0, "km": 0.0}
+            return dict(stats, km=round(stats["km"], 1))
+
+
+trip_projector = TripProjector(snapshot_every=get_settings().TRIP_SNAPSHOT_EVERY)
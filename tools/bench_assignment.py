@@ -0,0 +1,73 @@
+"""
+Benchmark for the automatic trip assignment engine.
+
+Builds synthetic in-memory pools (no database, no server) and times
+`plan_assignments` at increasing scale.
+
+Usage:
+    python tools/bench_assignment.py [trips ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.models.vehicle import Vehicle  # noqa: E402
+from app.models.driver import Driver  # noqa: E402
+from app.models.trip import Trip  # noqa: E402
+from app.models.maintenance import MaintenanceLog  # noqa: E402,F401
+from app.models.fuel_log import FuelLog  # noqa: E402,F401
+from app.models.expense import Expense  # noqa: E402,F401
+from app.services.assignment_service import plan_assignments  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 5_000, 10_000]
+BUDGET_SECONDS = 1.0
+
+
+def build_pools(n_trips: int, seed: int = 42):
+    rng = random.Random(seed)
+    today = date.today()
+    vehicles = [
+        Vehicle(id=i, name=f"Truck {i}", license_plate=f"BM-{i:06d}",
+                max_capacity=rng.choice([500, 1000, 2500, 5000, 8000, 12000]),
+                status=rng.choice(["Available"] * 8 + ["In Shop", "On Trip"]))
+        for i in range(1, n_trips + 1)
+    ]
+    drivers = [
+        Driver(id=i, name=f"Driver {i}",
+               license_expiry=today + timedelta(days=rng.randint(-60, 900)),
+               safety_score=rng.uniform(50, 100),
+               status=rng.choice(["Off Duty"] * 8 + ["On Duty", "Suspended"]))
+        for i in range(1, n_trips + 1)
+    ]
+    trips = [
+        Trip(id=i, vehicle_id=1, driver_id=1, status="Draft",
+             cargo_weight=rng.uniform(100, 11000))
+        for i in range(1, n_trips + 1)
+    ]
+    return trips, vehicles, drivers
+
+
+def run(n_trips: int) -> float:
+    trips, vehicles, drivers = build_pools(n_trips)
+    start = time.perf_counter()
+    plan = plan_assignments(trips, vehicles, drivers)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{n_trips:>7} trips: {elapsed * 1000:8.1f} ms  "
+        f"assigned={len(plan.assignments)} unassigned={len(plan.unassigned)}"
+    )
+    return elapsed
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or DEFAULT_SIZES
+    worst = max(run(n) for n in sizes)
+    if worst < BUDGET_SECONDS:
+        print(f"\nBenchmark PASSED (worst run under {BUDGET_SECONDS:.1f}s).")
+        sys.exit(0)
+    print(f"\nBenchmark FAILED (worst run {worst:.2f}s).")
+    sys.exit(1)
@@ -0,0 +1,59 @@
+"""
+Benchmark: per-row POST /vehicles/ versus PUT /vehicles/bulk.
+
+Runs the app in-process against a throwaway SQLite database and onboards
+the same number of vehicles through both paths.
+
+Usage:
+    python tools/bench_bulk_upsert.py [vehicles]
+"""
+import os
+import sys
+import tempfile
+import time
+
+_db = os.path.join(tempfile.mkdtemp(), "bench_bulk.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db}")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+def vehicles(prefix: str, n: int) -> list:
+    return [
+        {"name": f"Truck {i}", "license_plate": f"{prefix}-{i:06d}", "max_capacity": 1000 + i % 9000}
+        for i in range(n)
+    ]
+
+
+def run(n: int) -> None:
+    with TestClient(app) as client:
+        token = client.post("/auth/register", json={
+            "email": "bench@fleetflow.com", "password": "bench", "name": "Bench", "role": "Manager",
+        }).json()["data"]["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        start = time.perf_counter()
+        for v in vehicles("ROW", n):
+            assert client.post("/vehicles/", json=v, headers=headers).status_code == 201
+        per_row = time.perf_counter() - start
+
+        start = time.perf_counter()
+        r = client.put("/vehicles/bulk", json=vehicles("BLK", n), headers=headers)
+        bulk = time.perf_counter() - start
+        assert r.status_code == 200 and len(r.json()["data"]["created"]) == n
+
+        start = time.perf_counter()
+        client.put("/vehicles/bulk", json=vehicles("BLK", n), headers=headers)
+        bulk_update = time.perf_counter() - start
+
+    print(f"{n} vehicles")
+    print(f"  per-row POST   : {per_row * 1000:9.1f} ms")
+    print(f"  bulk (create)  : {bulk * 1000:9.1f} ms  ({per_row / bulk:.1f}x faster)")
+    print(f"  bulk (update)  : {bulk_update * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
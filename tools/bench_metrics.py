@@ -0,0 +1,77 @@
+"""
+Overhead benchmark for the metrics middleware.
+
+Drives a trivial ASGI app directly on an event loop, with and without
+MetricsMiddleware wrapped around it, and reports the added cost per
+request. A route object is placed in the scope the way FastAPI's router
+does, so the timing includes the route-template lookup. Also times a
+full /metrics render.
+
+Usage:
+    python tools/bench_metrics.py [requests]
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.core.metrics import MetricsMiddleware, registry  # noqa: E402
+
+TARGET_OVERHEAD_US = 50.0
+ROUTES = [SimpleNamespace(path=f"/resource{i}/{{item_id}}") for i in range(20)]
+STATUSES = (200, 201, 400, 404)
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = ROUTES[scope["n"] % len(ROUTES)]
+    await send({"type": "http.response.start", "status": STATUSES[scope["n"] % len(STATUSES)], "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def drive(app, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        await app({"type": "http", "method": "GET", "path": "/", "n": i}, receive, send)
+    return time.perf_counter() - start
+
+
+def run(n: int) -> float:
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(drive(endpoint, 1_000))  # warm-up
+        bare = min(loop.run_until_complete(drive(endpoint, n)) for _ in range(3))
+        wrapped_app = MetricsMiddleware(endpoint)
+        wrapped = min(loop.run_until_complete(drive(wrapped_app, n)) for _ in range(3))
+    finally:
+        loop.close()
+
+    overhead_us = (wrapped - bare) / n * 1e6
+    start = time.perf_counter()
+    body = registry.render()
+    render_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"requests={n}  bare={bare / n * 1e6:.2f} us/req  with metrics={wrapped / n * 1e6:.2f} us/req")
+    print(f"middleware overhead: {overhead_us:.2f} us/request")
+    print(f"/metrics render: {render_ms:.2f} ms ({len(body.splitlines())} lines)")
+    return overhead_us
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    overhead = run(n)
+    if overhead <= TARGET_OVERHEAD_US:
+        print(f"\nBenchmark PASSED (<= {TARGET_OVERHEAD_US:.0f} us/request).")
+        sys.exit(0)
+    print(f"\nBenchmark FAILED (> {TARGET_OVERHEAD_US:.0f} us/request).")
+    sys.exit(1)
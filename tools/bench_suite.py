@@ -0,0 +1,322 @@
+"""
+In-process benchmark suite with baseline reports.
+
+Generates a deterministic fleet (tools/generate_fleet.py) into a throwaway
+SQLite database, then times every GET route in the OpenAPI schema, the
+main write paths and the hot service functions through TestClient. The
+results go to a JSON report; run again on another commit with --compare
+to flag regressions against it.
+
+Usage:
+    python tools/bench_suite.py [--scale small] [--rounds 20] --out baseline.json
+    python tools/bench_suite.py --compare baseline.json [--threshold 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+_db = os.path.join(tempfile.mkdtemp(), "bench_suite.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db}")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # time the handlers, not 429s
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from generate_fleet import SCALES, generate  # noqa: E402
+
+# path template -> query string. Every GET route in the schema must appear here or in SKIP.
+GET_CASES = {
+    "/": "",
+    "/vehicles/": "",
+    "/vehicles/available": "?min_capacity=5000",
+    "/vehicles/{vehicle_id}": "?expand=trips,fuel_logs,maintenance_logs",
+    "/drivers/": "",
+    "/drivers/compliance": "",
+    "/trips/": "?expand=vehicle,driver",
+    "/trips/{trip_id}/events": "",
+    "/trips/projections/vehicles/{vehicle_id}": "",
+    "/trips/projections/drivers/{driver_id}": "",
+    "/maintenance/": "",
+    "/maintenance/due": "?within_km=1000&within_days=30",
+    "/fuel": "",
+    "/expenses": "",
+    "/analytics/dashboard": "",
+    "/analytics/utilization": "?from=2025-01-01T00:00:00&to=2026-06-01T00:00:00&bucket=week",
+    "/audit/logs": "",
+    "/rules/": "",
+    "/rules/stats": "",
+    "/telematics/stats": "",
+    "/events/stats": "",
+    "/outbox/stats": "",
+    "/debug/profiles": "",
+    "/export/{table}": "?format=arrow",
+    "/search": "?q=tru",
+    "/metrics": "",
+}
+SKIP = {
+    "/events/stream": "long-lived stream",
+    "/debug/profiles/{profile_id}": "needs a captured profile",
+}
+PATH_IDS = {"vehicle_id": "1", "trip_id": "1", "driver_id": "1", "table": "trips"}
+
+
+def fill(template: str) -> str:
+    path = template
+    for name, value in PATH_IDS.items():
+        path = path.replace("{" + name + "}", value)
+    return path
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "rounds": len(samples),
+        "min_ms": ordered[0] * 1e3,
+        "median_ms": statistics.median(ordered) * 1e3,
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3,
+        "max_ms": ordered[-1] * 1e3,
+        "stddev_ms": (statistics.stdev(ordered) if len(ordered) > 1 else 0.0) * 1e3,
+    }
+
+
+def bench(fn: Callable[[int], None], rounds: int, warmup: int) -> Dict[str, float]:
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for i in range(warmup, warmup + rounds):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def _ok(response) -> None:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url.path}: "
+                           f"HTTP {response.status_code} {response.text[:200]}")
+
+
+# ── Cases ────────────────────────────────────────────────────
+def get_case(client, headers, path: str) -> Callable[[int], None]:
+    return lambda i: _ok(client.get(path, headers=headers))
+
+
+def write_cases(client, headers, vehicles: int, idle_vehicle: int, idle_driver: int) -> Dict[str, Callable]:
+    def fuel(i):
+        _ok(client.post("/fuel", json={
+            "vehicle_id": i % vehicles + 1, "liters": 50, "cost": 80, "date": "2026-05-01",
+        }, headers=headers))
+
+    def expense(i):
+        _ok(client.post("/expenses", json={
+            "vehicle_id": i % vehicles + 1, "type": "Toll", "amount": 12, "date": "2026-05-01",
+        }, headers=headers))
+
+    def maintenance(i):
+        _ok(client.post("/maintenance/", json={
+            "vehicle_id": idle_vehicle, "service_type": "Oil Change", "cost": 90, "date": "2026-05-02",
+        }, headers=headers))
+        _ok(client.put(f"/vehicles/{idle_vehicle}", json={"status": "Available"}, headers=headers))
+
+    def trip_lifecycle(i):
+        r = client.post("/trips/", json={
+            "vehicle_id": idle_vehicle, "driver_id": idle_driver, "cargo_weight": 100,
+        }, headers=headers)
+        _ok(r)
+        trip_id = r.json()["data"]["id"]
+        _ok(client.put(f"/trips/{trip_id}/dispatch", headers=headers))
+        _ok(client.put(f"/trips/{trip_id}/complete", json={"end_odometer": 10_000_000.0 + i}, headers=headers))
+
+    def bulk_vehicles(i):
+        _ok(client.put("/vehicles/bulk", json=[
+            {"name": f"Bench {n}", "license_plate": f"BENCH-{n:04d}", "max_capacity": 1000 + i}
+            for n in range(100)
+        ], headers=headers))
+
+    def telematics(i):
+        _ok(client.post("/telematics/odometer", json={"readings": [
+            {"vehicle_id": v, "odometer": 20_000_000.0 + i} for v in range(1, min(vehicles, 200) + 1)
+        ]}, headers=headers))
+
+    def batch(i):
+        _ok(client.post("/batch", json={"requests": [
+            {"path": p} for p in ("/vehicles/", "/drivers/", "/trips/", "/maintenance/", "/fuel", "/expenses")
+        ]}, headers=headers))
+
+    return {
+        "POST /batch (6 lists)": batch,
+        "POST /fuel": fuel,
+        "POST /expenses": expense,
+        "POST /maintenance/ + release": maintenance,
+        "trip create/dispatch/complete": trip_lifecycle,
+        "PUT /vehicles/bulk (100)": bulk_vehicles,
+        "POST /telematics/odometer (200)": telematics,
+    }
+
+
+def service_cases(session_factory) -> Dict[str, Callable]:
+    from app.services.analytics_service import get_dashboard_analytics, get_utilization_timeline
+    from app.services.assignment_service import auto_assign_draft_trips
+    from app.services.availability_index import availability_index
+    from app.services.compliance_service import compliance_index
+
+    def with_session(fn):
+        def run(i):
+            with session_factory() as db:
+                fn(db)
+        return run
+
+    return {
+        "service: dashboard analytics": with_session(get_dashboard_analytics),
+        "service: utilization (day buckets)": with_session(lambda db: get_utilization_timeline(
+            db, datetime(2025, 1, 1), datetime(2026, 6, 1), "day")),
+        "service: auto-assign plan": with_session(auto_assign_draft_trips),
+        "service: availability rebuild": with_session(availability_index.rebuild),
+        "index: availability query": lambda i: availability_index.query(min_capacity=5000, limit=20),
+        "index: compliance report": lambda i: compliance_index.report(),
+    }
+
+
+# ── Runner ───────────────────────────────────────────────────
+def run(scale_name: str, seed: int, rounds: int, warmup: int) -> Dict:
+    from sqlalchemy import text
+    from fastapi.testclient import TestClient
+
+    from app.database.session import SessionLocal, engine
+
+    scale = SCALES[scale_name]
+    print(f"Generating '{scale_name}' fleet (seed {seed})...")
+    generate(engine, scale, seed)
+    with engine.connect() as conn:
+        idle_vehicle = conn.execute(text(
+            "SELECT id FROM vehicles WHERE status = 'Available' ORDER BY id LIMIT 1")).scalar()
+        idle_driver = conn.execute(text(
+            "SELECT id FROM drivers WHERE status = 'Off Duty' AND license_expiry > :soon "
+            "ORDER BY id LIMIT 1"), {"soon": date.today() + timedelta(days=90)}).scalar()
+
+    from app.main import app
+
+    results: Dict[str, Dict] = {}
+    missing = []
+    with TestClient(app) as client:
+        token = client.post("/auth/register", json={
+            "email": "bench@fleetflow.com", "password": "bench", "name": "Bench", "role": "Manager",
+        }).json()["data"]["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for template, ops in app.openapi()["paths"].items():
+            if "get" in ops and template not in SKIP and template not in GET_CASES:
+                missing.append(template)
+        cases: Dict[str, Callable] = {
+            f"GET {template}": get_case(client, headers, fill(template) + query)
+            for template, query in GET_CASES.items()
+        }
+        cases.update(write_cases(client, headers, scale.vehicles, idle_vehicle, idle_driver))
+        cases.update(service_cases(SessionLocal))
+
+        for name, fn in cases.items():
+            results[name] = bench(fn, rounds, warmup)
+            print(f"  {name:<48} median {results[name]['median_ms']:9.2f} ms   "
+                  f"p95 {results[name]['p95_ms']:9.2f} ms")
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": scale_name,
+            "seed": seed,
+            "rounds": rounds,
+            "warmup": warmup,
+        },
+        "missing_cases": missing,
+        "benchmarks": results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> bool:
+    """
+    Print median ratios against the baseline. False if any median grew by
+    more than `threshold` and by more than `min_delta_ms` (so sub-millisecond
+    cases don't fail on timer noise).
+    """
+    base_meta = baseline.get("meta", {})
+    if (base_meta.get("scale"), base_meta.get("seed")) != (report["meta"]["scale"], report["meta"]["seed"]):
+        print(f"WARNING: baseline was generated with scale={base_meta.get('scale')} "
+              f"seed={base_meta.get('seed')}; numbers are not comparable.")
+    print(f"\nAgainst baseline {base_meta.get('commit')} ({base_meta.get('created_at')}), "
+          f"threshold ±{threshold:.0%}:")
+    regressed = []
+    for name, current in report["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            print(f"  new       {name}")
+            continue
+        ratio = current["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        delta = current["median_ms"] - base["median_ms"]
+        if abs(delta) < min_delta_ms:
+            verdict = "ok"
+        else:
+            verdict = "REGRESSED" if ratio > 1 + threshold else "improved" if ratio < 1 - threshold else "ok"
+        if verdict == "REGRESSED":
+            regressed.append(name)
+        print(f"  {verdict:<9} {name:<48} {base['median_ms']:9.2f} -> {current['median_ms']:9.2f} ms "
+              f"({ratio:.2f}x)")
+    for name in baseline.get("benchmarks", {}):
+        if name not in report["benchmarks"]:
+            print(f"  removed   {name}")
+    return not regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the in-process benchmark suite.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative median slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore median changes smaller than this")
+    args = parser.parse_args()
+
+    report = run(args.scale, args.seed, args.rounds, args.warmup)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.out}")
+
+    ok = not report["missing_cases"]
+    for template in report["missing_cases"]:
+        print(f"FAIL  {template}: no benchmark case declared")
+    if args.compare:
+        with open(args.compare) as f:
+            ok = compare(report, json.load(f), args.threshold, args.min_delta_ms) and ok
+
+    print("\nBenchmarks PASSED." if ok else "\nBenchmarks FAILED.")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Throughput benchmark for the telematics odometer ingest.
+
+Runs the app in-process against a throwaway SQLite database, posts
+batches of readings for a simulated fleet, and reports sustained
+readings per second including the periodic flushes.
+
+Usage:
+    python tools/bench_telematics.py [vehicles] [seconds] [batch_size]
+"""
+import os
+import sys
+import tempfile
+import time
+
+_db = os.path.join(tempfile.mkdtemp(), "bench_telematics.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db}")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database.session import SessionLocal  # noqa: E402
+from app.models.vehicle import Vehicle  # noqa: E402
+from app.services.maintenance_service import backfill_schedules  # noqa: E402
+
+TARGET_READINGS_PER_SECOND = 10_000
+
+
+def seed(n_vehicles: int) -> None:
+    with SessionLocal() as db:
+        db.execute(insert(Vehicle), [
+            {"name": f"Truck {i}", "license_plate": f"TM-{i:06d}", "max_capacity": 5000, "status": "Available"}
+            for i in range(1, n_vehicles + 1)
+        ])
+        db.commit()
+        backfill_schedules(db)
+
+
+def run(n_vehicles: int, seconds: float, batch_size: int) -> float:
+    with TestClient(app) as client:
+        token = client.post("/auth/register", json={
+            "email": "bench@fleetflow.com", "password": "bench", "name": "Bench", "role": "Manager",
+        }).json()["data"]["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        seed(n_vehicles)
+
+        odometer = 0.0
+        sent = throttled = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            odometer += 1.0
+            readings = [
+                {"vehicle_id": (sent + i) % n_vehicles + 1, "odometer": odometer}
+                for i in range(batch_size)
+            ]
+            r = client.post("/telematics/odometer", json={"readings": readings}, headers=headers)
+            if r.status_code == 503:
+                throttled += 1
+                time.sleep(0.05)
+                continue
+            sent += batch_size
+        elapsed = time.perf_counter() - start
+        stats = client.get("/telematics/stats", headers=headers).json()["data"]
+
+    rate = sent / elapsed
+    print(f"vehicles={n_vehicles} batch={batch_size} readings={sent} in {elapsed:.1f}s")
+    print(f"throughput: {rate:,.0f} readings/s  (503 responses: {throttled})")
+    print(f"flushes: {stats['flushes']}  last flush: {stats['last_flush_ms']} ms")
+    return rate
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    n_vehicles, seconds, batch_size = (args + [5_000, 5, 1_000][len(args):])[:3]
+    rate = run(n_vehicles, seconds, batch_size)
+    if rate >= TARGET_READINGS_PER_SECOND:
+        print(f"\nBenchmark PASSED (>= {TARGET_READINGS_PER_SECOND:,} readings/s).")
+        sys.exit(0)
+    print(f"\nBenchmark FAILED (< {TARGET_READINGS_PER_SECOND:,} readings/s).")
+    sys.exit(1)
@@ -0,0 +1,125 @@
+"""
+Query-budget gate for every GET route.
+
+Seeds a throwaway SQLite database with enough rows that a per-row query
+loop would stand out, then calls each GET route in the OpenAPI schema
+inside `assert_query_budget`. Fails if a route issues more statements
+than its budget, repeats one statement shape more than MAX_REPEATS
+times (an N+1 loop), or has no budget declared here at all.
+
+Usage:
+    python tools/check_query_budgets.py [rows]
+"""
+import os
+import sys
+import tempfile
+
+_db = os.path.join(tempfile.mkdtemp(), "query_budgets.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db}")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.sql_accounting import QueryBudgetExceeded, assert_query_budget  # noqa: E402
+
+MAX_REPEATS = 3
+
+# path template -> (query string, max statements). Budgets must not grow with `rows`.
+BUDGETS = {
+    "/": ("", 0),
+    "/vehicles/": ("", 1),
+    "/vehicles/available": ("?min_capacity=100", 1),
+    "/vehicles/{vehicle_id}": ("?expand=trips,fuel_logs,maintenance_logs", 4),
+    "/drivers/": ("", 1),
+    "/drivers/compliance": ("", 0),
+    "/trips/": ("?expand=vehicle,driver", 1),
+    "/trips/{trip_id}/events": ("", 2),
+    "/trips/projections/vehicles/{vehicle_id}": ("", 1),
+    "/trips/projections/drivers/{driver_id}": ("", 1),
+    "/maintenance/": ("", 1),
+    "/maintenance/due": ("?within_km=100000&within_days=3650", 2),
+    "/fuel": ("", 1),
+    "/expenses": ("", 1),
+    "/analytics/dashboard": ("", 14),
+    "/analytics/utilization": ("?from=2025-01-01T00:00:00&to=2027-01-01T00:00:00&bucket=week", 2),
+    "/audit/logs": ("", 1),
+    "/rules/": ("", 0),
+    "/rules/stats": ("", 0),
+    "/telematics/stats": ("", 0),
+    "/events/stats": ("", 0),
+    "/outbox/stats": ("", 2),
+    "/debug/profiles": ("", 0),
+    "/export/{table}": ("?format=arrow", 1),
+    "/search": ("?q=tru", 2),
+}
+SKIP = {
+    "/events/stream": "long-lived stream",
+    "/debug/profiles/{profile_id}": "needs a captured profile",
+}
+PATH_IDS = {"vehicle_id": "1", "trip_id": "1", "driver_id": "1", "table": "trips"}
+
+
+def seed(client: TestClient, headers: dict, rows: int) -> None:
+    for i in range(rows):
+        client.post("/vehicles/", json={
+            "name": f"Truck {i}", "license_plate": f"QB-{i:05d}", "max_capacity": 1000 + i,
+        }, headers=headers)
+        client.post("/drivers/", json={"name": f"Driver {i}", "license_expiry": "2030-01-01"}, headers=headers)
+    for i in range(1, rows + 1):
+        trip = client.post("/trips/", json={
+            "vehicle_id": i, "driver_id": i, "cargo_weight": 500,
+        }, headers=headers).json()["data"]
+        client.put(f"/trips/{trip['id']}/dispatch", headers=headers)
+        client.put(f"/trips/{trip['id']}/complete", json={"end_odometer": 100.0 * i}, headers=headers)
+        client.post("/fuel", json={"vehicle_id": i, "liters": 40, "cost": 60, "date": "2026-01-01"}, headers=headers)
+        client.post("/expenses", json={"vehicle_id": i, "type": "Toll", "amount": 5, "date": "2026-01-01"}, headers=headers)
+        client.post("/maintenance/", json={
+            "vehicle_id": i, "service_type": "Oil Change", "cost": 80, "date": "2026-01-02",
+        }, headers=headers)
+
+
+def fill(template: str) -> str:
+    path = template
+    for name, value in PATH_IDS.items():
+        path = path.replace("{" + name + "}", value)
+    return path
+
+
+def run(rows: int) -> bool:
+    ok = True
+    with TestClient(app) as client:
+        token = client.post("/auth/register", json={
+            "email": "budget@fleetflow.com", "password": "budget", "name": "Budget", "role": "Manager",
+        }).json()["data"]["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        seed(client, headers, rows)
+
+        for template, ops in app.openapi()["paths"].items():
+            if "get" not in ops or template in SKIP:
+                continue
+            if template not in BUDGETS:
+                print(f"FAIL  {template}: no query budget declared")
+                ok = False
+                continue
+            query, budget = BUDGETS[template]
+            try:
+                with assert_query_budget(budget, max_repeats=MAX_REPEATS) as stats:
+                    r = client.get(fill(template) + query, headers=headers)
+                if r.status_code >= 400:
+                    raise QueryBudgetExceeded(f"HTTP {r.status_code}: {r.text[:200]}")
+                print(f"ok    {template}: {stats.statements}/{budget} statements")
+            except QueryBudgetExceeded as e:
+                print(f"FAIL  {template}: {e}")
+                ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    if run(rows):
+        print("\nQuery budgets PASSED.")
+        sys.exit(0)
+    print("\nQuery budgets FAILED.")
+    sys.exit(1)
@@ -0,0 +1,302 @@
+"""
+Deterministic synthetic fleet generator.
+
+Writes vehicles, drivers, trips (with their trip_events), fuel logs,
+expenses, maintenance logs and maintenance schedules straight into the
+tables with multi-row Core inserts, bypassing the API. The same scale
+and seed always produce the same rows, so benchmark runs on different
+commits see the same data.
+
+Statuses are consistent with each other: a vehicle "On Trip" has exactly
+one Dispatched trip and its driver is "On Duty"; drivers with an expired
+licence are "Suspended"; odometers equal the sum of completed trip
+distances. Each vehicle's maintenance schedules run from its latest
+generated service of that type, at the odometer it had that day.
+
+Usage:
+    python tools/generate_fleet.py --scale small            # into DATABASE_URL
+    python tools/generate_fleet.py --vehicles 5000 --fuel-per-vehicle 20 --seed 7
+    python tools/generate_fleet.py --scale large --database-url sqlite:////tmp/fleet.db
+
+Scales (vehicles / fuel logs):  small 1k / 20k,  medium 10k / 500k,  large 100k / 10M.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List
+
+from sqlalchemy import bindparam
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+EPOCH = datetime(2025, 1, 1)
+TODAY = date(2026, 6, 1)  # fixed "today" so expiry and recency don't drift between runs
+CHUNK = 5000
+
+MODELS = ["Actros", "Volvo FH", "Scania R", "DAF XF", "Iveco S-Way", "MAN TGX", "Sprinter", "Transit"]
+FIRST = ["Asha", "Ben", "Chen", "Dara", "Eli", "Farah", "Gus", "Hana", "Ivan", "Jo", "Kiran", "Lea"]
+LAST = ["Patel", "Okafor", "Nguyen", "Silva", "Kowalski", "Haddad", "Berg", "Mensah", "Rossi", "Kim"]
+EXPENSE_TYPES = ["Toll", "Parking", "Permit", "Insurance", "Cleaning"]
+
+
+@dataclass
+class Scale:
+    vehicles: int
+    drivers: int
+    trips_per_vehicle: int
+    fuel_per_vehicle: int
+    expenses_per_vehicle: int
+    maintenance_per_vehicle: int
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(100, 80, 5, 5, 2, 1),
+    "small": Scale(1_000, 800, 10, 20, 5, 2),
+    "medium": Scale(10_000, 8_000, 20, 50, 10, 4),
+    "large": Scale(100_000, 80_000, 20, 100, 10, 4),
+}
+
+
+def _chunks(rows: Iterator[dict], size: int = CHUNK) -> Iterator[List[dict]]:
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(engine, table, rows: Iterator[dict]) -> int:
+    count = 0
+    for batch in _chunks(rows):
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def generate(engine, scale: Scale, seed: int = 42, verbose: bool = False) -> Dict[str, int]:
+    """Populate an empty database. Returns row counts per table."""
+    from app.database.base import Base
+    import app.main  # noqa: F401  (imports every model onto Base.metadata)
+    from app.services.maintenance_service import REACTIVE_SERVICES, SERVICE_INTERVALS, schedule_values
+
+    services = [*SERVICE_INTERVALS, *REACTIVE_SERVICES]
+
+    Base.metadata.create_all(bind=engine)
+    tables = Base.metadata.tables
+    rng = random.Random(seed)
+    counts: Dict[str, int] = {}
+    seconds: Dict[str, float] = {}
+
+    def load(table: str, rows: Iterator[dict]) -> None:
+        start = time.perf_counter()
+        counts[table] = counts.get(table, 0) + _insert(engine, tables[table], rows)
+        seconds[table] = seconds.get(table, 0.0) + time.perf_counter() - start
+
+    def report(table: str) -> None:
+        if verbose:
+            print(f"  {table:<21} {counts.get(table, 0):>10,} rows  {seconds.get(table, 0.0):7.1f} s")
+
+    def timed(table: str, rows: Iterator[dict]) -> None:
+        load(table, rows)
+        report(table)
+
+    # ── Drivers ──────────────────────────────────────────────
+    drivers = []
+    for i in range(1, scale.drivers + 1):
+        expired = rng.random() < 0.03
+        expiry = TODAY - timedelta(days=rng.randint(1, 400)) if expired \
+            else TODAY + timedelta(days=rng.randint(30, 2500))
+        drivers.append({
+            "id": i,
+            "name": f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}",
+            "license_expiry": expiry,
+            "safety_score": round(rng.uniform(70, 100), 1),
+            "trip_completion_rate": 100.0,
+            "status": "Suspended" if expired else "Off Duty",
+            "created_at": EPOCH,
+        })
+    eligible = [d["id"] for d in drivers if d["status"] != "Suspended"]
+    # Inserted first for the foreign keys; status and completion rate are
+    # updated once every trip has been generated.
+    timed("drivers", iter(drivers))
+
+    # ── Vehicles and trips ───────────────────────────────────
+    # Written out a slice of vehicles at a time: a large fleet has millions
+    # of trips and events, far too many to hold in memory at once.
+    vehicles: List[dict] = []
+    trips: List[dict] = []
+    events: List[dict] = []
+    maintenance: List[dict] = []
+    schedules: List[dict] = []
+    finished: Dict[int, List[int]] = {}  # driver id -> [completed, cancelled]
+    busy_drivers = set()
+    trip_id = 0
+    span = (datetime.combine(TODAY, datetime.min.time()) - EPOCH).total_seconds()
+
+    def event(trip: dict, event_type: str, at: datetime, cargo_weight=None, odometer=None) -> None:
+        events.append({
+            "trip_id": trip["id"], "vehicle_id": trip["vehicle_id"], "driver_id": trip["driver_id"],
+            "event_type": event_type, "cargo_weight": cargo_weight, "odometer": odometer,
+            "actor_id": None, "occurred_at": at,
+        })
+
+    def dated(per_vehicle: int) -> Iterator[date]:
+        for _ in range(per_vehicle):
+            yield (EPOCH + timedelta(days=rng.randint(0, (TODAY - EPOCH.date()).days - 1))).date()
+
+    for v in range(1, scale.vehicles + 1):
+        roll = rng.random()
+        status = "Retired" if roll < 0.01 else "In Shop" if roll < 0.04 else "Available"
+        capacity = float(rng.choice((1000, 2500, 5000, 10000, 20000, 40000)))
+        odometer = round(rng.uniform(0, 50000), 1)
+        readings = [(EPOCH, odometer)]  # (from when, odometer) for the maintenance history
+
+        moments = sorted(rng.uniform(0, span - 86400) for _ in range(scale.trips_per_vehicle))
+        for n, offset in enumerate(moments):
+            trip_id += 1
+            driver_id = rng.choice(eligible) if eligible else None
+            created = EPOCH + timedelta(seconds=offset)
+            dispatched = created + timedelta(minutes=rng.randint(5, 240))
+            last = n == len(moments) - 1
+            active = (
+                last and status == "Available" and driver_id is not None
+                and driver_id not in busy_drivers and rng.random() < 0.05
+            )
+            outcome = "Dispatched" if active else "Cancelled" if rng.random() < 0.05 else "Completed"
+            cargo = round(rng.uniform(0.1, 1.0) * capacity, 1)
+            trip = {
+                "id": trip_id, "vehicle_id": v, "driver_id": driver_id, "cargo_weight": cargo,
+                "status": outcome, "start_odometer": odometer, "end_odometer": None,
+                "dispatched_at": dispatched, "completed_at": None, "cancelled_at": None,
+                "created_at": created, "updated_at": dispatched,
+            }
+            event(trip, "Created", created, cargo_weight=cargo)
+            event(trip, "Dispatched", dispatched, odometer=odometer)
+            if outcome == "Completed":
+                done = dispatched + timedelta(hours=rng.uniform(1, 30))
+                odometer = round(odometer + rng.uniform(20, 900), 1)
+                trip.update(end_odometer=odometer, completed_at=done, updated_at=done)
+                event(trip, "Completed", done, odometer=odometer)
+                readings.append((max(done, readings[-1][0]), odometer))
+            elif outcome == "Cancelled":
+                done = dispatched + timedelta(hours=rng.uniform(0.1, 5))
+                trip.update(cancelled_at=done, updated_at=done)
+                event(trip, "Cancelled", done)
+            else:
+                status = "On Trip"
+                busy_drivers.add(driver_id)
+            if outcome != "Dispatched" and driver_id is not None:
+                finished.setdefault(driver_id, [0, 0])[outcome == "Cancelled"] += 1
+            trips.append(trip)
+
+        # Services land on random days; each schedule starts from the latest
+        # service of its type (or the vehicle's first day) at that day's odometer.
+        times = [at for at, _ in readings]
+        last_service = {}
+        for day in sorted(dated(scale.maintenance_per_vehicle)):
+            service_type = rng.choice(services)
+            maintenance.append({"vehicle_id": v, "service_type": service_type,
+                                "cost": round(rng.uniform(50, 2500), 2), "date": day, "notes": None,
+                                "created_at": EPOCH})
+            if service_type in SERVICE_INTERVALS:
+                at = datetime.combine(day, datetime.min.time())
+                last_service[service_type] = (readings[bisect_right(times, at) - 1][1], day)
+        for service_type in SERVICE_INTERVALS:
+            serviced_at, day = last_service.get(service_type, (readings[0][1], EPOCH.date()))
+            values = schedule_values(service_type, serviced_at, day)
+            if values["due_odometer"] is not None:
+                values["km_remaining"] = values["due_odometer"] - odometer
+            schedules.append({"vehicle_id": v, "service_type": service_type, **values})
+
+        vehicles.append({
+            "id": v,
+            "name": f"{rng.choice(MODELS)} #{v}",
+            "license_plate": f"FF-{v:07d}",
+            "max_capacity": capacity,
+            "odometer": odometer,
+            "status": status,
+            "created_at": EPOCH,
+        })
+        if len(events) >= CHUNK or len(vehicles) >= CHUNK or v == scale.vehicles:
+            load("vehicles", iter(vehicles))
+            load("trips", iter(trips))
+            load("trip_events", iter(events))
+            load("maintenance_logs", iter(maintenance))
+            load("maintenance_schedules", iter(schedules))
+            vehicles, trips, events, maintenance, schedules = [], [], [], [], []
+    for table in ("vehicles", "trips", "trip_events", "maintenance_logs", "maintenance_schedules"):
+        report(table)
+
+    driver_updates = []
+    for d in drivers:
+        completed, cancelled = finished.get(d["id"], (0, 0))
+        if d["id"] in busy_drivers or completed + cancelled:
+            driver_updates.append({
+                "driver_id": d["id"],
+                "new_status": "On Duty" if d["id"] in busy_drivers else d["status"],
+                "new_rate": round(100.0 * completed / (completed + cancelled), 1)
+                if completed + cancelled else d["trip_completion_rate"],
+            })
+    driver_table = tables["drivers"]
+    update = (
+        driver_table.update()
+        .where(driver_table.c.id == bindparam("driver_id"))
+        .values(status=bindparam("new_status"), trip_completion_rate=bindparam("new_rate"))
+    )
+    for batch in _chunks(iter(driver_updates)):
+        with engine.begin() as conn:
+            conn.execute(update, batch)
+
+    # ── Per-vehicle logs (streamed; these are the big tables) ──
+    def fuel_rows() -> Iterator[dict]:
+        for v in range(1, scale.vehicles + 1):
+            for d in dated(scale.fuel_per_vehicle):
+                liters = round(rng.uniform(20, 400), 1)
+                yield {"vehicle_id": v, "liters": liters,
+                       "cost": round(liters * rng.uniform(1.4, 2.1), 2), "date": d, "created_at": EPOCH}
+
+    def expense_rows() -> Iterator[dict]:
+        for v in range(1, scale.vehicles + 1):
+            for d in dated(scale.expenses_per_vehicle):
+                yield {"vehicle_id": v, "type": rng.choice(EXPENSE_TYPES),
+                       "amount": round(rng.uniform(5, 500), 2), "date": d, "created_at": EPOCH}
+
+    timed("fuel_logs", fuel_rows())
+    timed("expenses", expense_rows())
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic fleet.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL / the app's configured database")
+    for field_name in Scale.__dataclass_fields__:
+        parser.add_argument("--" + field_name.replace("_", "-"), type=int, help="override the scale preset")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from app.database.session import engine
+
+    scale = Scale(**{
+        k: getattr(args, k) if getattr(args, k) is not None else v
+        for k, v in asdict(SCALES[args.scale]).items()
+    })
+    print(f"Generating {scale} (seed {args.seed}) into {engine.url.render_as_string(hide_password=True)}")
+    start = time.perf_counter()
+    counts = generate(engine, scale, args.seed, verbose=True)
+    print(f"Done: {sum(counts.values()):,} rows in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Load harness: concurrent dispatchers, analytics pollers and fuel writers.
+
+Launches uvicorn against a freshly generated fleet (or targets a running
+server with --base-url) and drives it from threads for a fixed duration:
+
+- dispatchers loop create → dispatch → complete on a vehicle from
+  /vehicles/available and a random off-duty driver, so they compete
+  for the same assets the way real dispatchers do;
+- managers poll the dashboard and utilization analytics;
+- fuel writers post fuel logs for random vehicles.
+
+Reports completed trip cycles per second and, per endpoint, throughput,
+p50/p95/p99 latency, error rate and conflict rate (a 400/409 from a
+business rule, e.g. the vehicle was taken first). While the load runs, and
+again at the end, it checks the database for invariant violations: a
+vehicle or driver on two trips at once, statuses that disagree with the
+dispatched trips, or an odometer running backwards.
+
+Usage:
+    python tools/load_test.py [--dispatchers 16] [--pollers 2] [--fuel-writers 4]
+                              [--workers 1] [--duration 30] [--scale small]
+                              [--database-url mysql+pymysql://...] [--out report.json]
+    python tools/load_test.py --base-url http://localhost:8000 --database-url ...
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+CONFLICT_STATUSES = {400, 409}
+
+INVARIANTS = {
+    "vehicle on more than one trip": """
+        SELECT vehicle_id, COUNT(*) FROM trips WHERE status = 'Dispatched'
+        GROUP BY vehicle_id HAVING COUNT(*) > 1""",
+    "driver on more than one trip": """
+        SELECT driver_id, COUNT(*) FROM trips WHERE status = 'Dispatched' AND driver_id IS NOT NULL
+        GROUP BY driver_id HAVING COUNT(*) > 1""",
+    "vehicle 'On Trip' without a dispatched trip": """
+        SELECT v.id, v.status FROM vehicles v WHERE v.status = 'On Trip' AND NOT EXISTS (
+            SELECT 1 FROM trips t WHERE t.vehicle_id = v.id AND t.status = 'Dispatched')""",
+    "vehicle on a dispatched trip but not 'On Trip'": """
+        SELECT v.id, v.status FROM vehicles v WHERE v.status <> 'On Trip' AND EXISTS (
+            SELECT 1 FROM trips t WHERE t.vehicle_id = v.id AND t.status = 'Dispatched')""",
+    "driver on a dispatched trip but not 'On Duty'": """
+        SELECT d.id, d.status FROM drivers d WHERE d.status <> 'On Duty' AND EXISTS (
+            SELECT 1 FROM trips t WHERE t.driver_id = d.id AND t.status = 'Dispatched')""",
+    "completed trip with odometer running backwards": """
+        SELECT id, start_odometer, end_odometer FROM trips
+        WHERE status = 'Completed' AND end_odometer < start_odometer""",
+}
+
+
+# ── Recording ────────────────────────────────────────────────
+class Recorder:
+    """Per-thread samples, merged once at the end; the hot path takes no lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shards: List[Dict[str, List[Tuple[float, str]]]] = []
+        self._local = threading.local()
+        self.cycles = 0
+
+    def _shard(self) -> Dict[str, List[Tuple[float, str]]]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = defaultdict(list)
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def call(self, client: httpx.Client, label: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            r = client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self._shard()[label].append((time.perf_counter() - start, "error"))
+            return None
+        if r.status_code < 400:
+            outcome = "ok"
+        elif r.status_code in CONFLICT_STATUSES:
+            outcome = "conflict"
+        else:
+            outcome = "error"
+        self._shard()[label].append((time.perf_counter() - start, outcome))
+        return r
+
+    def cycle_done(self) -> None:
+        with self._lock:
+            self.cycles += 1
+
+    def merged(self) -> Dict[str, List[Tuple[float, str]]]:
+        out: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        with self._lock:
+            for shard in self._shards:
+                for label, samples in shard.items():
+                    out[label].extend(samples)
+        return out
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+# ── Actors ───────────────────────────────────────────────────
+def dispatcher(base: str, token: str, drivers: List[int], rec: Recorder, deadline: float,
+               trip_seconds: float, seed: int) -> None:
+    rng = random.Random(seed)
+    headers = {"Authorization": f"Bearer {token}"}
+    with httpx.Client(base_url=base, headers=headers, timeout=30) as c:
+        while time.monotonic() < deadline:
+            cargo = rng.choice((500, 1000, 2000, 4000, 8000))
+            r = rec.call(c, "GET /vehicles/available", "GET", f"/vehicles/available?min_capacity={cargo}")
+            candidates = r.json()["data"] if r is not None and r.status_code == 200 else []
+            if not candidates or not drivers:
+                time.sleep(0.01)
+                continue
+            vehicle = rng.choice(candidates)
+            r = rec.call(c, "POST /trips/", "POST", "/trips/", json={
+                "vehicle_id": vehicle["id"], "driver_id": rng.choice(drivers), "cargo_weight": cargo,
+            })
+            if r is None or r.status_code != 201:
+                continue
+            trip_id = r.json()["data"]["id"]
+            r = rec.call(c, "PUT /trips/{id}/dispatch", "PUT", f"/trips/{trip_id}/dispatch")
+            if r is None or r.status_code != 200:
+                rec.call(c, "PUT /trips/{id}/cancel", "PUT", f"/trips/{trip_id}/cancel")
+                continue
+            start_odometer = r.json()["data"]["start_odometer"] or 0.0
+            time.sleep(trip_seconds)
+            r = rec.call(c, "PUT /trips/{id}/complete", "PUT", f"/trips/{trip_id}/complete",
+                         json={"end_odometer": round(start_odometer + rng.uniform(5, 500), 1)})
+            if r is not None and r.status_code == 200:
+                rec.cycle_done()
+
+
+def poller(base: str, token: str, rec: Recorder, deadline: float, interval: float) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    with httpx.Client(base_url=base, headers=headers, timeout=60) as c:
+        while time.monotonic() < deadline:
+            rec.call(c, "GET /analytics/dashboard", "GET", "/analytics/dashboard")
+            rec.call(c, "GET /analytics/utilization", "GET",
+                     "/analytics/utilization?from=2025-01-01T00:00:00&to=2026-06-01T00:00:00&bucket=week")
+            time.sleep(interval)
+
+
+def fuel_writer(base: str, token: str, vehicles: List[int], rec: Recorder, deadline: float,
+                interval: float, seed: int) -> None:
+    rng = random.Random(seed)
+    headers = {"Authorization": f"Bearer {token}"}
+    with httpx.Client(base_url=base, headers=headers, timeout=30) as c:
+        while time.monotonic() < deadline:
+            liters = round(rng.uniform(20, 300), 1)
+            rec.call(c, "POST /fuel", "POST", "/fuel", json={
+                "vehicle_id": rng.choice(vehicles), "liters": liters,
+                "cost": round(liters * 1.7, 2), "date": "2026-05-01",
+            })
+            time.sleep(interval)
+
+
+# ── Invariants ───────────────────────────────────────────────
+class InvariantChecker(threading.Thread):
+    def __init__(self, engine, interval: float):
+        super().__init__(name="invariant-checker", daemon=True)
+        self.engine = engine
+        self.interval = interval
+        self.violations: Dict[str, Set[str]] = defaultdict(set)
+        self._done = threading.Event()
+
+    def check(self) -> None:
+        from sqlalchemy import text
+        with self.engine.connect() as conn:
+            for name, sql in INVARIANTS.items():
+                for row in conn.execute(text(sql)):
+                    self.violations[name].add(str(tuple(row)))
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:  # a locked SQLite file shouldn't end the run
+                print(f"WARNING: invariant check failed: {e}", file=sys.stderr)
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+        self.check()
+
+
+# ── Server ───────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def launch(database_url: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    # Pollers hit analytics far above its per-user limit; set RATE_LIMIT_ENABLED=true to test the limiter.
+    env = {"RATE_LIMIT_ENABLED": "false", **os.environ, "DATABASE_URL": database_url}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            if httpx.get(base + "/", timeout=1).status_code == 200:
+                return proc, base
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become ready in 30 s")
+
+
+def register(base: str, role: str) -> str:
+    email = f"load-{role.lower()}-{int(time.time() * 1000)}@fleetflow.com"
+    r = httpx.post(base + "/auth/register", json={
+        "email": email, "password": "load", "name": f"Load {role}", "role": role,
+    }, timeout=30)
+    r.raise_for_status()
+    return r.json()["data"]["access_token"]
+
+
+# ── Report ───────────────────────────────────────────────────
+def report(rec: Recorder, elapsed: float, violations: Optional[Dict[str, Set[str]]]) -> Dict:
+    endpoints = {}
+    for label, samples in sorted(rec.merged().items()):
+        latencies = sorted(s for s, _ in samples)
+        outcomes = [o for _, o in samples]
+        n = len(samples)
+        endpoints[label] = {
+            "requests": n,
+            "throughput_rps": n / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1e3,
+            "p95_ms": percentile(latencies, 0.95) * 1e3,
+            "p99_ms": percentile(latencies, 0.99) * 1e3,
+            "error_rate": outcomes.count("error") / n,
+            "conflict_rate": outcomes.count("conflict") / n,
+        }
+    return {
+        "elapsed_seconds": elapsed,
+        "trip_cycles": rec.cycles,
+        "trip_cycles_per_second": rec.cycles / elapsed,
+        "endpoints": endpoints,
+        "invariant_violations": (
+            None if violations is None else {k: sorted(v) for k, v in violations.items() if v}
+        ),
+    }
+
+
+def print_report(result: Dict) -> None:
+    print(f"\n{result['trip_cycles']} trip cycles in {result['elapsed_seconds']:.1f} s "
+          f"= {result['trip_cycles_per_second']:.1f} cycles/s\n")
+    print(f"  {'endpoint':<30} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'err %':>6} {'confl %':>7}")
+    for label, e in result["endpoints"].items():
+        print(f"  {label:<30} {e['requests']:>7} {e['throughput_rps']:>8.1f} {e['p50_ms']:>8.1f} "
+              f"{e['p95_ms']:>8.1f} {e['p99_ms']:>8.1f} {e['error_rate'] * 100:>6.2f} "
+              f"{e['conflict_rate'] * 100:>7.2f}")
+    violations = result["invariant_violations"]
+    if violations is None:
+        print("\nInvariant checks skipped (no --database-url for an external server).")
+    elif violations:
+        print("\nInvariant violations:")
+        for name, rows in violations.items():
+            print(f"  {name}: {len(rows)} (e.g. {', '.join(rows[:5])})")
+    else:
+        print("\nNo invariant violations.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent dispatcher load test.")
+    parser.add_argument("--dispatchers", type=int, default=16)
+    parser.add_argument("--pollers", type=int, default=2)
+    parser.add_argument("--fuel-writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--trip-seconds", type=float, default=0.05, help="time a trip stays dispatched")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--fuel-interval", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--scale", default="small", help="generate_fleet scale for a launched server")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="database to generate into (launched) or check (external)")
+    parser.add_argument("--base-url", help="target a running server instead of launching one")
+    parser.add_argument("--check-interval", type=float, default=2.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+
+    proc = None
+    database_url = args.database_url
+    if args.base_url:
+        base = args.base_url.rstrip("/")
+    else:
+        if database_url is None:
+            database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load_test.db')}"
+        os.environ["DATABASE_URL"] = database_url
+        from generate_fleet import SCALES, generate
+        from app.database.session import engine as gen_engine
+        print(f"Generating '{args.scale}' fleet...")
+        generate(gen_engine, SCALES[args.scale], args.seed)
+        gen_engine.dispose()
+        print(f"Launching uvicorn with {args.workers} worker(s)...")
+        proc, base = launch(database_url, args.workers)
+
+    checker = None
+    if database_url:
+        from sqlalchemy import create_engine
+        checker = InvariantChecker(create_engine(database_url), args.check_interval)
+
+    try:
+        manager = register(base, "Manager")
+        dispatch_token = register(base, "Dispatcher")
+        with httpx.Client(base_url=base, headers={"Authorization": f"Bearer {manager}"}, timeout=60) as c:
+            vehicles = [v["id"] for v in c.get("/vehicles/").json()["data"]]
+            drivers = [d["id"] for d in c.get("/drivers/").json()["data"] if d["status"] == "Off Duty"]
+
+        rec = Recorder()
+        deadline = time.monotonic() + args.duration
+        threads = (
+            [threading.Thread(target=dispatcher, args=(base, dispatch_token, drivers, rec, deadline,
+                                                       args.trip_seconds, args.seed + i))
+             for i in range(args.dispatchers)]
+            + [threading.Thread(target=poller, args=(base, manager, rec, deadline, args.poll_interval))
+               for _ in range(args.pollers)]
+            + [threading.Thread(target=fuel_writer, args=(base, manager, vehicles, rec, deadline,
+                                                          args.fuel_interval, args.seed + 1000 + i))
+               for i in range(args.fuel_writers)]
+        )
+        print(f"Running {args.dispatchers} dispatchers, {args.pollers} pollers and "
+              f"{args.fuel_writers} fuel writers for {args.duration:.0f} s against {base}...")
+        start = time.monotonic()
+        if checker:
+            checker.start()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+        if checker:
+            checker.stop()
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(30)
+
+    result = report(rec, elapsed, checker.violations if checker else None)
+    print_report(result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"config": vars(args), **result}, f, indent=2)
+        print(f"Report written to {args.out}")
+
+    worst = max((e["error_rate"] for e in result["endpoints"].values()), default=0.0)
+    ok = not result["invariant_violations"] and worst <= args.max_error_rate
+    if worst > args.max_error_rate:
+        print(f"Error rate {worst:.2%} exceeds {args.max_error_rate:.2%}.")
+    print("\nLoad test PASSED." if ok else "\nLoad test FAILED.")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()